@@ -0,0 +1,77 @@
+"""
+Import-time benchmark for the typsphinx extension.
+
+Measures how long ``import typsphinx`` (what Sphinx does for every build that
+lists the extension, including HTML builds) takes on top of Sphinx itself,
+and compares it with importing the full Typst writing stack.
+
+Usage::
+
+    python benchmarks/bench_import.py [--runs 20]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Sphinx is always loaded before extensions, so it is part of the baseline
+BASELINE = "import sphinx.application, sphinx.builders"
+
+SCENARIOS = {
+    "extension (import typsphinx)": "import typsphinx",
+    "full stack (writer + translator)": "import typsphinx, typsphinx.writer",
+}
+
+HEAVY_MODULES = (
+    "typsphinx.writer",
+    "typsphinx.translator",
+    "typsphinx.template_engine",
+)
+
+
+def measure(statement: str) -> float:
+    """Return the wall-clock time (ms) of ``statement`` in a fresh interpreter."""
+    code = (
+        f"{BASELINE}\n"
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return float(result.stdout.strip())
+
+
+def loaded_heavy_modules() -> list:
+    """Return the heavy modules loaded by ``import typsphinx``."""
+    code = (
+        "import sys, typsphinx\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20, help="runs per scenario")
+    args = parser.parse_args()
+
+    for name, statement in SCENARIOS.items():
+        timings = [measure(statement) for _ in range(args.runs)]
+        print(
+            f"{name:36s} median {statistics.median(timings):7.2f} ms  "
+            f"min {min(timings):7.2f} ms"
+        )
+
+    heavy = loaded_heavy_modules()
+    print(f"heavy modules loaded by 'import typsphinx': {', '.join(heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
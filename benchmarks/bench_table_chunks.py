@@ -0,0 +1,90 @@
+"""
+Compile-time benchmark for chunked table rendering (typst_table_chunk_rows).
+
+Builds a generated document with one large list-table with the typst
+builder, once per chunk size, and compiles the document body with Typst in
+a fresh interpreter (so no compile results are reused between runs). The
+template is left out, so the timing covers the table layout and needs no
+Typst packages.
+
+Usage::
+
+    python benchmarks/bench_table_chunks.py [--rows 10000] [--runs 3]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Chunk sizes to compare; None renders one monolithic table
+CHUNK_SIZES = (None, 1000, 200)
+
+COLUMNS = 4
+
+
+def write_project(srcdir: Path, rows: int, chunk_rows) -> None:
+    """Write a Sphinx project with a list-table of ``rows`` body rows."""
+    srcdir.mkdir(parents=True)
+    (srcdir / "conf.py").write_text(
+        f"extensions = ['typsphinx']\ntypst_table_chunk_rows = {chunk_rows!r}\n"
+    )
+    lines = ["Table", "=====", "", ".. list-table::", "   :header-rows: 1", ""]
+    lines.append("   * - " + "\n     - ".join(f"Column {c}" for c in range(COLUMNS)))
+    for r in range(rows):
+        lines.append(
+            "   * - " + "\n     - ".join(f"row {r} cell {c}" for c in range(COLUMNS))
+        )
+    (srcdir / "index.rst").write_text("\n".join(lines) + "\n")
+
+
+def build_body(srcdir: Path, outdir: Path) -> Path:
+    """Build the project and return a file with the Typst document body."""
+    subprocess.run(
+        [sys.executable, "-m", "sphinx", "-q", "-b", "typst", str(srcdir), str(outdir)],
+        check=True,
+    )
+    content = (outdir / "index.typ").read_text(encoding="utf-8")
+    body = outdir / "body.typ"
+    body.write_text(content[content.index("\n#{\n") + 1 :], encoding="utf-8")
+    return body
+
+
+def measure(body: Path) -> float:
+    """Return the compile time (ms) of ``body`` in a fresh interpreter."""
+    code = (
+        "import time, typst\n"
+        "start = time.perf_counter()\n"
+        f"typst.compile({str(body)!r}, format='pdf')\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return float(result.stdout.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000, help="table body rows")
+    parser.add_argument("--runs", type=int, default=3, help="runs per chunk size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for chunk_rows in CHUNK_SIZES:
+            srcdir = Path(tmp) / f"source-{chunk_rows}"
+            write_project(srcdir, args.rows, chunk_rows)
+            body = build_body(srcdir, Path(tmp) / f"build-{chunk_rows}")
+            timings = [measure(body) for _ in range(args.runs)]
+            name = f"chunks of {chunk_rows} rows" if chunk_rows else "monolithic"
+            print(
+                f"{name:22s} median {statistics.median(timings):9.1f} ms  "
+                f"min {min(timings):9.1f} ms  "
+                f"({body.stat().st_size // 1024} KiB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
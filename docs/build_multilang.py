@@ -4,16 +4,19 @@
 This script builds English and Japanese versions of the documentation
 and organizes them for GitHub Pages deployment.
 """
-import os
+
 import shutil
-import subprocess
 from pathlib import Path
 
+from typsphinx.multilang import build_languages as build_languages_concurrently
+
 # Configuration
 DOCS_DIR = Path(__file__).parent
 SOURCE_DIR = DOCS_DIR / "source"
 BUILD_DIR = DOCS_DIR / "_build"
 MULTILANG_DIR = BUILD_DIR / "multilang"
+DOCTREE_DIR = BUILD_DIR / "doctrees-multilang"
+SHARED_CACHE_DIR = BUILD_DIR / "shared-multilang"
 
 LANGUAGES = {
     "en": "English",
@@ -30,44 +33,35 @@ def clean_build_dir():
     print("✓ Build directory cleaned\n")
 
 
-def build_language(lang_code):
-    """Build documentation for a specific language."""
+def build_languages():
+    """Build documentation for all languages concurrently."""
     print(f"{'='*70}")
-    print(f"Building {LANGUAGES[lang_code]} ({lang_code}) documentation")
+    print(f"Building {', '.join(LANGUAGES.values())} documentation")
     print(f"{'='*70}\n")
 
-    output_dir = MULTILANG_DIR / lang_code
-
-    # Set language environment variable
-    env = os.environ.copy()
-    env["SPHINX_LANGUAGE"] = lang_code
-
-    # Build HTML
-    cmd = [
-        "sphinx-build",
-        "-b",
-        "html",
-        "-D",
-        f"language={lang_code}",
-        str(SOURCE_DIR),
-        str(output_dir),
-    ]
-
-    print(f"Running: {' '.join(cmd)}\n")
-    result = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True)
-
-    # Print only warnings and errors
-    if result.stderr:
-        for line in result.stderr.split("\n"):
-            if (
-                "WARNING" in line
-                or "ERROR" in line
-                or "warning" in line
-                or "error" in line
-            ):
-                print(line)
+    # Doctrees live outside MULTILANG_DIR, so they survive cleaning and
+    # unchanged documents are not re-read on the next run
+    results = build_languages_concurrently(
+        SOURCE_DIR,
+        MULTILANG_DIR,
+        list(LANGUAGES),
+        builder="html",
+        doctree_root=DOCTREE_DIR,
+        shared_cache=SHARED_CACHE_DIR,
+    )
+
+    for lang_code, result in results.items():
+        # Print only warnings and errors
+        for line in result.warnings:
+            print(line)
+        if result.ok:
+            print(
+                f"✓ {LANGUAGES[lang_code]} build complete: {result.outdir} "
+                f"({result.duration:.1f}s)"
+            )
 
-    print(f"\n✓ {LANGUAGES[lang_code]} build complete: {output_dir}\n")
+    print()
+    return results
 
 
 def create_redirect_page():
@@ -152,15 +146,12 @@ def main():
     # Clean build directory
     clean_build_dir()
 
-    # Build each language
-    for lang_code in LANGUAGES:
-        try:
-            build_language(lang_code)
-        except subprocess.CalledProcessError as e:
+    # Build all languages concurrently
+    results = build_languages()
+    for lang_code, result in results.items():
+        if not result.ok:
             print(f"\n✗ Error building {LANGUAGES[lang_code]} ({lang_code}):")
-            print(f"  {e}")
-            if e.stderr:
-                print(f"\nError output:\n{e.stderr}")
+            print(f"\nError output:\n{result.output}")
             return 1
 
     # Create redirect page
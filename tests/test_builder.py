@@ -429,3 +429,62 @@ def test_write_doc_calls_post_process_images(temp_sphinx_app):
 
     # Image should be tracked
     assert "images/test.png" in builder.images
+
+
+def test_write_doc_records_document_summary(temp_sphinx_app):
+    """Test that write_doc() keeps the summary collected by the translator."""
+    from docutils.utils import new_document
+
+    from typsphinx.builder import TypstBuilder
+
+    app = temp_sphinx_app
+    builder = TypstBuilder(app, app.env)
+    builder.init()
+    builder.prepare_writing({"index"})
+
+    doc = new_document("index")
+    doc += nodes.image(uri="images/test.png")
+
+    builder.write_doc("index", doc)
+
+    summary = builder.document_summaries["index"]
+    assert summary.images == ["images/test.png"]
+    assert "image" in summary.features
+
+
+def test_unknown_nodes_are_reported_once(temp_sphinx_app):
+    """Test that unknown nodes produce one summary warning at finish()."""
+    from unittest.mock import patch
+
+    from docutils.utils import new_document
+
+    from typsphinx.builder import TypstBuilder
+
+    class CustomNode(nodes.Element):
+        pass
+
+    app = temp_sphinx_app
+    builder = TypstBuilder(app, app.env)
+    builder.init()
+    builder.prepare_writing({"index", "other"})
+
+    for docname, count in (("index", 5), ("other", 2)):
+        doc = new_document(docname)
+        for line in range(count):
+            node = CustomNode()
+            node.line = line + 10
+            doc += node
+        builder.write_doc(docname, doc)
+
+    assert builder.document_summaries["index"].unknown_nodes == {"CustomNode": 5}
+
+    with patch("typsphinx.builder.logger") as mock_logger:
+        builder.finish()
+
+    assert mock_logger.warning.call_count == 1
+    message = mock_logger.warning.call_args.args[0]
+    assert "7 node(s) of 1 unknown type(s)" in message
+    assert (
+        "CustomNode: 7 node(s) in 2 document(s), e.g. index:10, index:11, index:12"
+        in (message)
+    )
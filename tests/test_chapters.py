@@ -0,0 +1,113 @@
+"""
+Tests for per-chapter PDF previews (typsphinx.chapters).
+"""
+
+import os
+from unittest.mock import patch
+
+
+def _write_project(srcdir, chapters="True"):
+    """Write a book with two chapters, one of them with a subsection."""
+    (srcdir / "ch").mkdir(parents=True)
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        f"typst_pdf_chapters = {chapters}\n"
+        "typst_documents = [('index', 'book', 'Book', 'Author')]\n"
+    )
+    (srcdir / "index.rst").write_text(
+        "Book\n====\n\n.. toctree::\n\n   ch/one\n   ch/two\n"
+    )
+    (srcdir / "ch" / "one.rst").write_text(
+        "One\n===\n\nFirst.\n\n.. toctree::\n\n   sub\n"
+    )
+    (srcdir / "ch" / "sub.rst").write_text("Sub\n===\n\nNested.\n")
+    (srcdir / "ch" / "two.rst").write_text("Two\n===\n\nSecond.\n")
+
+
+def test_chapter_document_uses_master_preamble():
+    """A chapter is included with the imports and template of its master."""
+    from typsphinx.chapters import make_chapter_document
+
+    master = (
+        '#import "_template.typ": project\n\n'
+        '#show: project.with(\n  title: "Book",\n)\n\n'
+        '#{\nheading(level: 1, text("Book"))\n}\n'
+    )
+
+    document = make_chapter_document(master, "ch/one")
+
+    assert document == (
+        '#import "_template.typ": project\n\n'
+        '#show: project.with(\n  title: "Book",\n)\n\n'
+        '#include("/ch/one.typ")\n'
+    )
+    assert make_chapter_document("no body", "ch/one") is None
+
+    # Chapters are compiled without the back-of-book index
+    indexed = master.replace(
+        '  title: "Book",\n', '  title: "Book",\n  index: typst_index,\n'
+    )
+    assert "index:" not in make_chapter_document(indexed, "ch/one")
+
+
+def test_chapters_compile_to_separate_pdfs(make_app, tmp_path):
+    """Each top-level toctree entry of a master becomes its own PDF."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir)
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+        mock_compile.return_value = b"%PDF-1.4 mock"
+        app.build()
+
+    documents = sorted(call.args[0] for call in mock_compile.call_args_list)
+    assert len(documents) == 2
+    assert documents[0].endswith('#include("/ch/one.typ")\n')
+    assert documents[1].endswith('#include("/ch/two.typ")\n')
+    assert all("#show: project.with(" in document for document in documents)
+
+    chapters_dir = app.outdir / "index-chapters" / "ch"
+    assert (chapters_dir / "one.pdf").read_bytes() == b"%PDF-1.4 mock"
+    assert (chapters_dir / "two.pdf").exists()
+    # The full book is not compiled in preview mode
+    assert not (app.outdir / "index.pdf").exists()
+
+
+def test_unchanged_chapters_are_not_recompiled(make_app, tmp_path):
+    """Only chapters whose documents changed are compiled again."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir)
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+        mock_compile.return_value = b"%PDF-1.4 mock"
+        app.build()
+    assert mock_compile.call_count == 2
+
+    # Change the nested document of chapter one
+    sub = srcdir / "ch" / "sub.rst"
+    sub.write_text("Sub\n===\n\nChanged.\n")
+    os.utime(sub, ns=(0, os.stat(sub).st_mtime_ns + 10**9))
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+        mock_compile.return_value = b"%PDF-1.4 mock"
+        app.build()
+
+    assert mock_compile.call_count == 1
+    assert mock_compile.call_args.args[0].endswith('#include("/ch/one.typ")\n')
+
+
+def test_chapter_selection(make_app, tmp_path):
+    """typst_pdf_chapters can select chapters by document name."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir, chapters="'ch/two'")
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+        mock_compile.return_value = b"%PDF-1.4 mock"
+        app.build()
+
+    assert mock_compile.call_count == 1
+    assert (app.outdir / "index-chapters" / "ch" / "two.pdf").exists()
+    assert not (app.outdir / "index-chapters" / "ch" / "one.pdf").exists()
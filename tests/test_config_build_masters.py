@@ -0,0 +1,99 @@
+"""
+Tests for typst_build_masters (build only selected master documents).
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def products_srcdir(tmp_path):
+    """Create a project with two products, each with its own master document."""
+    srcdir = tmp_path / "source"
+    (srcdir / "alpha").mkdir(parents=True)
+    (srcdir / "beta").mkdir()
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "typst_documents = [\n"
+        "    ('alpha/index', 'alpha', 'Alpha', 'Author'),\n"
+        "    ('beta/index', 'beta', 'Beta', 'Author'),\n"
+        "]\n"
+    )
+    (srcdir / "index.rst").write_text(
+        "Root\n====\n\n.. toctree::\n\n   alpha/index\n   beta/index\n"
+    )
+    for product in ("alpha", "beta"):
+        (srcdir / product / "index.rst").write_text(
+            f"{product}\n=====\n\n.. toctree::\n\n   guide\n"
+        )
+        (srcdir / product / "guide.rst").write_text(
+            f"Guide\n=====\n\n{product} guide.\n"
+        )
+    return srcdir
+
+
+def test_typst_build_masters_writes_only_closure(make_app, products_srcdir):
+    """Only documents included by the selected master are written."""
+    app = make_app(
+        "typst",
+        srcdir=products_srcdir,
+        confoverrides={"typst_build_masters": ["alpha/index"]},
+    )
+    app.build()
+
+    outdir = app.outdir
+    assert (outdir / "alpha" / "index.typ").exists()
+    assert (outdir / "alpha" / "guide.typ").exists()
+    assert not (outdir / "beta" / "index.typ").exists()
+    assert not (outdir / "beta" / "guide.typ").exists()
+    assert not (outdir / "index.typ").exists()
+
+
+def test_typst_build_masters_accepts_comma_separated_string(make_app, products_srcdir):
+    """A comma-separated string (as given by sphinx-build -D) is accepted."""
+    app = make_app(
+        "typst",
+        srcdir=products_srcdir,
+        confoverrides={"typst_build_masters": "alpha/index, beta/index"},
+    )
+
+    assert app.builder.get_selected_masters() == ["alpha/index", "beta/index"]
+
+
+def test_typst_build_masters_compiles_only_selected(make_app, products_srcdir):
+    """typstpdf compiles only the selected master documents."""
+    app = make_app(
+        "typstpdf",
+        srcdir=products_srcdir,
+        confoverrides={"typst_build_masters": "beta/index"},
+    )
+
+    with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+        mock_compile.return_value = b"%PDF-1.4 mock"
+        app.build()
+
+    assert mock_compile.call_count == 1
+    assert (app.outdir / "beta" / "index.pdf").exists()
+    assert not (app.outdir / "alpha" / "index.pdf").exists()
+
+
+def test_typst_build_masters_unset_builds_everything(make_app, products_srcdir):
+    """Without typst_build_masters, every document is written."""
+    app = make_app("typst", srcdir=products_srcdir)
+    app.build()
+
+    assert app.builder.get_build_closure() is None
+    assert (app.outdir / "index.typ").exists()
+    assert (app.outdir / "beta" / "guide.typ").exists()
+
+
+def test_typst_build_masters_warns_on_unknown_master(make_app, products_srcdir):
+    """Selecting a document that is not a master document emits a warning."""
+    app = make_app(
+        "typst",
+        srcdir=products_srcdir,
+        confoverrides={"typst_build_masters": ["gamma/index"]},
+    )
+
+    assert "'gamma/index' is not a master document" in app.warning.getvalue()
@@ -0,0 +1,90 @@
+"""
+Tests for native CSV tables (typsphinx.csv_tables).
+"""
+
+import typst
+
+
+def _write_project(srcdir):
+    """Write a document with a file-backed table in a subdirectory."""
+    (srcdir / "data").mkdir(parents=True)
+    (srcdir / "conf.py").write_text("extensions = ['typsphinx']\n")
+    (srcdir / "index.rst").write_text(
+        "Data\n====\n\n"
+        ".. csv-table::\n"
+        "   :file: data/values.csv\n"
+        "   :header: Name; Value\n"
+        "   :delim: ;\n\n"
+        ".. csv-table::\n"
+        "   :file: data/ragged.csv\n"
+        "   :header-rows: 1\n"
+    )
+    (srcdir / "data" / "values.csv").write_text('Spam; 1\n"Egg; ""fried"""; 2\n')
+    (srcdir / "data" / "ragged.csv").write_text("a,b\n1\n")
+
+
+def test_native_csv_tables_are_disabled_by_default(make_app, tmp_path):
+    """Without typst_native_csv_tables, every cell is translated."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir)
+
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+
+    content = (app.outdir / "index.typ").read_text()
+    assert "csv(" not in content
+    assert 'text("Spam")' in content
+
+
+def test_file_backed_table_reads_csv(make_app, tmp_path):
+    """File-backed tables read a copy of their data file with csv()."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir)
+
+    app = make_app(
+        "typst", srcdir=srcdir, confoverrides={"typst_native_csv_tables": True}
+    )
+    app.build()
+
+    content = (app.outdir / "index.typ").read_text()
+    assert (
+        '  let rows = csv("data/values.csv", delimiter: ";")'
+        ".map(row => row.map(cell => cell.trim(at: start)))\n"
+    ) in content
+    # Header cells of the :header: option are translated as usual
+    assert '      {par({text("Name")})},\n' in content
+    assert "    ..rows.slice(0).flatten(),\n" in content
+    assert 'text("Spam")' not in content
+    assert (app.outdir / "data" / "values.csv").read_text() == (
+        srcdir / "data" / "values.csv"
+    ).read_text()
+
+    # Rows of different lengths are padded by docutils but rejected by Typst
+    assert 'text("a")' in content
+    assert not (app.outdir / "data" / "ragged.csv").exists()
+
+    # The generated markup compiles with the copied data file
+    body = content[content.index("\n#{\n") + 1 :]
+    (app.outdir / "body.typ").write_text(body)
+    typst.compile(str(app.outdir / "body.typ"), format="svg")
+
+
+def test_native_csv_table_chunks(make_app, tmp_path):
+    """With typst_table_chunk_rows, csv() rows are split into chunks."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir)
+
+    app = make_app(
+        "typst",
+        srcdir=srcdir,
+        confoverrides={"typst_native_csv_tables": True, "typst_table_chunk_rows": 1},
+    )
+    app.build()
+
+    content = (app.outdir / "index.typ").read_text()
+    assert "  for chunk in rows.slice(0).chunks(1) {\n" in content
+    assert "      ..chunk.flatten(),\n" in content
+
+    body = content[content.index("\n#{\n") + 1 :]
+    (app.outdir / "body.typ").write_text(body)
+    typst.compile(str(app.outdir / "body.typ"), format="svg")
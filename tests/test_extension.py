@@ -22,6 +22,9 @@ def test_setup_returns_metadata():
         def add_config_value(self, name, default, rebuild, types):
             pass
 
+        def add_directive(self, name, cls, override=False):
+            pass
+
     app = MockApp()
     metadata = setup(app)
 
@@ -43,6 +46,9 @@ def test_setup_parallel_safety():
         def add_config_value(self, name, default, rebuild, types):
             pass
 
+        def add_directive(self, name, cls, override=False):
+            pass
+
     app = MockApp()
     metadata = setup(app)
 
@@ -62,6 +68,9 @@ def test_setup_version_matches():
         def add_config_value(self, name, default, rebuild, types):
             pass
 
+        def add_directive(self, name, cls, override=False):
+            pass
+
     app = MockApp()
     metadata = setup(app)
 
@@ -74,3 +83,20 @@ def test_extension_can_be_loaded(temp_sphinx_app):
     app = temp_sphinx_app
     assert app is not None
     assert "typsphinx" in app.extensions
+
+
+def test_loading_extension_does_not_import_translator():
+    """Test that importing typsphinx does not load the writing stack."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, typsphinx\n"
+        "print(','.join(m for m in ('typsphinx.writer', 'typsphinx.translator', "
+        "'typsphinx.template_engine') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,198 @@
+"""
+Tests for the image preprocessing pipeline (typsphinx.images).
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from docutils import nodes
+from docutils.utils import new_document
+
+
+def _make_png(file_path, size, color=(200, 30, 30)):
+    """Write a solid-color PNG of the given size."""
+    from PIL import Image
+
+    Image.new("RGB", size, color).save(file_path, format="PNG")
+
+
+def test_large_image_is_downscaled_to_page_width(tmp_path):
+    """Images wider than page_width * dpi are resized, keeping aspect ratio."""
+    pytest.importorskip("PIL")
+    from PIL import Image
+
+    from typsphinx.images import ImagePipeline
+
+    srcdir = tmp_path / "src"
+    srcdir.mkdir()
+    _make_png(srcdir / "shot.png", (6000, 3000))
+
+    pipeline = ImagePipeline(
+        str(srcdir), str(tmp_path / "out"), {"dpi": 100, "page_width": 6}
+    )
+    output = pipeline.register("shot.png")
+    pipeline.process()
+
+    with Image.open(tmp_path / "out" / output) as image:
+        assert image.size == (600, 300)
+
+
+def test_downscaled_image_keeps_its_rendered_size(tmp_path):
+    """Resized images get a scaled DPI, so Typst renders them at the same size."""
+    pytest.importorskip("PIL")
+    import typst
+    from PIL import Image
+
+    from typsphinx.images import ImagePipeline
+
+    srcdir = tmp_path / "src"
+    srcdir.mkdir()
+    _make_png(srcdir / "plain.png", (1200, 600))
+    Image.new("RGB", (1200, 600)).save(srcdir / "print.png", dpi=(300, 300))
+
+    pipeline = ImagePipeline(
+        str(srcdir), str(tmp_path / "out"), {"dpi": 100, "page_width": 6}
+    )
+    outputs = {name: pipeline.register(name) for name in ("plain.png", "print.png")}
+    pipeline.process()
+
+    def rendered_width(image_path):
+        doc = tmp_path / "measure.typ"
+        doc.write_text(
+            f'#context [#metadata(measure(image("{image_path}")).width.pt()) <w>]'
+        )
+        result = typst.query(str(doc), "<w>", field="value", root=str(tmp_path))
+        return json.loads(result)[0]
+
+    for name, output in outputs.items():
+        with Image.open(tmp_path / "out" / output) as image:
+            assert image.width == 600
+        assert rendered_width(f"/out/{output}") == pytest.approx(
+            rendered_width(f"/src/{name}"), rel=1e-3
+        )
+
+
+def test_identical_images_share_one_output(tmp_path):
+    """Images with identical content are deduplicated by hash."""
+    pytest.importorskip("PIL")
+    from typsphinx.images import ImagePipeline
+
+    srcdir = tmp_path / "src"
+    (srcdir / "a").mkdir(parents=True)
+    (srcdir / "b").mkdir()
+    _make_png(srcdir / "a" / "logo.png", (64, 64))
+    _make_png(srcdir / "b" / "logo.png", (64, 64))
+    _make_png(srcdir / "other.png", (64, 64), color=(0, 0, 255))
+
+    pipeline = ImagePipeline(str(srcdir), str(tmp_path / "out"), {})
+    first = pipeline.register("a/logo.png")
+    second = pipeline.register("b/logo.png")
+    other = pipeline.register("other.png")
+
+    assert first == second
+    assert first.startswith("_images/")
+    assert other != first
+    assert pipeline.process() == (2, 0)
+
+
+def test_unchanged_images_are_not_reprocessed(tmp_path):
+    """A second build with the same sources and settings reuses the outputs."""
+    pytest.importorskip("PIL")
+    from typsphinx.images import ImagePipeline
+
+    srcdir = tmp_path / "src"
+    srcdir.mkdir()
+    _make_png(srcdir / "shot.png", (2000, 1000))
+    outdir = str(tmp_path / "out")
+
+    pipeline = ImagePipeline(str(srcdir), outdir, {})
+    pipeline.register("shot.png")
+    assert pipeline.process() == (1, 0)
+
+    pipeline = ImagePipeline(str(srcdir), outdir, {})
+    with patch("typsphinx.images.hash_file") as mock_hash:
+        pipeline.register("shot.png")
+    assert mock_hash.call_count == 0
+    assert pipeline.process() == (0, 1)
+
+    # Changed settings invalidate the cached output
+    pipeline = ImagePipeline(str(srcdir), outdir, {"dpi": 72})
+    pipeline.register("shot.png")
+    assert pipeline.process() == (1, 0)
+
+
+def test_missing_image_is_not_registered(tmp_path):
+    """Missing source images are reported by returning None."""
+    from typsphinx.images import ImagePipeline
+
+    pipeline = ImagePipeline(str(tmp_path), str(tmp_path / "out"), {})
+
+    assert pipeline.register("missing.png") is None
+
+
+def test_vector_images_are_copied_unchanged(tmp_path):
+    """Non-raster images are deduplicated and copied byte for byte."""
+    from typsphinx.images import ImagePipeline
+
+    svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>'
+    (tmp_path / "diagram.svg").write_bytes(svg)
+
+    pipeline = ImagePipeline(str(tmp_path), str(tmp_path / "out"), {})
+    output = pipeline.register("diagram.svg")
+    pipeline.process()
+
+    assert output.endswith(".svg")
+    assert (tmp_path / "out" / output).read_bytes() == svg
+
+
+def test_shared_cache_processes_each_image_once(tmp_path, monkeypatch):
+    """Builds sharing a cache reuse images processed by another build."""
+    pytest.importorskip("PIL")
+    from typsphinx.images import SHARED_CACHE_ENV, ImagePipeline
+
+    srcdir = tmp_path / "src"
+    srcdir.mkdir()
+    _make_png(srcdir / "shot.png", (2000, 1000))
+    monkeypatch.setenv(SHARED_CACHE_ENV, str(tmp_path / "shared"))
+
+    first = ImagePipeline(str(srcdir), str(tmp_path / "en"), {})
+    output = first.register("shot.png")
+    first.process()
+
+    second = ImagePipeline(str(srcdir), str(tmp_path / "ja"), {})
+    second.register("shot.png")
+    with patch.object(ImagePipeline, "_downscale") as downscale:
+        second.process()
+
+    downscale.assert_not_called()
+    assert (tmp_path / "ja" / output).read_bytes() == (
+        tmp_path / "en" / output
+    ).read_bytes()
+
+
+def test_builder_uses_processed_image_path(temp_sphinx_app):
+    """With typst_image_pipeline set, documents reference the processed image."""
+    pytest.importorskip("PIL")
+    from typsphinx.builder import TypstBuilder
+
+    app = temp_sphinx_app
+    _make_png(app.srcdir / "shot.png", (4000, 1000))
+    app.config.typst_image_pipeline = {}
+
+    builder = TypstBuilder(app, app.env)
+    builder.init()
+    builder.prepare_writing({"chapter/index"})
+
+    doctree = new_document("test")
+    doctree += nodes.image(uri="shot.png")
+    builder.write_doc("chapter/index", doctree)
+    builder.copy_image_files()
+
+    output = builder.images["shot.png"]
+    assert output.startswith("_images/")
+    assert (app.outdir / output).exists()
+    assert not (app.outdir / "shot.png").exists()
+
+    content = (app.outdir / "chapter" / "index.typ").read_text()
+    assert f'image("../{output}")' in content
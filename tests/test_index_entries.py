@@ -0,0 +1,122 @@
+"""
+Tests for the precomputed back-of-book index (typsphinx.index_entries).
+"""
+
+
+def test_entries_are_sorted_and_grouped():
+    """Entries are grouped by letter, symbols first, ignoring case."""
+    from typsphinx.index_entries import collect_index
+
+    entries = {
+        "one": [
+            ("single", "zebra", "index-0", "", None),
+            ("single", "apple; red", "index-1", "main", None),
+            ("pair", "banana; fruit", "index-2", "", None),
+            ("see", "cherry; apple", "index-3", "", None),
+        ],
+        "two": [
+            ("single", "Avocado", "index-0", "", None),
+            ("single", "_private", "index-1", "", None),
+            ("single", "zebra", "index-2", "main", None),
+        ],
+    }
+
+    groups = collect_index(entries, ["one", "two"])
+
+    assert [group for group, _ in groups] == ["Symbols", "A", "B", "C", "F", "Z"]
+    terms = dict(groups)
+    assert [term.name for term in terms["A"]] == ["apple", "Avocado"]
+    assert terms["A"][0].subentries == {"red": [(True, "one", "index-1")]}
+    assert terms["B"][0].subentries == {"fruit": [(False, "one", "index-2")]}
+    assert terms["C"][0].see == ["see apple"]
+    # References are listed in reading order
+    assert terms["Z"][0].targets == [
+        (False, "one", "index-0"),
+        (True, "two", "index-2"),
+    ]
+
+
+def test_only_given_documents_are_indexed():
+    """The index of a master only covers the documents it includes."""
+    from typsphinx.index_entries import collect_index
+
+    entries = {
+        "book/intro": [("single", "apple", "index-0", "", None)],
+        "other": [("single", "banana", "index-0", "", None)],
+    }
+
+    groups = collect_index(entries, ["book/intro"])
+
+    assert [term.name for _, terms in groups for term in terms] == ["apple"]
+
+
+def test_render_links_to_anchor_labels():
+    """Rendered entries link to anchors and show their page numbers."""
+    from typsphinx.index_entries import collect_index, render_index
+
+    groups = collect_index(
+        {"intro": [("single", "apple", "index-0", "main", None)]}, ["intro"]
+    )
+
+    rendered = render_index(groups, "Index")
+
+    assert "#let typst_index = {" in rendered
+    assert 'heading(level: 1, numbering: none, text("Index"))' in rendered
+    assert 'link(label("index:intro#index-0"), strong(context str(' in rendered
+    assert render_index([], "Index").endswith("#let typst_index = none\n")
+
+
+def test_master_imports_precomputed_index(make_app, tmp_path):
+    """typst_use_index writes an index file per master and passes it on."""
+    srcdir = tmp_path / "source"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "typst_use_index = True\n"
+        "typst_documents = [('index', 'index', 'Test', 'Author')]\n"
+    )
+    (srcdir / "index.rst").write_text("Test\n====\n\n.. toctree::\n\n   intro\n")
+    (srcdir / "intro.rst").write_text(
+        "Intro\n=====\n\n.. index:: apple\n\nSome :index:`banana` text.\n"
+    )
+
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+
+    master = (app.outdir / "index.typ").read_text()
+    assert '#import "/_index/index.typ": typst_index' in master
+    assert "  index: typst_index," in master
+
+    index = (app.outdir / "_index" / "index.typ").read_text()
+    assert 'text("apple")' in index
+    assert 'text("banana")' in index
+
+    intro = (app.outdir / "intro.typ").read_text()
+    assert '#label("index:intro#index-0")' in intro
+    assert '#label("index:intro#index-1")' in intro
+    assert "_template.typ" in master
+    assert "index: none" in (app.outdir / "_template.typ").read_text()
+
+
+def test_nested_master_imports_index_from_output_root(make_app, tmp_path):
+    """The index of a master in a subdirectory is imported root-absolute."""
+    srcdir = tmp_path / "source"
+    (srcdir / "guide").mkdir(parents=True)
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "typst_use_index = True\n"
+        "typst_documents = [('guide/manual', 'manual', 'Manual', 'Author')]\n"
+    )
+    (srcdir / "index.rst").write_text("Root\n====\n\n.. toctree::\n\n   guide/manual\n")
+    (srcdir / "guide" / "manual.rst").write_text(
+        "Manual\n======\n\n.. index:: apple\n\nText.\n"
+    )
+
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+
+    master = (app.outdir / "guide" / "manual.typ").read_text()
+    assert '#import "/_index/guide/manual.typ": typst_index' in master
+    assert (
+        'text("apple")' in (app.outdir / "_index" / "guide" / "manual.typ").read_text()
+    )
@@ -0,0 +1,117 @@
+"""
+Tests for ahead-of-time LaTeX math conversion (typsphinx.latex_math).
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "latex, expected",
+    [
+        ("x^2 + y^2 = z^2", "x^2 + y^2 = z^2"),
+        (r"\frac{a+b}{c}", "frac(a + b, c)"),
+        (r"\sum_{i=1}^{n} x_i", "sum_(i = 1)^n x_i"),
+        (r"\sqrt[3]{x}", "root(3, x)"),
+        (r"\alpha\beta", "alpha beta"),
+        (r"\mathbf{v} \cdot \nabla f", "bold(v) dot.op nabla f"),
+        (r"\partial f", "partial f"),
+        (r"\text{if } x < 0", '"if " x lt 0'),
+        (r"\left( \frac{1}{2} \right)", "( frac(1, 2) )"),
+        ("ab", "a b"),
+    ],
+)
+def test_convert_supported_latex(latex, expected):
+    """Supported LaTeX is converted to native Typst math."""
+    from typsphinx.latex_math import convert_latex_math
+
+    assert convert_latex_math(latex) == expected
+
+
+@pytest.mark.parametrize(
+    "latex, display",
+    [
+        (r"\begin{matrix} a \end{matrix}", True),
+        (r"\frac{a,b}{c}", False),
+        (r"a \\ b", False),
+        (r"\unknowncommand x", False),
+        ("^2", False),
+        (r"\left. x \right|", False),
+    ],
+)
+def test_convert_unsupported_latex_returns_none(latex, display):
+    """Formulas outside the supported subset are left to mitex."""
+    from typsphinx.latex_math import convert_latex_math
+
+    assert convert_latex_math(latex, display=display) is None
+
+
+def test_convert_display_math_line_breaks():
+    """Block math keeps alignment and line breaks."""
+    from typsphinx.latex_math import convert_latex_math
+
+    assert convert_latex_math(r"a &= b \\ c &= d", display=True) == (
+        r"a & = b \ c & = d"
+    )
+
+
+def test_converted_math_compiles(tmp_path):
+    """Converted formulas are valid Typst without the mitex package."""
+    typst = pytest.importorskip("typst")
+    from typsphinx.latex_math import convert_latex_math
+
+    formulas = [
+        (r"\int_0^\infty e^{-x^2} \, dx = \frac{\sqrt{\pi}}{2}", True),
+        (r"\lim_{x \to 0} \frac{\sin x}{x} = 1", True),
+        (r"\hat{x}_1 \leq \mathbb{R} \cup \{0\}", False),
+        (r"\operatorname{tr} A \neq \mathrm{d}x", False),
+        (r"a &= b \\ c &= d", True),
+    ]
+    lines = []
+    for latex, display in formulas:
+        converted = convert_latex_math(latex, display=display)
+        assert converted is not None
+        lines.append(f"$ {converted} $" if display else f"${converted}$")
+
+    typ_file = tmp_path / "math.typ"
+    typ_file.write_text("\n\n".join(lines))
+    assert typst.compile(str(typ_file), format="pdf").startswith(b"%PDF")
+
+
+def test_math_cache_persists_results(tmp_path):
+    """Conversions are stored on disk and reused by later builds."""
+    from typsphinx.latex_math import MathCache
+
+    cache_file = str(tmp_path / "cache.json")
+    cache = MathCache(cache_file)
+    assert cache.convert("x^2") == "x^2"
+    assert cache.convert(r"\begin{matrix}\end{matrix}", display=True) is None
+    cache.save()
+
+    reloaded = MathCache(cache_file)
+    assert reloaded.convert("x^2") == "x^2"
+    assert reloaded.convert(r"\begin{matrix}\end{matrix}", display=True) is None
+    assert (reloaded.hits, reloaded.misses) == (2, 0)
+    assert not reloaded.dirty
+
+
+def test_math_precompile_build(make_app, tmp_path):
+    """With typst_math_precompile, supported math bypasses mitex."""
+    srcdir = tmp_path / "source"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\ntypst_math_precompile = True\n"
+    )
+    (srcdir / "index.rst").write_text(
+        "Math\n====\n\n"
+        "Inline :math:`x^2` math.\n\n"
+        ".. math::\n\n   \\frac{a}{b}\n\n"
+        ".. math::\n\n   \\begin{pmatrix} a \\end{pmatrix}\n"
+    )
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+
+    content = (app.outdir / "index.typ").read_text()
+    assert "$x^2$" in content
+    assert "$ frac(a, b) $" in content
+    assert "mitex(`\\begin{pmatrix} a \\end{pmatrix}`)" in content
+    assert (app.doctreedir / "typst-math-cache.json").exists()
@@ -0,0 +1,56 @@
+"""
+Tests for concurrent multi-language builds (typsphinx.multilang).
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+
+def test_sphinx_command_uses_language_doctrees():
+    """Each language gets its own doctree directory and language override."""
+    from typsphinx.multilang import get_sphinx_command
+
+    command = get_sphinx_command(
+        "src", "out/ja", "doctrees/ja", "ja", "typstpdf", ["typst_debug=1"]
+    )
+
+    assert command[:3] == [sys.executable, "-m", "sphinx"]
+    assert command[3:9] == ["-b", "typstpdf", "-d", "doctrees/ja", "-D", "language=ja"]
+    assert command[9:] == ["-D", "typst_debug=1", "src", "out/ja"]
+
+
+def test_languages_are_built_concurrently(tmp_path):
+    """Languages run in parallel, bounded by jobs, and share one asset cache."""
+    from typsphinx.multilang import SHARED_CACHE_ENV, build_languages
+
+    lock = threading.Lock()
+    running = []
+    peak = []
+    envs = {}
+
+    def fake_run(command, env, **kwargs):
+        with lock:
+            running.append(command)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(command)
+        envs[env["SPHINX_LANGUAGE"]] = env
+        returncode = 1 if env["SPHINX_LANGUAGE"] == "fr" else 0
+        return type("Result", (), {"returncode": returncode, "stdout": "WARNING: x"})
+
+    with patch("typsphinx.multilang.subprocess.run", side_effect=fake_run):
+        results = build_languages(
+            str(tmp_path / "src"), str(tmp_path / "out"), ["en", "ja", "fr"], jobs=2
+        )
+
+    assert max(peak) == 2
+    assert results["en"].ok
+    assert not results["fr"].ok
+    assert results["ja"].outdir == os.path.join(str(tmp_path / "out"), "ja")
+    assert results["ja"].warnings == ["WARNING: x"]
+    shared = {env[SHARED_CACHE_ENV] for env in envs.values()}
+    assert shared == {os.path.join(str(tmp_path / "out"), ".shared")}
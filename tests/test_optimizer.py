@@ -0,0 +1,113 @@
+"""
+Tests for the peephole optimizer of generated Typst markup (typsphinx.optimizer).
+"""
+
+import typst
+
+from typsphinx.optimizer import optimize_tokens
+
+
+def test_empty_constructs_are_removed():
+    """Empty text, empty wrappers and empty blocks are removed."""
+    tokens = [
+        "#{\n",
+        'text("a")',
+        "\n",
+        'text("")',
+        "\n",
+        "strong({",
+        'text("")',
+        "})",
+        "\n",
+        "{\n",
+        "\n}",
+        "\n",
+        'text("b")',
+        "}\n",
+    ]
+
+    assert "".join(optimize_tokens(tokens)) == '#{\ntext("a")\n\ntext("b")}\n'
+
+
+def test_arguments_and_operands_are_kept():
+    """Constructs are kept where they are a function argument or operand."""
+    tokens = [
+        'link("https://example.com", ',
+        'text("")',
+        ")",
+        "\n",
+        'text("(")',
+        " + ",
+        'text("")',
+        " + ",
+        'text(")")',
+        "\n",
+        "list(",
+        "{\n",
+        "\n}",
+        ")",
+    ]
+
+    assert optimize_tokens(tokens) == tokens
+
+
+def test_blank_lines_are_collapsed_outside_raw_blocks():
+    """Repeated blank lines are removed, except inside code blocks."""
+    tokens = [
+        'par({text("a")})\n\n',
+        "\n\n\n",
+        "```python\n",
+        "a = 1\n\n\n\nb = 2",
+        "\n\n\n",
+        "\n```\n",
+        "\n\n\n",
+        'text("b")',
+    ]
+
+    assert "".join(optimize_tokens(tokens)) == (
+        'par({text("a")})\n\n'
+        "```python\na = 1\n\n\n\nb = 2\n\n\n\n```\n\n"
+        'text("b")'
+    )
+
+
+def _render(markup):
+    """Render Typst markup to PNG pages."""
+    pages = typst.compile(markup.encode("utf-8"), format="png", ppi=36)
+    return pages if isinstance(pages, list) else [pages]
+
+
+def test_optimized_output_renders_identically(make_app, tmp_path):
+    """Optimized documents render to the same pages as unoptimized ones."""
+    srcdir = tmp_path / "source"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text("extensions = ['typsphinx']\n")
+    (srcdir / "index.rst").write_text(
+        "API\n===\n\n"
+        ".. py:function:: spam(a, b=1)\n\n"
+        "   Does **things** and *stuff*.\n\n"
+        "   :param a: first\n\n"
+        ".. py:class:: Egg\n\n"
+        "   .. py:method:: fry()\n\n"
+        "      Fries.\n\n"
+        "Text with ``code`` and a `link <https://example.com>`_.\n\n"
+        "- one\n- two\n\n  nested\n\n"
+        "Term\n   Definition.\n"
+    )
+
+    bodies = []
+    for optimize in (False, True):
+        app = make_app(
+            "typst",
+            srcdir=srcdir,
+            confoverrides={"typst_optimize_output": optimize},
+            freshenv=True,
+        )
+        app.build(force_all=True)
+        content = (app.outdir / "index.typ").read_text()
+        # Render the document body alone, which needs no packages
+        bodies.append(content[content.index("\n#{\n") + 1 :])
+
+    original, optimized = bodies
+    assert len(optimized) < len(original)
+    assert _render(optimized) == _render(original)
@@ -0,0 +1,166 @@
+"""
+Tests for the offline Typst package cache (typsphinx.packages).
+"""
+
+import io
+import tarfile
+from unittest.mock import patch
+
+import pytest
+
+
+def _make_package_archive(files):
+    """Build an in-memory .tar.gz package archive from a {name: text} dict."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, text in files.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class _FakeResponse(io.BytesIO):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _fake_registry(archives, requested):
+    """Return a urlopen replacement serving archives keyed by URL suffix."""
+
+    def urlopen(url, timeout=None):
+        requested.append(url)
+        for suffix, data in archives.items():
+            if url.endswith(suffix):
+                return _FakeResponse(data)
+        raise OSError(f"not found: {url}")
+
+    return urlopen
+
+
+def test_parse_package_spec():
+    """Package specifications are split into namespace, name and version."""
+    from typsphinx.packages import parse_package_spec
+
+    assert parse_package_spec("@preview/codly-languages:0.1.1") == (
+        "preview",
+        "codly-languages",
+        "0.1.1",
+    )
+
+
+def test_parse_package_spec_invalid():
+    """Malformed specifications raise ValueError."""
+    from typsphinx.packages import parse_package_spec
+
+    with pytest.raises(ValueError):
+        parse_package_spec("codly:1.3.0")
+
+
+def test_find_package_specs_in_template():
+    """Package imports are discovered in Typst source, without duplicates."""
+    from typsphinx.packages import find_package_specs
+
+    source = (
+        '#import "@preview/codly:1.3.0": *\n'
+        '#import "@preview/charged-ieee:0.1.4": ieee\n'
+        '#import "@preview/codly:1.3.0": codly-init\n'
+    )
+
+    assert find_package_specs(source) == [
+        "@preview/codly:1.3.0",
+        "@preview/charged-ieee:0.1.4",
+    ]
+
+
+def test_get_package_dir_matches_typst_cache_layout(tmp_path):
+    """Packages are stored as <cache>/<namespace>/<name>/<version>."""
+    from typsphinx.packages import get_package_dir
+
+    package_dir = get_package_dir(str(tmp_path), "@preview/mitex:0.2.4")
+
+    assert package_dir == str(tmp_path / "preview" / "mitex" / "0.2.4")
+
+
+def test_prefetch_downloads_missing_packages_and_dependencies(tmp_path):
+    """Missing packages and the packages they import are downloaded."""
+    from typsphinx.packages import is_package_cached, prefetch_packages
+
+    archives = {
+        "/preview/clues-1.0.0.tar.gz": _make_package_archive(
+            {
+                "typst.toml": "[package]\n",
+                "lib.typ": '#import "@preview/lingo:0.4.0": *\n',
+            }
+        ),
+        "/preview/lingo-0.4.0.tar.gz": _make_package_archive(
+            {"typst.toml": "[package]\n", "lib.typ": "#let x = 1\n"}
+        ),
+    }
+    requested = []
+
+    with patch(
+        "typsphinx.packages.urllib.request.urlopen",
+        _fake_registry(archives, requested),
+    ):
+        downloaded = prefetch_packages(str(tmp_path), ["@preview/clues:1.0.0"])
+
+    assert downloaded == ["@preview/clues:1.0.0", "@preview/lingo:0.4.0"]
+    assert is_package_cached(str(tmp_path), "@preview/clues:1.0.0")
+    assert is_package_cached(str(tmp_path), "@preview/lingo:0.4.0")
+    assert len(requested) == 2
+
+
+def test_prefetch_skips_vendored_packages(tmp_path):
+    """A vendored package is used as-is without any network access."""
+    from typsphinx.packages import prefetch_packages
+
+    package_dir = tmp_path / "preview" / "codly" / "1.3.0"
+    package_dir.mkdir(parents=True)
+    (package_dir / "typst.toml").write_text("[package]\n")
+
+    requested = []
+    with patch(
+        "typsphinx.packages.urllib.request.urlopen", _fake_registry({}, requested)
+    ):
+        downloaded = prefetch_packages(str(tmp_path), ["@preview/codly:1.3.0"])
+
+    assert downloaded == []
+    assert requested == []
+
+
+def test_prefetch_failure_leaves_no_partial_package(tmp_path):
+    """A failed download does not leave a half-populated package directory."""
+    from typsphinx.packages import is_package_cached, prefetch_packages
+
+    with patch("typsphinx.packages.urllib.request.urlopen", _fake_registry({}, [])):
+        with pytest.raises(OSError):
+            prefetch_packages(str(tmp_path), ["@preview/codly:1.3.0"])
+
+    assert not is_package_cached(str(tmp_path), "@preview/codly:1.3.0")
+    assert not (tmp_path / "preview" / "codly" / "1.3.0").exists()
+
+
+def test_builder_passes_package_cache_to_compiler(temp_sphinx_app, tmp_path):
+    """TypstPDFBuilder compiles with the configured package cache directory."""
+    from typsphinx.builder import TypstPDFBuilder
+
+    builder = TypstPDFBuilder(temp_sphinx_app, temp_sphinx_app.env)
+    builder.outdir = str(tmp_path)
+    builder.config.typst_documents = [("index", "index", "Test", "Author")]
+    builder.config.typst_package_cache_path = "_typst_packages"
+    (tmp_path / "index.typ").write_text("= Test\n")
+
+    with patch("typsphinx.packages.prefetch_packages", return_value=[]) as prefetch:
+        with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+            mock_compile.return_value = b"%PDF-1.4 mock"
+            builder.finish()
+
+    expected_cache = str(temp_sphinx_app.confdir / "_typst_packages")
+    assert prefetch.call_args[0][0] == expected_cache
+    assert "@preview/codly:1.3.0" in prefetch.call_args[0][1]
+    assert mock_compile.call_args.kwargs["package_cache_path"] == expected_cache
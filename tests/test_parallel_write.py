@@ -0,0 +1,88 @@
+"""
+Tests for translating documents in a thread pool (typst_write_workers).
+"""
+
+import shutil
+
+from docutils import nodes
+
+IMAGE = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082"
+)
+
+
+def _write_project(srcdir, workers):
+    """Write a project with several chapters that use images and labels."""
+    srcdir.mkdir(parents=True, exist_ok=True)
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        f"typst_write_workers = {workers}\n"
+        "typst_native_csv_tables = True\n"
+    )
+    (srcdir / "logo.png").write_bytes(IMAGE)
+    (srcdir / "data.csv").write_text("a,b\n1,2\n")
+    toctree = "\n".join(f"   chapter{n}" for n in range(8))
+    (srcdir / "index.rst").write_text(f"Book\n====\n\n.. toctree::\n\n{toctree}\n")
+    for n in range(8):
+        (srcdir / f"chapter{n}.rst").write_text(
+            f".. _chapter-{n}:\n\nChapter {n}\n=========\n\n"
+            f".. image:: logo.png\n\n"
+            f".. csv-table::\n   :file: data.csv\n   :header-rows: 1\n\n"
+            f"See :ref:`chapter-{(n + 1) % 8}` and :math:`x^{n}`.\n"
+        )
+
+
+def test_parallel_write_matches_sequential_write(make_app, tmp_path):
+    """Documents written by worker threads are identical to sequential ones."""
+    outputs = {}
+    for workers in (None, 4):
+        srcdir = tmp_path / f"source-{workers}"
+        _write_project(srcdir, workers)
+        app = make_app("typst", srcdir=srcdir)
+        app.build()
+
+        outputs[workers] = {
+            path.relative_to(app.outdir).as_posix(): path.read_bytes()
+            for path in app.outdir.rglob("*")
+            if path.is_file() and path.suffix in (".typ", ".png", ".csv")
+        }
+        assert sorted(app.builder.images) == ["logo.png"]
+        assert app.builder.data_files == {"data.csv"}
+        assert set(app.builder.document_summaries) == {"index"} | {
+            f"chapter{n}" for n in range(8)
+        }
+        shutil.rmtree(app.outdir)
+
+    assert outputs[4] == outputs[None]
+    assert "chapter7.typ" in outputs[4]
+
+
+def test_translate_document_does_not_modify_writer_or_builder(temp_sphinx_app):
+    """translate_document() returns everything it collected."""
+    from docutils.utils import new_document
+
+    from typsphinx.builder import TypstBuilder
+    from typsphinx.writer import TypstWriter
+
+    builder = TypstBuilder(temp_sphinx_app, temp_sphinx_app.env)
+    builder.init()
+    builder.prepare_writing({"index"})
+    writer = TypstWriter(builder)
+
+    doc = new_document("index")
+    section = nodes.section()
+    section += nodes.title(text="Intro")
+    section += nodes.target(ids=["intro"])
+    section += nodes.image(uri="images/test.png")
+    doc += section
+
+    translation = writer.translate_document(doc, "chapter/index")
+
+    assert translation.docname == "chapter/index"
+    assert translation.summary.images == ["images/test.png"]
+    assert translation.summary.labels == ["intro"]
+    assert 'image("../images/test.png"' in translation.output
+    assert writer.output is None
+    assert builder.images == {}
+    assert builder.document_summaries == {}
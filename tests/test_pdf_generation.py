@@ -375,3 +375,185 @@ class TestCICDEnvironment:
                 # Error should mention both installation methods
                 assert "pip install typst" in error_msg
                 assert "typsphinx" in error_msg
+
+
+class TestFontConfiguration:
+    """Test font path configuration and font index caching"""
+
+    def test_font_index_is_cached(self):
+        """Test that fonts are scanned once per font configuration"""
+        from typsphinx.pdf import get_font_index
+
+        first = get_font_index(["fonts"], ignore_system_fonts=True)
+        second = get_font_index(("fonts",), ignore_system_fonts=True)
+
+        assert first is second
+        assert get_font_index([], ignore_system_fonts=False) is not first
+
+    def test_compile_reuses_font_index(self):
+        """Test that compiling twice does not rescan fonts"""
+        from typsphinx import pdf
+
+        pdf.compile_typst_to_pdf("= First\n", ignore_system_fonts=True)
+
+        with patch("typst.Fonts") as mock_fonts:
+            pdf_bytes = pdf.compile_typst_to_pdf("= Second\n", ignore_system_fonts=True)
+
+        assert not mock_fonts.called
+        assert pdf_bytes.startswith(b"%PDF")
+
+    def test_compile_with_font_paths(self, tmp_path):
+        """Test compiling with an explicit font directory and no system fonts"""
+        from typsphinx.pdf import compile_typst_to_pdf
+
+        pdf_bytes = compile_typst_to_pdf(
+            "= Fonts\n", font_paths=[str(tmp_path)], ignore_system_fonts=True
+        )
+
+        assert pdf_bytes.startswith(b"%PDF")
+
+    def test_builder_passes_font_configuration(self, temp_sphinx_app, tmp_path):
+        """Test that TypstPDFBuilder passes font options to the compiler"""
+        from typsphinx.builder import TypstPDFBuilder
+
+        builder = TypstPDFBuilder(temp_sphinx_app, temp_sphinx_app.env)
+        builder.outdir = str(tmp_path)
+        builder.config.typst_documents = [("index", "index", "Test", "Author")]
+        builder.config.typst_font_paths = ["_fonts"]
+        builder.config.typst_ignore_system_fonts = True
+        (tmp_path / "index.typ").write_text("= Test\n")
+
+        with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+            mock_compile.return_value = b"%PDF-1.4 mock"
+            builder.finish()
+
+        kwargs = mock_compile.call_args.kwargs
+        assert kwargs["font_paths"] == [str(temp_sphinx_app.confdir / "_fonts")]
+        assert kwargs["ignore_system_fonts"] is True
+
+
+class TestPageRendering:
+    """Test PNG/SVG page rendering (typstpng / typstsvg builders)"""
+
+    def test_compile_document_to_several_formats(self):
+        """Test that one compile exports PDF and per-page images"""
+        from typsphinx.pdf import compile_typst_document
+
+        outputs = compile_typst_document(
+            "= One\n#pagebreak()\n= Two\n", formats=("pdf", "png", "svg"), ppi=36
+        )
+
+        assert outputs["pdf"].startswith(b"%PDF")
+        assert len(outputs["png"]) == 2
+        assert outputs["png"][0].startswith(b"\x89PNG")
+        assert len(outputs["svg"]) == 2
+        assert b"<svg" in outputs["svg"][0]
+
+    def test_single_page_document_returns_page_list(self):
+        """Test that single-page output is normalized to a list"""
+        from typsphinx.pdf import compile_typst_document
+
+        outputs = compile_typst_document("= One\n", formats=("svg",))
+
+        assert isinstance(outputs["svg"], list)
+        assert len(outputs["svg"]) == 1
+
+    def test_builders_are_registered(self, temp_sphinx_app):
+        """Test that the page builders are registered with Sphinx"""
+        from typsphinx.builder import TypstPNGBuilder, TypstSVGBuilder
+
+        builders = temp_sphinx_app.registry.builders
+        assert builders["typstpng"] is TypstPNGBuilder
+        assert builders["typstsvg"] is TypstSVGBuilder
+
+    def test_png_builder_writes_pdf_and_pages(self, temp_sphinx_app, tmp_path):
+        """Test that typstpng writes the PDF and one PNG per page"""
+        from typsphinx.builder import TypstPNGBuilder
+
+        builder = TypstPNGBuilder(temp_sphinx_app, temp_sphinx_app.env)
+        builder.outdir = str(tmp_path)
+        builder.config.typst_documents = [("index", "index", "Test", "Author")]
+        builder.config.typst_png_ppi = 36
+        (tmp_path / "index.typ").write_text("= One\n#pagebreak()\n= Two\n")
+
+        builder.finish()
+
+        assert (tmp_path / "index.pdf").read_bytes().startswith(b"%PDF")
+        assert (tmp_path / "index-1.png").read_bytes().startswith(b"\x89PNG")
+        assert (tmp_path / "index-2.png").exists()
+        assert not (tmp_path / "index-3.png").exists()
+
+    def test_unchanged_pages_are_not_rewritten(self, temp_sphinx_app, tmp_path):
+        """Test that only changed pages are written and stale pages removed"""
+        import os
+
+        from typsphinx.builder import TypstSVGBuilder
+
+        builder = TypstSVGBuilder(temp_sphinx_app, temp_sphinx_app.env)
+        builder.outdir = str(tmp_path)
+        builder.config.typst_documents = [("index", "index", "Test", "Author")]
+        typ_file = tmp_path / "index.typ"
+
+        typ_file.write_text("= One\n#pagebreak()\n= Two\n#pagebreak()\n= Three\n")
+        builder.finish()
+        for page in ("index-1.svg", "index-2.svg"):
+            os.utime(tmp_path / page, ns=(0, 0))
+
+        typ_file.write_text("= One\n#pagebreak()\n= Changed\n")
+        builder.finish()
+
+        assert (tmp_path / "index-1.svg").stat().st_mtime_ns == 0
+        assert (tmp_path / "index-2.svg").stat().st_mtime_ns != 0
+        assert not (tmp_path / "index-3.svg").exists()
+
+
+class TestSeparateTypDirectory:
+    """Test publishing the .typ tree and PDFs from one typstpdf build"""
+
+    def test_typ_tree_and_pdf_in_separate_directories(self, make_app, tmp_path):
+        """Test that typst_pdf_typ_dir receives the .typ tree, outdir the PDF"""
+        srcdir = tmp_path / "source"
+        (srcdir / "chapter").mkdir(parents=True)
+        typ_dir = tmp_path / "typ"
+        (srcdir / "conf.py").write_text(
+            "extensions = ['typsphinx']\n"
+            f"typst_pdf_typ_dir = {str(typ_dir)!r}\n"
+            "typst_documents = [('index', 'index', 'Test', 'Author')]\n"
+        )
+        (srcdir / "index.rst").write_text(
+            "Test\n====\n\n.. toctree::\n\n   chapter/intro\n"
+        )
+        (srcdir / "chapter" / "intro.rst").write_text("Intro\n=====\n\nText.\n")
+
+        app = make_app("typstpdf", srcdir=srcdir)
+        with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+            mock_compile.return_value = b"%PDF-1.4 mock"
+            app.build()
+
+        assert (typ_dir / "index.typ").exists()
+        assert (typ_dir / "chapter" / "intro.typ").exists()
+        assert (typ_dir / "_template.typ").exists()
+        assert not (app.outdir / "index.typ").exists()
+        assert (app.outdir / "index.pdf").read_bytes() == b"%PDF-1.4 mock"
+        assert mock_compile.call_args.kwargs["root_dir"] == str(typ_dir)
+
+    def test_relative_typ_dir_is_resolved_from_outdir(self, make_app, tmp_path):
+        """Test that a relative typst_pdf_typ_dir is not put in the source tree"""
+        srcdir = tmp_path / "source"
+        srcdir.mkdir()
+        (srcdir / "conf.py").write_text(
+            "extensions = ['typsphinx']\n"
+            "typst_pdf_typ_dir = '../typst'\n"
+            "typst_documents = [('index', 'index', 'Test', 'Author')]\n"
+        )
+        (srcdir / "index.rst").write_text("Test\n====\n\nText.\n")
+
+        app = make_app("typstpdf", srcdir=srcdir, builddir=tmp_path / "build")
+        with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+            mock_compile.return_value = b"%PDF-1.4 mock"
+            app.build()
+
+        typ_dir = app.outdir.parent / "typst"
+        assert app.builder.typ_outdir == str(typ_dir)
+        assert (typ_dir / "index.typ").exists()
+        assert not (srcdir / "typst").exists()
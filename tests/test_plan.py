@@ -0,0 +1,85 @@
+"""
+Tests for the build plan (typsphinx.plan).
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "target, current, expected",
+    [
+        ("chapter1/section1", "chapter1/index", "section1"),
+        ("chapter2/doc", "chapter1/index", "../chapter2/doc"),
+        ("chapter1/doc", None, "chapter1/doc"),
+        ("images/logo.png", "index", "images/logo.png"),
+        ("images/logo.png", "part1/chapter1/section", "../../images/logo.png"),
+        ("part1/images/a.png", "part1/chapter1/section", "../images/a.png"),
+    ],
+)
+def test_compute_relative_path(target, current, expected):
+    """Relative paths match the include and image path conventions."""
+    from typsphinx.plan import compute_relative_path
+
+    assert compute_relative_path(target, current) == expected
+
+
+def test_build_plan_routing(tmp_path):
+    """The plan precomputes masters, output paths and directories."""
+    from typsphinx.plan import BuildPlan
+
+    plan = BuildPlan(
+        str(tmp_path), ["index", "guide/install", "guide/deep/api"], ["index"]
+    )
+
+    assert plan.is_master("index")
+    assert not plan.is_master("guide/install")
+    assert plan.get_output_path("guide/install") == str(
+        tmp_path / "guide" / "install.typ"
+    )
+
+    plan.create_directories()
+    assert (tmp_path / "guide" / "deep").is_dir()
+
+
+def test_build_plan_unplanned_document_gets_directory(tmp_path):
+    """Documents outside the plan still get an output path and directory."""
+    from typsphinx.plan import BuildPlan
+
+    plan = BuildPlan(str(tmp_path), [], [])
+
+    assert plan.get_output_path("extra/doc") == str(tmp_path / "extra" / "doc.typ")
+    assert (tmp_path / "extra").is_dir()
+
+
+def test_build_plan_memoizes_relative_paths(tmp_path):
+    """Repeated lookups of the same target do not recompute the path."""
+    from typsphinx.plan import BuildPlan
+
+    plan = BuildPlan(str(tmp_path), ["a/b"], [])
+
+    with patch(
+        "typsphinx.plan.compute_relative_path", return_value="../img.png"
+    ) as compute:
+        for _ in range(3):
+            assert plan.relative_path("img.png", "a/b") == "../img.png"
+
+    assert compute.call_count == 1
+
+
+def test_prepare_writing_creates_build_plan(temp_sphinx_app):
+    """prepare_writing() creates the plan used by the writer."""
+    from typsphinx.builder import TypstBuilder
+
+    app = temp_sphinx_app
+    app.config.typst_documents = [("index", "index", "Test", "Author")]
+    builder = TypstBuilder(app, app.env)
+    builder.init()
+
+    builder.prepare_writing({"index", "chapter/intro"})
+
+    assert builder.build_plan.is_master("index")
+    assert (app.outdir / "chapter").is_dir()
+    assert builder.writer._is_master_document("index")
+    assert not builder.writer._is_master_document("chapter/intro")
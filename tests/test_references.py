@@ -0,0 +1,84 @@
+"""
+Tests for label and include validation (typsphinx.references).
+"""
+
+from unittest.mock import patch
+
+
+def _summary(labels=(), references=(), includes=()):
+    """Create a document summary with the given labels and links."""
+    from typsphinx.translator import DocumentSummary
+
+    summary = DocumentSummary()
+    summary.labels.extend(labels)
+    summary.references.extend(references)
+    summary.includes.extend(includes)
+    return summary
+
+
+def test_labels_are_shared_by_documents_compiled_together(tmp_path):
+    """A reference is valid if any document of the master defines the label."""
+    from typsphinx.references import ReferenceIndex
+
+    (tmp_path / "chapter.typ").write_text("")
+    index = ReferenceIndex(str(tmp_path / "index.json"))
+    index.update("index", _summary(references=["fig-1"], includes=["chapter"]))
+    index.update("chapter", _summary(labels=["fig-1"]))
+
+    assert index.validate({"index", "chapter"}, str(tmp_path)) == []
+
+
+def test_all_problems_are_reported(tmp_path):
+    """Undefined labels and missing includes are all reported."""
+    from typsphinx.references import ReferenceIndex
+
+    index = ReferenceIndex(str(tmp_path / "index.json"))
+    index.update("index", _summary(references=["missing", "eq-1"], includes=["gone"]))
+    index.update("other", _summary(labels=["eq-1"]))
+
+    assert index.validate({"index"}, str(tmp_path)) == [
+        "index: link to undefined label <eq-1>",
+        "index: link to undefined label <missing>",
+        "index: include of missing document gone.typ",
+    ]
+
+
+def test_index_persists_and_prunes_removed_documents(tmp_path):
+    """The index survives builds and forgets documents that were removed."""
+    from typsphinx.references import ReferenceIndex
+
+    index_file = str(tmp_path / "index.json")
+    index = ReferenceIndex(index_file)
+    index.update("index", _summary(labels=["a"]))
+    index.update("removed", _summary(labels=["b"]))
+    index.prune(["index"])
+    index.save()
+
+    assert ReferenceIndex(index_file).documents == {
+        "index": {"labels": ["a"], "references": [], "includes": []}
+    }
+
+
+def test_pdf_builder_skips_masters_with_broken_references(make_app, tmp_path):
+    """Masters with broken references are reported and not compiled."""
+    srcdir = tmp_path / "source"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "typst_documents = [\n"
+        "    ('index', 'index', 'Main', 'Author'),\n"
+        "    ('other', 'other', 'Other', 'Author'),\n"
+        "]\n"
+    )
+    (srcdir / "index.rst").write_text("Main\n====\n\nSee `this <#nope>`_.\n")
+    (srcdir / "other.rst").write_text("Other\n=====\n\nText.\n")
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+        mock_compile.return_value = b"%PDF-1.4 mock"
+        app.build()
+
+    assert mock_compile.call_count == 1
+    assert not (app.outdir / "index.pdf").exists()
+    assert (app.outdir / "other.pdf").exists()
+    assert "index: link to undefined label <nope>" in app.warning.getvalue()
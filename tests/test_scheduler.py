@@ -0,0 +1,117 @@
+"""
+Tests for pipelined master compilation (typsphinx.scheduler).
+"""
+
+from unittest.mock import patch
+
+
+def test_master_is_ready_when_its_documents_are_written():
+    """A master becomes ready once the last of its documents is written."""
+    from typsphinx.scheduler import CompileScheduler
+
+    scheduler = CompileScheduler(
+        {"a": {"a", "a/guide"}, "b": {"b"}, "c": set()}, compile_master=print
+    )
+
+    assert scheduler.document_written("a/guide") == []
+    assert scheduler.document_written("b") == ["b"]
+    assert scheduler.document_written("a") == ["a"]
+    # Masters without documents to write are left to the caller
+    assert scheduler.waiting == {}
+    scheduler.wait()
+
+
+def test_wait_returns_submitted_and_skipped_masters():
+    """wait() runs all submitted compilations and reports handled masters."""
+    from typsphinx.scheduler import CompileScheduler
+
+    compiled = []
+    scheduler = CompileScheduler({}, compile_master=compiled.append, max_workers=2)
+    scheduler.submit("a")
+    scheduler.submit("b")
+    scheduler.skip("c")
+
+    assert scheduler.wait() == {"a", "b", "c"}
+    assert sorted(compiled) == ["a", "b"]
+
+
+def test_masters_compile_while_other_documents_are_written(make_app, tmp_path):
+    """With typst_compile_pipeline, a master compiles before later documents."""
+    from typsphinx.scheduler import CompileScheduler
+
+    srcdir = tmp_path / "source"
+    for product in ("alpha", "beta"):
+        (srcdir / product).mkdir(parents=True)
+        (srcdir / product / "index.rst").write_text(
+            f"{product}\n=====\n\n.. toctree::\n\n   guide\n"
+        )
+        (srcdir / product / "guide.rst").write_text("Guide\n=====\n\nText.\n")
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "typst_compile_pipeline = True\n"
+        "typst_documents = [\n"
+        "    ('alpha/index', 'alpha', 'Alpha', 'Author'),\n"
+        "    ('beta/index', 'beta', 'Beta', 'Author'),\n"
+        "]\n"
+    )
+    (srcdir / "index.rst").write_text(
+        "Root\n====\n\n.. toctree::\n\n   alpha/index\n   beta/index\n"
+    )
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    submitted = {}
+    original_submit = CompileScheduler.submit
+
+    def submit(scheduler, master):
+        submitted[master] = (app.outdir / "beta" / "guide.typ").exists()
+        original_submit(scheduler, master)
+
+    with patch.object(CompileScheduler, "submit", submit):
+        with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+            mock_compile.return_value = b"%PDF-1.4 mock"
+            app.build()
+
+    # alpha was submitted before the beta documents were written
+    assert submitted == {"alpha/index": False, "beta/index": True}
+    assert mock_compile.call_count == 2
+    assert (app.outdir / "alpha" / "index.pdf").exists()
+    assert (app.outdir / "beta" / "index.pdf").exists()
+
+
+def test_compile_options_are_computed_once_on_the_main_thread(make_app, tmp_path):
+    """Background compiles share options computed before the first submit."""
+    import threading
+
+    from typsphinx.builder import TypstPDFBuilder
+
+    srcdir = tmp_path / "source"
+    srcdir.mkdir()
+    for product in ("alpha", "beta"):
+        (srcdir / f"{product}.rst").write_text(f"{product}\n=====\n\nText.\n")
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "typst_compile_pipeline = True\n"
+        "typst_documents = [\n"
+        "    ('alpha', 'alpha', 'Alpha', 'Author'),\n"
+        "    ('beta', 'beta', 'Beta', 'Author'),\n"
+        "]\n"
+    )
+    (srcdir / "index.rst").write_text(
+        "Root\n====\n\n.. toctree::\n\n   alpha\n   beta\n"
+    )
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    threads = []
+    original = TypstPDFBuilder.get_compile_options
+
+    def get_compile_options(builder):
+        threads.append(threading.current_thread())
+        return original(builder)
+
+    with patch.object(TypstPDFBuilder, "get_compile_options", get_compile_options):
+        with patch("typsphinx.builder.compile_typst_to_pdf") as mock_compile:
+            mock_compile.return_value = b"%PDF-1.4 mock"
+            app.build()
+
+    assert threads == [threading.main_thread()]
+    assert mock_compile.call_count == 2
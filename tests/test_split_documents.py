@@ -0,0 +1,79 @@
+"""
+Tests for splitting large documents into part files (typst_split_lines).
+"""
+
+import os
+
+SECTIONS = ("First", "Second", "Third")
+
+
+def _write_project(srcdir, sections=SECTIONS, split_lines=10):
+    """Write a document with one section per name below its title."""
+    srcdir.mkdir(parents=True, exist_ok=True)
+    (srcdir / "conf.py").write_text(
+        f"extensions = ['typsphinx']\ntypst_split_lines = {split_lines}\n"
+    )
+    content = "API\n===\n\nIntro.\n\n"
+    for name in sections:
+        content += f"{name}\n------\n\nAbout _`{name} target`.\n\n"
+        content += "Detail\n~~~~~~\n\nMore.\n\n"
+    (srcdir / "index.rst").write_text(content)
+
+
+def test_large_document_is_split_at_sections(make_app, tmp_path):
+    """Each section becomes a part file that the document includes."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir)
+
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+
+    content = (app.outdir / "index.typ").read_text()
+    assert 'heading(level: 1, text("API"))' in content
+    assert 'include("index.part1.typ")\n' in content
+    assert 'include("index.part3.typ")\n' in content
+    assert "First" not in content
+
+    part = (app.outdir / "index.part2.typ").read_text()
+    # Parts have the imports of included documents and keep heading levels
+    assert '#import "@preview/codly:1.3.0": *' in part
+    assert 'heading(level: 2, text("Second"))' in part
+    assert 'heading(level: 3, text("Detail"))' in part
+    # Labels are kept and recorded for the document
+    assert 'label("second-target")' in part
+    summary = app.builder.document_summaries["index"]
+    assert {"first-target", "second-target", "third-target"} <= set(summary.labels)
+
+
+def test_small_document_is_not_split(make_app, tmp_path):
+    """Documents up to typst_split_lines lines are written as one file."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir, split_lines=1000)
+
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+
+    assert 'heading(level: 2, text("First"))' in (app.outdir / "index.typ").read_text()
+    assert not (app.outdir / "index.part1.typ").exists()
+
+
+def test_unchanged_parts_are_kept(make_app, tmp_path):
+    """Unchanged parts are not rewritten and removed parts are deleted."""
+    srcdir = tmp_path / "source"
+    _write_project(srcdir)
+
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+    first = app.outdir / "index.part1.typ"
+    os.utime(first, ns=(0, 0))
+
+    # Drop the last section and rebuild
+    _write_project(srcdir, sections=SECTIONS[:2])
+    source = srcdir / "index.rst"
+    os.utime(source, ns=(0, os.stat(source).st_mtime_ns + 10**9))
+    app = make_app("typst", srcdir=srcdir)
+    app.build()
+
+    assert os.stat(first).st_mtime_ns == 0
+    assert (app.outdir / "index.part2.typ").exists()
+    assert not (app.outdir / "index.part3.typ").exists()
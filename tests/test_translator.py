@@ -3218,3 +3218,268 @@ def test_image_path_adjustment_subdirectory(simple_document, mock_builder):
     assert 'image("img/diagram.jpeg"' in output
     assert "width: 250px" in output
     assert "../" not in output  # No need to go up
+
+
+def test_translator_collects_document_summary(simple_document, mock_builder):
+    """Test that one translation walk collects images, toctree options and labels."""
+    from sphinx import addnodes
+
+    from typsphinx.translator import TypstTranslator
+
+    section = nodes.section(ids=["intro"])
+    section += nodes.title(text="Intro")
+    section += nodes.target(ids=["my-label"])
+    section += nodes.image(uri="images/a.png")
+    section += nodes.math_block(text="x^2", ids=["eq-1"])
+    toctree = addnodes.toctree(maxdepth=3, numbered=1, caption="Contents")
+    toctree["entries"] = []
+    section += toctree
+    section += addnodes.toctree(maxdepth=1)
+    simple_document += section
+
+    mock_builder.current_docname = "index"
+    translator = TypstTranslator(simple_document, mock_builder)
+    simple_document.walkabout(translator)
+
+    summary = translator.summary
+    assert summary.images == ["images/a.png"]
+    assert summary.toctree_options == {
+        "toctree_maxdepth": 3,
+        "toctree_numbered": True,
+        "toctree_caption": "Contents",
+    }
+    assert summary.labels == ["my-label", "eq-1"]
+    assert {"image", "math", "toctree"} <= summary.features
+    assert "table" not in summary.features
+
+
+def test_translator_uses_builder_image_paths(simple_document, mock_builder):
+    """Test that image paths are resolved by the builder and images collected."""
+    from typsphinx.translator import TypstTranslator
+
+    resolved = []
+
+    def resolve_image(uri):
+        resolved.append(uri)
+        return "_images/0123abcd.png"
+
+    mock_builder.resolve_image = resolve_image
+    translator = TypstTranslator(simple_document, mock_builder, "chapter/index")
+
+    translator.visit_image(nodes.image(uri="images/a.png"))
+
+    assert resolved == ["images/a.png"]
+    assert translator.summary.images == ["images/a.png"]
+    assert 'image("../_images/0123abcd.png")' in translator.astext()
+
+
+def test_long_code_block_uses_fast_path(simple_document, mock_builder):
+    """Code blocks above typst_code_block_fast_threshold skip codly."""
+    from docutils import nodes
+
+    from typsphinx.translator import TypstTranslator
+
+    mock_builder.config.typst_code_block_fast_threshold = 3
+    mock_builder.config.typst_code_block_chunk_lines = 2
+    translator = TypstTranslator(simple_document, mock_builder)
+
+    code = "a = 1\nb = 2\nc = 3\nd = 4\ne = 5"
+    literal_block = nodes.literal_block(code, code)
+    literal_block["language"] = "python"
+    literal_block["highlight_args"] = {"hl_lines": [2]}
+    literal_block.walkabout(translator)
+
+    output = translator.astext()
+    assert "codly-disable()\n" in output
+    assert output.count("```python\n") == 3
+    assert "```python\na = 1\nb = 2\n```" in output
+    assert "```python\ne = 5\n```" in output
+    assert "codly-range" not in output
+    assert output.rstrip().endswith("codly-enable()")
+
+
+def test_long_captioned_code_block_prefixes_codly_calls(simple_document, mock_builder):
+    """codly calls of the fast path are markup inside a captioned code block."""
+    from docutils import nodes
+
+    from typsphinx.translator import TypstTranslator
+
+    mock_builder.config.typst_code_block_fast_threshold = 3
+    container = nodes.container()
+    container["classes"].append("literal-block-wrapper")
+    container += nodes.caption("", "Long listing")
+    code = "a = 1\nb = 2\nc = 3\nd = 4"
+    container += nodes.literal_block(code, code)
+    simple_document += container
+
+    translator = TypstTranslator(simple_document, mock_builder)
+    simple_document.walkabout(translator)
+    output = translator.astext()
+
+    assert "figure(caption: [Long listing])[\n#codly-disable()\n" in output
+    assert "```\n#codly-enable()\n]" in output
+
+
+def test_short_code_block_keeps_codly(simple_document, mock_builder):
+    """Code blocks at or below the threshold still use codly."""
+    from docutils import nodes
+
+    from typsphinx.translator import TypstTranslator
+
+    mock_builder.config.typst_code_block_fast_threshold = 3
+    translator = TypstTranslator(simple_document, mock_builder)
+
+    code = "a = 1\nb = 2\nc = 3"
+    literal_block = nodes.literal_block(code, code)
+    literal_block.walkabout(translator)
+
+    output = translator.astext()
+    assert "codly-disable" not in output
+    assert "codly(number-format: none)" in output
+    assert output.count("```") == 2
+
+
+def test_index_node_emits_anchors(simple_document, mock_builder):
+    """With typst_use_index, index nodes emit one anchor label per target."""
+    from sphinx import addnodes
+
+    from typsphinx.translator import TypstTranslator
+
+    mock_builder.config.typst_use_index = True
+    mock_builder.current_docname = "chapter/intro"
+    translator = TypstTranslator(simple_document, mock_builder)
+
+    index = addnodes.index(
+        entries=[
+            ("single", "apple", "index-0", "", None),
+            ("pair", "banana; fruit", "index-0", "", None),
+        ]
+    )
+    with pytest.raises(nodes.SkipNode):
+        translator.visit_index(index)
+
+    output = translator.astext()
+    assert output.count("metadata(none)") == 1
+    assert '[#metadata(none)#label("index:chapter/intro#index-0")]' in output
+    assert "index:chapter/intro#index-0" in translator.summary.labels
+
+
+def test_codly_settings_are_emitted_only_when_they_change(
+    simple_document, mock_builder
+):
+    """codly state is set once and only changed for blocks that differ."""
+    from docutils import nodes
+
+    from typsphinx.translator import TypstTranslator
+
+    translator = TypstTranslator(simple_document, mock_builder)
+
+    for linenos in (False, False, True, True, False):
+        literal_block = nodes.literal_block("x = 1", "x = 1")
+        literal_block["linenos"] = linenos
+        literal_block.walkabout(translator)
+    numbered = nodes.literal_block("y = 2", "y = 2")
+    numbered["linenos"] = True
+    numbered["highlight_args"] = {"linenostart": 10}
+    numbered.walkabout(translator)
+
+    output = translator.astext()
+    assert output.count("codly(number-format: none)") == 2
+    assert output.count('codly(number-format: numbering.with("1"))') == 2
+    assert output.count("codly(start: 10)") == 1
+    assert "codly(start: 1)" not in output
+
+
+def test_codly_settings_are_restored_around_includes(simple_document, mock_builder):
+    """Included documents start with and leave their own codly settings."""
+    from docutils import nodes
+    from sphinx import addnodes
+
+    from typsphinx.translator import TypstTranslator
+
+    translator = TypstTranslator(simple_document, mock_builder, "index")
+
+    numbered = nodes.literal_block("x = 1", "x = 1")
+    numbered["linenos"] = True
+    numbered["highlight_args"] = {"linenostart": 40}
+    numbered.walkabout(translator)
+    toctree = addnodes.toctree()
+    toctree["entries"] = [(None, "child")]
+    toctree.walkabout(translator)
+    plain = nodes.literal_block("y = 2", "y = 2")
+    plain["linenos"] = True
+    plain.walkabout(translator)
+
+    output = translator.astext()
+    before, after = output.split('include("child.typ")')
+    # The child assumes the default start, not the parent's
+    assert before.rindex("codly(start: 1)") > before.index("codly(start: 40)")
+    # The child's settings are unknown after the include, so all are emitted
+    assert "codly(start: 1)" in after
+    assert 'codly(number-format: numbering.with("1"))' in after
+
+
+def test_code_block_in_list_item_without_codly_calls_is_not_wrapped(
+    simple_document, mock_builder
+):
+    """Only code blocks with codly calls need a { } wrapper in list items."""
+    from docutils import nodes
+
+    from typsphinx.translator import TypstTranslator
+
+    translator = TypstTranslator(simple_document, mock_builder)
+    translator.in_list_item = True
+
+    for _ in range(2):
+        literal_block = nodes.literal_block("x = 1", "x = 1")
+        literal_block.walkabout(translator)
+
+    output = translator.astext()
+    assert output.count("{\n") == 1
+    assert output.count("}") == 1
+    assert output.count("codly(number-format: none)") == 1
+
+
+def test_long_table_is_split_into_chunks(simple_document, mock_builder):
+    """Tables above typst_table_chunk_rows are split without cutting rowspans."""
+    from typsphinx.translator import TypstTranslator
+
+    mock_builder.config.typst_table_chunk_rows = 2
+    translator = TypstTranslator(simple_document, mock_builder)
+
+    table = nodes.table()
+    tgroup = nodes.tgroup(cols=2)
+    tgroup += nodes.colspec(colwidth=1)
+    tgroup += nodes.colspec(colwidth=1)
+    thead = nodes.thead()
+    header = nodes.row()
+    for text in ("Key", "Value"):
+        entry = nodes.entry()
+        entry += nodes.paragraph(text=text)
+        header += entry
+    thead += header
+    tgroup += thead
+
+    # Row 1 has a cell spanning rows 1 and 2, so no chunk may end after row 1
+    tbody = nodes.tbody()
+    for index in range(5):
+        row = nodes.row()
+        if index != 2:
+            entry = nodes.entry(morerows=1 if index == 1 else 0)
+            entry += nodes.paragraph(text=f"key{index}")
+            row += entry
+        entry = nodes.entry()
+        entry += nodes.paragraph(text=f"value{index}")
+        row += entry
+        tbody += row
+    tgroup += tbody
+    table += tgroup
+
+    table.walkabout(translator)
+    output = translator.astext()
+
+    chunks = output.split("table(\n  columns: 2,\n")[1:]
+    assert len(chunks) == 2
+    assert all('text("Key")' in chunk for chunk in chunks)
+    assert "value2" in chunks[0] and "key3" in chunks[1]
+    assert "rowspan: 2" in chunks[0]
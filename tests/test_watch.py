@@ -0,0 +1,119 @@
+"""
+Tests for watch mode (typsphinx.watch).
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+
+
+@pytest.fixture
+def watch_app(tmp_path):
+    """Create a typstpdf Sphinx application with two master documents."""
+    srcdir = tmp_path / "source"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "project = 'Test Project'\n"
+        "typst_documents = [\n"
+        "    ('index', 'index', 'Main', 'Author'),\n"
+        "    ('other', 'other', 'Other', 'Author'),\n"
+        "]\n"
+    )
+    (srcdir / "index.rst").write_text(
+        "Main\n====\n\n.. toctree::\n\n   chapter1\n   chapter2\n"
+    )
+    (srcdir / "chapter1.rst").write_text("Chapter 1\n=========\n\nFirst.\n")
+    (srcdir / "chapter2.rst").write_text("Chapter 2\n=========\n\nSecond.\n")
+    (srcdir / "other.rst").write_text("Other\n=====\n\nStandalone.\n")
+
+    app = SphinxTestApp(
+        buildername="typstpdf", srcdir=srcdir, builddir=tmp_path / "build"
+    )
+    yield app
+    app.cleanup()
+
+
+def _touch(file_path, text):
+    """Rewrite a file with a modification time clearly after the last build."""
+    file_path.write_text(text)
+    future = os.stat(file_path).st_mtime_ns + 10_000_000_000
+    os.utime(file_path, ns=(future, future))
+
+
+def test_watch_requires_pdf_builder(temp_sphinx_app):
+    """Watch mode refuses builders other than typstpdf."""
+    from typsphinx.watch import TypstWatcher
+
+    with pytest.raises(ValueError, match="typstpdf"):
+        TypstWatcher(temp_sphinx_app)
+
+
+def test_initial_build_compiles_all_masters(watch_app):
+    """The first build writes every document and compiles every master."""
+    from typsphinx.watch import TypstWatcher
+
+    with patch("typsphinx.pdf.create_typst_compiler") as mock_create:
+        mock_create.return_value.compile.return_value = b"%PDF-1.4 mock"
+        affected = TypstWatcher(watch_app).rebuild(force_all=True)
+
+    assert affected == {"index", "other"}
+    outdir = watch_app.outdir
+    assert (outdir / "chapter1.typ").exists()
+    assert (outdir / "index.pdf").read_bytes() == b"%PDF-1.4 mock"
+    assert (outdir / "other.pdf").exists()
+
+
+def test_change_recompiles_only_affected_master(watch_app):
+    """Editing a chapter rewrites it and recompiles only its master."""
+    from typsphinx.watch import TypstWatcher
+
+    compilers = {}
+
+    def create_compiler(typ_file, **kwargs):
+        compiler = MagicMock()
+        compiler.compile.return_value = b"%PDF-1.4 mock"
+        compilers[os.path.basename(typ_file)] = compiler
+        return compiler
+
+    with patch("typsphinx.pdf.create_typst_compiler", side_effect=create_compiler):
+        watcher = TypstWatcher(watch_app)
+        watcher.run(max_polls=0)
+        chapter2_mtime = os.stat(watch_app.outdir / "chapter2.typ").st_mtime_ns
+
+        _touch(watch_app.srcdir / "chapter1.rst", "Chapter 1\n=========\n\nEdited.\n")
+        affected = watcher.poll()
+
+    assert affected == {"index"}
+    assert "Edited." in (watch_app.outdir / "chapter1.typ").read_text()
+    assert os.stat(watch_app.outdir / "chapter2.typ").st_mtime_ns == chapter2_mtime
+    # The long-lived compiler of index is reused, other is not recompiled
+    assert compilers["index.typ"].compile.call_count == 2
+    assert compilers["other.typ"].compile.call_count == 1
+
+
+def test_poll_without_changes_does_nothing(watch_app):
+    """Polling an unchanged source tree does not rebuild anything."""
+    from typsphinx.watch import TypstWatcher
+
+    with patch("typsphinx.pdf.create_typst_compiler") as mock_create:
+        mock_create.return_value.compile.return_value = b"%PDF-1.4 mock"
+        watcher = TypstWatcher(watch_app)
+        watcher.run(max_polls=0)
+
+        assert watcher.poll() == set()
+        assert mock_create.return_value.compile.call_count == 2
+
+
+def test_parse_overrides():
+    """-D options are parsed into configuration overrides."""
+    from typsphinx.watch import _parse_overrides
+
+    assert _parse_overrides(["typst_debug=1", "project=A=B"]) == {
+        "typst_debug": "1",
+        "project": "A=B",
+    }
+    with pytest.raises(ValueError):
+        _parse_overrides(["typst_debug"])
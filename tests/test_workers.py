@@ -0,0 +1,108 @@
+"""
+Tests for isolated Typst compile worker processes (typsphinx.workers).
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from typsphinx.pdf import TypstCompilationError, compile_typst_to_pdf
+
+
+@pytest.fixture
+def make_pool():
+    """Create compile worker pools and stop their workers after the test."""
+    from typsphinx.workers import CompileWorkerPool
+
+    pools = []
+
+    def make(**options):
+        pool = CompileWorkerPool(options)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_compile_in_worker(make_pool):
+    """A worker returns the same PDF as in-process compilation."""
+    pool = make_pool()
+
+    pdf_bytes = pool.compile_typst_to_pdf("= Hello\n\nWorld.\n")
+
+    assert pdf_bytes.startswith(b"%PDF-")
+
+
+def test_compile_error_matches_in_process_error(make_pool):
+    """Errors in a worker map to TypstCompilationError with the same details."""
+    pool = make_pool()
+
+    with pytest.raises(TypstCompilationError) as remote:
+        pool.compile_typst_to_pdf("#unknown-function()\n")
+    with pytest.raises(TypstCompilationError) as local:
+        compile_typst_to_pdf("#unknown-function()\n")
+
+    assert str(remote.value.typst_error) == str(local.value.typst_error)
+    assert "unknown variable" in str(remote.value)
+    # The worker survives a compile error
+    assert pool.compile_typst_to_pdf("Text.\n").startswith(b"%PDF-")
+
+
+def test_worker_is_recycled_after_max_compiles(make_pool):
+    """Workers are replaced by a fresh process after max_compiles."""
+    pool = make_pool(max_compiles=2)
+
+    pool.compile_typst_to_pdf("One.\n")
+    first = pool._slots.queue[0]
+    pool.compile_typst_to_pdf("Two.\n")
+    assert pool._slots.queue[0] is None
+    assert first.process.poll() is not None
+
+    pool.compile_typst_to_pdf("Three.\n")
+    assert pool._slots.queue[0] is not first
+
+
+def test_compile_timeout(make_pool):
+    """A compile exceeding the timeout is aborted and the pool stays usable."""
+    pool = make_pool(timeout=0.5)
+
+    with pytest.raises(TypstCompilationError, match="timed out after 0.5 seconds"):
+        pool.compile_typst_to_pdf("#for i in range(100000000) { }\n")
+
+    assert pool.compile_typst_to_pdf("Text.\n").startswith(b"%PDF-")
+
+
+def test_only_compile_functions_run_in_workers(make_pool):
+    """Arbitrary functions of typsphinx.pdf cannot be called in a worker."""
+    pool = make_pool()
+
+    with pytest.raises(ValueError):
+        pool.call("create_typst_compiler", "index.typ")
+
+
+def test_builder_compiles_in_worker_processes(make_app, tmp_path):
+    """With typst_compile_processes, typstpdf compiles masters in workers."""
+    srcdir = tmp_path / "source"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text(
+        "extensions = ['typsphinx']\n"
+        "typst_compile_processes = {'max_compiles': 1}\n"
+        "typst_documents = [('index', 'index', 'Test', 'Author')]\n"
+    )
+    (srcdir / "index.rst").write_text("Test\n====\n\nText.\n")
+
+    app = make_app("typstpdf", srcdir=srcdir)
+    with patch(
+        "typsphinx.workers.CompileWorkerPool.compile_typst_to_pdf",
+        return_value=b"%PDF-1.4 mock",
+    ) as pool_compile:
+        with patch("typsphinx.builder.compile_typst_to_pdf") as in_process:
+            app.build()
+
+    pool_compile.assert_called_once()
+    in_process.assert_not_called()
+    assert (app.outdir / "index.pdf").read_bytes() == b"%PDF-1.4 mock"
+    # Workers are stopped when the build finishes
+    assert getattr(app.builder, "_compile_pool", None) is None
@@ -18,7 +18,13 @@ from typing import Any, Dict
 
 from sphinx.application import Sphinx
 
-from typsphinx.builder import TypstBuilder, TypstPDFBuilder
+from typsphinx.builder import (
+    TypstBuilder,
+    TypstPDFBuilder,
+    TypstPNGBuilder,
+    TypstSVGBuilder,
+)
+from typsphinx.csv_tables import TypstCSVTable
 
 
 def setup(app: Sphinx) -> Dict[str, Any]:
@@ -35,6 +41,8 @@ def setup(app: Sphinx) -> Dict[str, Any]:
     """
     app.add_builder(TypstBuilder)
     app.add_builder(TypstPDFBuilder)
+    app.add_builder(TypstPNGBuilder)
+    app.add_builder(TypstSVGBuilder)
 
     # Register configuration values
     app.add_config_value("typst_documents", [], "html", [list])
@@ -43,6 +51,14 @@ def setup(app: Sphinx) -> Dict[str, Any]:
     app.add_config_value("typst_toctree_defaults", None, "html", [dict, type(None)])
     app.add_config_value("typst_use_mitex", True, "html", [bool])
     app.add_config_value("typst_elements", {}, "html", [dict])
+    # Code blocks longer than this many lines skip codly (None = never)
+    app.add_config_value(
+        "typst_code_block_fast_threshold", None, "html", [int, type(None)]
+    )
+    # Split code blocks on the fast path into chunks of this many lines
+    app.add_config_value(
+        "typst_code_block_chunk_lines", None, "html", [int, type(None)]
+    )
     # Task 13.4: Other configuration options (Requirement 8.6)
     app.add_config_value("typst_package", None, "html", [str, type(None)])
     app.add_config_value("typst_package_imports", None, "html", [list, type(None)])
@@ -57,6 +73,45 @@ def setup(app: Sphinx) -> Dict[str, Any]:
     app.add_config_value("typst_debug", False, "html", [bool])
     # Issue #75: Template asset support
     app.add_config_value("typst_template_assets", None, "html", [list, type(None)])
+    # Offline package resolution for PDF builds
+    app.add_config_value("typst_package_cache_path", None, "html", [str, type(None)])
+    # Font configuration for PDF builds
+    app.add_config_value("typst_font_paths", [], "html", [list])
+    app.add_config_value("typst_ignore_system_fonts", False, "html", [bool])
+    # Image preprocessing (downscale, recompress, deduplicate)
+    app.add_config_value("typst_image_pipeline", None, "html", [dict, type(None)])
+    # Page image rendering (typstpng builder)
+    app.add_config_value("typst_png_ppi", 144.0, "html", [int, float])
+    # Publish the .typ tree of typstpdf builds to a separate directory
+    app.add_config_value("typst_pdf_typ_dir", None, "html", [str, type(None)])
+    # Build only the include closure of selected master documents
+    app.add_config_value("typst_build_masters", None, "html", [list, str, type(None)])
+    # Check labels and includes of master documents before compiling them
+    app.add_config_value("typst_validate_references", True, "html", [bool])
+    # Compile master documents in the background while writing
+    app.add_config_value("typst_compile_pipeline", False, "html", [bool])
+    app.add_config_value("typst_compile_workers", None, "html", [int, type(None)])
+    # Compile each chapter of a master as a standalone preview PDF
+    app.add_config_value("typst_pdf_chapters", False, "html", [bool, list, str])
+    # Compile in memory-limited, recyclable worker processes
+    app.add_config_value("typst_compile_processes", None, "html", [dict, type(None)])
+    # Precomputed back-of-book index from Sphinx index entries
+    app.add_config_value("typst_use_index", False, "html", [bool])
+    # Remove redundant constructs from the generated markup
+    app.add_config_value("typst_optimize_output", False, "html", [bool])
+    # Convert LaTeX math to native Typst ahead of time (mitex as fallback)
+    app.add_config_value("typst_math_precompile", False, "html", [bool])
+    # Emit file-backed csv-tables as csv() calls instead of inline cells
+    app.add_config_value("typst_native_csv_tables", False, "html", [bool])
+    # Split tables with more body rows than this into chunks
+    app.add_config_value("typst_table_chunk_rows", None, "html", [int, type(None)])
+    # Split documents with more source lines into per-section part files
+    app.add_config_value("typst_split_lines", None, "html", [int, type(None)])
+    # Translate documents in a thread pool while writing
+    app.add_config_value("typst_write_workers", None, "html", [int, type(None)])
+
+    # Record the data files of csv-tables for native output
+    app.add_directive("csv-table", TypstCSVTable, override=True)
 
     return {
         "version": __version__,
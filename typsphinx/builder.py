@@ -5,18 +5,32 @@ This module implements the TypstBuilder class, which is responsible for
 building Typst output from Sphinx documentation.
 """
 
+import os
 import shutil
+from collections import deque
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from os import path
-from typing import Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
 from docutils import nodes
 from sphinx.builders import Builder
 from sphinx.util import logging
 from sphinx.util.osutil import ensuredir
 
-from typsphinx.pdf import compile_typst_to_pdf
-from typsphinx.writer import TypstWriter
+from typsphinx.pdf import compile_typst_document, compile_typst_to_pdf
+from typsphinx.plan import BuildPlan
+
+# The writer (and with it the translator and template engine) is imported
+# when writing starts, so loading the extension for non-Typst builds stays
+# cheap.
+if TYPE_CHECKING:
+    from typsphinx.images import ImagePipeline
+    from typsphinx.latex_math import MathCache
+    from typsphinx.references import ReferenceIndex
+    from typsphinx.translator import DocumentSummary
+    from typsphinx.workers import CompileWorkerPool
+    from typsphinx.writer import Translation
 
 logger = logging.getLogger(__name__)
 
@@ -42,20 +56,131 @@ class TypstBuilder(Builder):
         """
         # Initialize images dictionary to track images used in documents
         # Key: image URI relative to source directory
-        # Value: destination path (empty string for now, compatible with parent class)
+        # Value: processed output path when the image pipeline is enabled,
+        # otherwise empty string (compatible with parent class)
         self.images: dict[str, str] = {}
+        self.image_pipeline: Optional[ImagePipeline] = None
+        # Data files read by the generated markup (CSV files of native
+        # csv-tables), relative to the source directory
+        self.data_files: Set[str] = set()
+        self.math_cache: Optional[MathCache] = None
+        self.reference_index: Optional[ReferenceIndex] = None
+
+        # Per-document summaries collected by the translator
+        self.document_summaries: Dict[str, DocumentSummary] = {}
+        # Part files of documents split at section boundaries
+        self.document_parts: Dict[str, List[str]] = {}
+
+        # Warn about typst_build_masters entries that cannot be built
+        masters = self.get_masters()
+        for docname in self.get_selected_masters() or ():
+            if docname not in masters:
+                logger.warning(
+                    f"typst_build_masters: {docname!r} is not a master document "
+                    f"defined in typst_documents"
+                )
 
     def get_outdated_docs(self) -> Iterator[str]:
         """
         Return an iterator of document names that need to be rebuilt.
 
-        For now, we rebuild all documents on every build.
+        For now, we rebuild all documents on every build. When
+        typst_build_masters is set, only documents included by the selected
+        master documents are rebuilt.
 
         Returns:
             Iterator of document names that are outdated
         """
+        closure = self.get_build_closure()
         for docname in self.env.found_docs:
-            yield docname
+            if closure is None or docname in closure:
+                yield docname
+
+    def get_masters(self) -> List[str]:
+        """
+        Get the names of all master documents defined in typst_documents.
+
+        Returns:
+            List of master document names
+        """
+        typst_documents = getattr(self.config, "typst_documents", None) or []
+        return [doc_tuple[0] for doc_tuple in typst_documents]
+
+    def get_selected_masters(self) -> Optional[List[str]]:
+        """
+        Get the master documents selected with typst_build_masters.
+
+        The selection can be given as a list or, for use with
+        ``sphinx-build -D``, as a comma-separated string.
+
+        Returns:
+            Selected master document names, or None if all documents are built
+        """
+        selection = getattr(self.config, "typst_build_masters", None)
+        if not selection:
+            return None
+        if isinstance(selection, str):
+            selection = selection.split(",")
+        return [name.strip() for name in selection if name.strip()]
+
+    def get_build_closure(self) -> Optional[Set[str]]:
+        """
+        Get the documents needed to build the selected master documents.
+
+        Returns:
+            Set of document names included by the selected masters, or None
+            if typst_build_masters is not set (all documents are built)
+        """
+        selected = self.get_selected_masters()
+        if selected is None:
+            return None
+
+        masters = self.get_masters()
+        closure: Set[str] = set()
+        for master in selected:
+            if master in masters:
+                closure |= self.get_master_closure(master)
+        return closure & set(self.env.found_docs)
+
+    def get_master_closure(self, master: str) -> Set[str]:
+        """
+        Get a master document and all documents it includes.
+
+        Follows toctree entries recursively, since every toctree entry is
+        rendered as an include() in the generated Typst markup.
+
+        Args:
+            master: Name of the master document
+
+        Returns:
+            Set of document names included (directly or indirectly) by master
+        """
+        closure = set()
+        pending = [master]
+        while pending:
+            docname = pending.pop()
+            if docname in closure:
+                continue
+            closure.add(docname)
+            pending.extend(self.env.toctree_includes.get(docname, ()))
+        return closure
+
+    @property
+    def typ_outdir(self) -> str:
+        """
+        Directory receiving the Typst source tree (.typ files, template,
+        images and assets); the same as outdir unless a subclass splits them.
+        """
+        return self.get_typ_outdir()
+
+    def get_typ_outdir(self) -> str:
+        """
+        Get the directory receiving the generated Typst source tree.
+
+        Returns:
+            Output directory of the .typ files
+        """
+        return self.outdir
 
     def get_target_uri(self, docname: str, typ: Optional[str] = None) -> str:
         """
@@ -80,12 +205,43 @@ class TypstBuilder(Builder):
         Args:
             docnames: Set of document names to be written
         """
+        from typsphinx.writer import TypstWriter
+
         # Create the writer instance
         self.writer = TypstWriter(self)
 
+        # Precompute per-document routing decisions once for all documents
+        self.build_plan = BuildPlan(
+            self.typ_outdir, docnames, self.get_masters(), suffix=".typ"
+        )
+        self.build_plan.create_directories()
+
+        # Set up the optional image preprocessing pipeline
+        self.image_pipeline = self._create_image_pipeline()
+        self._copied_images: Set[str] = set()
+
+        # Load the labels, references and includes recorded by earlier builds
+        from typsphinx.references import ReferenceIndex
+
+        self.reference_index = ReferenceIndex(
+            path.join(self.doctreedir, "typst-references.json")
+        )
+
+        # Load the persistent cache of precompiled LaTeX math
+        if getattr(self.config, "typst_math_precompile", False):
+            from typsphinx.latex_math import MathCache
+
+            self.math_cache = MathCache(
+                path.join(self.doctreedir, "typst-math-cache.json")
+            )
+
         # Write template file for master documents to import
         self._write_template_file()
 
+        # Write the precomputed back-of-book index of each master document
+        if getattr(self.config, "typst_use_index", False):
+            self._write_index_files()
+
     def write(
         self,
         build_docnames: Optional[Set[str]],
@@ -116,26 +272,119 @@ class TypstBuilder(Builder):
             # build all
             docnames = set(build_docnames)
 
+        # Restrict writing to the include closure of typst_build_masters
+        closure = self.get_build_closure()
+        if closure is not None:
+            docnames &= closure
+
         logger.info("preparing documents... ", nonl=True)
         self.prepare_writing(docnames)
         logger.info("done")
 
         # Write individual documents
-        warnings_count = 0
-        for docname in sorted(docnames):
-            # Use env.get_doctree() instead of env.get_and_resolve_doctree()
-            # to preserve toctree nodes (Requirement 13.2)
-            doctree = self.env.get_doctree(docname)
-            self.env.apply_post_transforms(doctree, docname)
-
-            # Log progress
-            logger.info(f"writing output... [{docname}]", nonl=True)
+        workers = getattr(self.config, "typst_write_workers", None)
+        if workers and workers > 1:
+            self._write_documents_threaded(sorted(docnames), workers)
+        else:
+            for docname in sorted(docnames):
+                doctree = self._get_write_doctree(docname)
+
+                # Log progress
+                logger.info(f"writing output... [{docname}]", nonl=True)
+
+                # Write the document
+                self.write_doc(docname, doctree)
+
+                logger.info(" done")
+
+        # Persist the label and include index for validation and later builds
+        reference_index = getattr(self, "reference_index", None)
+        if reference_index is not None:
+            reference_index.prune(self.env.found_docs)
+            reference_index.save()
+
+        # Persist newly converted math for the next build
+        math_cache = getattr(self, "math_cache", None)
+        if math_cache is not None:
+            logger.debug(
+                f"Math cache: {math_cache.hits} hits, {math_cache.misses} conversions"
+            )
+            math_cache.save()
+
+    def _get_write_doctree(self, docname: str) -> nodes.document:
+        """
+        Load the doctree of a document for writing.
+
+        Uses env.get_doctree() instead of env.get_and_resolve_doctree()
+        to preserve toctree nodes (Requirement 13.2).
 
-            # Write the document
-            self.write_doc(docname, doctree)
+        Args:
+            docname: Name of the document
+
+        Returns:
+            Document tree with post-transforms applied
+        """
+        doctree = self.env.get_doctree(docname)
+        self.env.apply_post_transforms(doctree, docname)
+        return doctree
+
+    def _write_documents_threaded(self, docnames: List[str], workers: int) -> None:
+        """
+        Translate documents in a thread pool (typst_write_workers).
+
+        Doctrees are loaded and post-transformed on the main thread, since
+        the environment is not thread-safe, and translated by the workers
+        with TypstWriter.translate_document(), which does not modify the
+        writer or the builder. Results are written on the main thread in
+        document order, so the output is the same as with sequential
+        writing. At most two documents per worker are loaded ahead.
+
+        Args:
+            docnames: Names of the documents to write, in order
+            workers: Number of worker threads
+        """
 
+        def write_next() -> None:
+            docname, future = pending.popleft()
+            logger.info(f"writing output... [{docname}]", nonl=True)
+            self.write_translation(docname, future.result())
             logger.info(" done")
 
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for docname in docnames:
+                doctree = self._get_write_doctree(docname)
+                future = executor.submit(
+                    self.writer.translate_document, doctree, docname
+                )
+                pending.append((docname, future))
+                if len(pending) >= workers * 2:
+                    write_next()
+            while pending:
+                write_next()
+
+    def resolve_image(self, imguri: str) -> str:
+        """
+        Get the output path of an image without tracking it.
+
+        Called by the translator for every image it emits; the builder
+        tracks the images of the document summary when the document is
+        written (see write_translation).
+
+        Args:
+            imguri: Image URI relative to the source directory
+
+        Returns:
+            Processed output path (relative to outdir) when the image pipeline
+            is enabled, otherwise an empty string
+        """
+        if imguri in self.images:
+            return self.images[imguri]
+        image_pipeline = getattr(self, "image_pipeline", None)
+        if image_pipeline is None:
+            return ""
+        return image_pipeline.get_output_path(imguri) or ""
+
     def post_process_images(self, doctree: nodes.document) -> None:
         """
         Post-process images in the document tree.
@@ -154,10 +403,66 @@ class TypstBuilder(Builder):
             if not imguri:
                 continue
 
-            # Track this image
-            # Store empty string as value to be compatible with parent class type
-            if imguri not in self.images:
-                self.images[imguri] = ""
+            self.track_image(imguri)
+
+    def track_image(self, imguri: str) -> str:
+        """
+        Track an image for copying to the output directory.
+
+        Called for every image in the summary of a written document.
+
+        Args:
+            imguri: Image URI relative to the source directory
+
+        Returns:
+            Processed output path (relative to outdir) when the image pipeline
+            is enabled, otherwise an empty string
+        """
+        # With the image pipeline enabled, the value is the processed
+        # output path used by the translator;
+        # otherwise store empty string to be compatible with parent class type
+        if imguri not in self.images:
+            image_pipeline = getattr(self, "image_pipeline", None)
+            output = image_pipeline.register(imguri) if image_pipeline else None
+            self.images[imguri] = output or ""
+        return self.images[imguri]
+
+    def track_data_file(self, filename: str) -> None:
+        """
+        Track a data file for copying to the output directory.
+
+        Called for every data file the generated markup of a written
+        document reads (e.g. the CSV file of a native csv-table).
+
+        Args:
+            filename: File name relative to the source directory
+        """
+        data_files = getattr(self, "data_files", None)
+        if data_files is None:
+            data_files = self.data_files = set()
+        data_files.add(filename)
+
+    def _create_image_pipeline(self) -> Optional["ImagePipeline"]:
+        """
+        Create the image preprocessing pipeline if it is enabled.
+
+        Returns:
+            ImagePipeline instance, or None if typst_image_pipeline is not set
+        """
+        options = getattr(self.config, "typst_image_pipeline", None)
+        if options is None:
+            return None
+
+        from typsphinx.images import ImagePipeline, check_pillow_available
+
+        if not check_pillow_available():
+            logger.warning(
+                "typst_image_pipeline is enabled but Pillow is not installed; "
+                "images are deduplicated but not resized. "
+                "Install it with: pip install typsphinx[images]"
+            )
+
+        return ImagePipeline(self.srcdir, self.typ_outdir, options)
 
     def write_doc(self, docname: str, doctree: nodes.document) -> None:
         """
@@ -174,29 +479,90 @@ class TypstBuilder(Builder):
             docname: Name of the document
             doctree: Document tree to be written
         """
-        # Get the output file path
-        destination = path.join(self.outdir, docname + self.out_suffix)
-
-        # Ensure the directory for this specific file exists
-        # This handles nested paths like "chapter1/section"
-        dest_dir = path.dirname(destination)
-        ensuredir(dest_dir)
+        # Get the output file path from the build plan
+        # Directories (including nested paths like "chapter1/section") are
+        # created once in prepare_writing
+        destination = self.build_plan.get_output_path(docname)
 
         # Set current docname for template application logic
         self.current_docname = docname
 
-        # Post-process images to track them for copying
-        self.post_process_images(doctree)
+        # Translate the document to Typst markup
+        translation = self.writer.translate_document(doctree, docname)
+        self.write_translation(docname, translation, destination)
 
-        # Set the document on the writer
-        self.writer.document = doctree
+    def write_translation(
+        self,
+        docname: str,
+        translation: "Translation",
+        destination: Optional[str] = None,
+    ) -> None:
+        """
+        Write a translated document and record what it collected.
 
-        # Translate the document to Typst markup
-        self.writer.translate()
+        The images and data files of the document are tracked for copying,
+        and its summary is kept for the reference index and the reports
+        at the end of the build.
+
+        Args:
+            docname: Name of the document
+            translation: Result of TypstWriter.translate_document()
+            destination: Output file path (default: from the build plan)
+        """
+        if destination is None:
+            destination = self.build_plan.get_output_path(docname)
+
+        summary = translation.summary
+        self.document_summaries[docname] = summary
+        if self.reference_index is not None:
+            self.reference_index.update(docname, summary)
+        for imguri in summary.images:
+            self.track_image(imguri)
+        for filename in summary.data_files:
+            self.track_data_file(filename)
 
         # Save the output to the file
         with open(destination, "w", encoding="utf-8") as f:
-            f.write(self.writer.output)
+            f.write(translation.output)
+
+        self._write_parts(docname, translation.parts)
+
+    def _write_parts(self, docname: str, parts: List[Tuple[str, str]]) -> None:
+        """
+        Write the part files of a split document (typst_split_lines).
+
+        Parts are only rewritten when their content changed, so unchanged
+        sections keep their files. Parts left over from an earlier build
+        with more parts are removed.
+
+        Args:
+            docname: Name of the document
+            parts: (name, markup) of each part, as produced by the writer
+        """
+        from typsphinx.writer import get_part_name
+
+        written = 0
+        for name, content in parts:
+            part_file = path.join(self.typ_outdir, name + ".typ")
+            if _write_if_changed(part_file, content.encode("utf-8")):
+                written += 1
+        if parts:
+            logger.debug(
+                f"{docname}: split into {len(parts)} parts ({written} changed)"
+            )
+
+        number = len(parts) + 1
+        while True:
+            stale = path.join(self.typ_outdir, get_part_name(docname, number) + ".typ")
+            if not path.exists(stale):
+                break
+            os.remove(stale)
+            number += 1
+
+        document_parts = getattr(self, "document_parts", None)
+        if document_parts is None:
+            document_parts = self.document_parts = {}
+        document_parts[docname] = [name for name, _ in parts]
 
     def _write_template_file(self) -> None:
         """
@@ -238,31 +604,103 @@ class TypstBuilder(Builder):
         template_content = template_engine.get_template_content()
 
         # Write template file
-        template_file_path = path.join(self.outdir, "_template.typ")
+        ensuredir(self.typ_outdir)
+        template_file_path = path.join(self.typ_outdir, "_template.typ")
         with open(template_file_path, "w", encoding="utf-8") as f:
             f.write(template_content)
 
         logger.info(f"Template written to {template_file_path}")
 
+    def _write_index_files(self) -> None:
+        """
+        Write the back-of-book index of each master document.
+
+        The index entries of a master document and the documents it includes
+        are sorted and grouped in Python (see typsphinx.index_entries) and
+        written to a file the master document imports, so the index is
+        rendered without querying index markers during layout. Files are
+        only rewritten when the index changed.
+        """
+        from sphinx.locale import _
+
+        from typsphinx.index_entries import (
+            collect_index,
+            get_index_file,
+            render_index,
+        )
+
+        entries = self.env.get_domain("index").entries
+        for master in self.get_masters():
+            groups = collect_index(entries, self.get_reading_order(master))
+            content = render_index(groups, _("Index"))
+            index_file = path.join(self.typ_outdir, get_index_file(master))
+            if _write_if_changed(index_file, content.encode("utf-8")):
+                logger.debug(f"Index written to {index_file}")
+
+    def get_reading_order(self, master: str) -> List[str]:
+        """
+        Get a master document and the documents it includes in reading order.
+
+        Args:
+            master: Name of the master document
+
+        Returns:
+            Document names in the order their content appears in the output
+        """
+        order: List[str] = []
+        seen: Set[str] = set()
+
+        def visit(docname: str) -> None:
+            if docname in seen:
+                return
+            seen.add(docname)
+            order.append(docname)
+            for child in self.env.toctree_includes.get(docname, ()):
+                visit(child)
+
+        visit(master)
+        return order
+
     def copy_image_files(self) -> None:
         """
         Copy image files to the output directory.
 
         Iterates through all tracked images and copies them from the
         source directory to the output directory, preserving relative paths.
+        Images already copied in this build are skipped, so this can be
+        called again as more documents are written.
         """
-        if not self.images:
+        copied = getattr(self, "_copied_images", None)
+        if copied is None:
+            copied = self._copied_images = set()
+        pending = [imguri for imguri in self.images if imguri not in copied]
+        if not pending:
+            return
+        copied.update(pending)
+
+        image_pipeline = getattr(self, "image_pipeline", None)
+        if image_pipeline is not None:
+            for imguri in pending:
+                if not self.images[imguri]:
+                    logger.warning(
+                        f"Image file not found: {path.join(self.srcdir, imguri)}"
+                    )
+            processed, cached = image_pipeline.process()
+            logger.info(
+                f"Processed {processed} image file(s) "
+                f"({cached} unchanged, {len(self.images)} reference(s))"
+            )
             return
 
-        logger.info(f"Copying {len(self.images)} image file(s)...")
+        logger.info(f"Copying {len(pending)} image file(s)...")
 
-        for imguri in self.images:
+        for imguri in pending:
             # Resolve source path
             # Image URIs are relative to source directory
             src = path.join(self.srcdir, imguri)
 
             # Resolve destination path
-            dest = path.join(self.outdir, imguri)
+            dest = path.join(self.typ_outdir, imguri)
 
             # Check if source file exists
             if not path.exists(src):
@@ -280,6 +718,30 @@ class TypstBuilder(Builder):
             except Exception as e:
                 logger.warning(f"Failed to copy image {imguri}: {e}")
 
+    def copy_data_files(self) -> None:
+        """
+        Copy tracked data files to the output directory.
+
+        Files are copied to the same path relative to the output directory
+        as relative to the source directory. Copies that are up to date are
+        skipped, so this can be called again as more documents are written.
+        """
+        for filename in sorted(getattr(self, "data_files", ())):
+            src = path.join(self.srcdir, filename)
+            dest = path.join(self.typ_outdir, filename)
+            if not path.exists(src):
+                logger.warning(f"Data file not found: {src}")
+                continue
+            if path.exists(dest) and os.stat(dest).st_mtime >= os.stat(src).st_mtime:
+                continue
+
+            ensuredir(path.dirname(dest))
+            try:
+                shutil.copy2(src, dest)
+                logger.debug(f"Copied data file: {filename}")
+            except Exception as e:
+                logger.warning(f"Failed to copy data file {filename}: {e}")
+
     def copy_template_assets(self) -> None:
         """
         Copy template-associated assets to the output directory.
@@ -344,7 +806,7 @@ class TypstBuilder(Builder):
 
         # Resolve absolute paths
         src_dir = path.join(self.srcdir, template_dir)
-        dest_dir = path.join(self.outdir, template_dir)
+        dest_dir = path.join(self.typ_outdir, template_dir)
 
         # Check if template directory exists
         if not path.exists(src_dir):
@@ -436,7 +898,7 @@ class TypstBuilder(Builder):
 
         # Calculate relative path from source directory
         rel_path = path.relpath(src_path, self.srcdir)
-        dest_path = path.join(self.outdir, rel_path)
+        dest_path = path.join(self.typ_outdir, rel_path)
 
         try:
             if path.isdir(src_path):
@@ -462,7 +924,78 @@ class TypstBuilder(Builder):
         Copies image files and template assets to the output directory.
         """
         self.copy_image_files()
+        self.copy_data_files()
         self.copy_template_assets()
+        self.report_unknown_nodes()
+        self.report_optimizer_savings()
+
+    def report_optimizer_savings(self) -> None:
+        """
+        Report the bytes removed by the markup optimizer (typst_optimize_output).
+
+        Savings are logged per document at debug level (``-v``) and as a
+        total for the build.
+        """
+        summaries = getattr(self, "document_summaries", {})
+        before = after = documents = 0
+        for docname in sorted(summaries):
+            sizes = summaries[docname].optimizer_bytes
+            if sizes is None:
+                continue
+            logger.debug(
+                f"Optimizer: {docname}: {sizes[0]} -> {sizes[1]} bytes "
+                f"({sizes[0] - sizes[1]} saved)"
+            )
+            before += sizes[0]
+            after += sizes[1]
+            documents += 1
+
+        if documents:
+            percent = 100 * (before - after) / before if before else 0
+            logger.info(
+                f"Typst optimizer saved {before - after} bytes ({percent:.1f}%) "
+                f"in {documents} document(s)"
+            )
+
+    def report_unknown_nodes(self) -> None:
+        """
+        Report the nodes skipped by the translator in a single warning.
+
+        Aggregates the unknown node counts of all written documents, so
+        extensions adding many custom nodes produce one summary with counts
+        and sample locations instead of a warning per node.
+        """
+        counts: Dict[str, int] = {}
+        documents: Dict[str, int] = {}
+        samples: Dict[str, List[str]] = {}
+        summaries = getattr(self, "document_summaries", {})
+        for docname in sorted(summaries):
+            summary = summaries[docname]
+            for node_type, count in summary.unknown_nodes.items():
+                counts[node_type] = counts.get(node_type, 0) + count
+                documents[node_type] = documents.get(node_type, 0) + 1
+                locations = samples.setdefault(node_type, [])
+                for line in summary.unknown_node_lines.get(node_type) or [None]:
+                    if len(locations) < summary.MAX_UNKNOWN_NODE_SAMPLES:
+                        locations.append(
+                            f"{docname}:{line}" if line is not None else docname
+                        )
+
+        if not counts:
+            return
+
+        lines = [
+            f"  {node_type}: {counts[node_type]} node(s) in "
+            f"{documents[node_type]} document(s), e.g. "
+            f"{', '.join(samples[node_type])}"
+            for node_type in sorted(counts, key=lambda name: (-counts[name], name))
+        ]
+        logger.warning(
+            f"{sum(counts.values())} node(s) of {len(counts)} unknown type(s) "
+            f"were skipped in Typst output:\n" + "\n".join(lines),
+            type="typst",
+            subtype="unknown_node",
+        )
 
 
 class TypstPDFBuilder(TypstBuilder):
@@ -480,36 +1013,113 @@ class TypstPDFBuilder(TypstBuilder):
     format = "pdf"
     out_suffix = ".pdf"
 
-    def write_doc(self, docname: str, doctree: nodes.document) -> None:
+    def get_typ_outdir(self) -> str:
         """
-        Write a document as both .typ and .pdf.
+        Get the directory receiving the generated Typst source tree.
 
-        Override to generate .typ file (not .pdf) during the write phase.
-        The .pdf will be generated in finish() by compiling the .typ file.
+        With typst_pdf_typ_dir set, the .typ tree (with its template, images
+        and assets) is published there and only the compiled output goes to
+        the output directory, so a single build replaces separate typst and
+        typstpdf builds. Relative paths are resolved from the output
+        directory, so generated files never end up in the source tree.
 
-        Args:
-            docname: Name of the document
-            doctree: Document tree to be written
+        Returns:
+            Output directory of the .typ files
         """
-        # Generate .typ file (not .pdf)
-        typ_destination = path.join(self.outdir, docname + ".typ")
+        typ_dir = getattr(self.config, "typst_pdf_typ_dir", None)
+        if not typ_dir:
+            return self.outdir
+        return path.normpath(path.join(self.outdir, typ_dir))
 
-        # Ensure the directory exists
-        dest_dir = path.dirname(typ_destination)
-        ensuredir(dest_dir)
+    # Compile masters in the background while writing (typst_compile_pipeline);
+    # watch mode compiles with its own long-lived compilers instead
+    pipeline_compiles = True
 
-        # Set current docname for template application logic
-        self.current_docname = docname
+    def get_compile_masters(self) -> List[str]:
+        """
+        Get the master documents to compile, in typst_documents order.
 
-        # Set the document on the writer
-        self.writer.document = doctree
+        Returns:
+            Master document names, restricted to typst_build_masters if set
+        """
+        # Get master documents from typst_documents config
+        typst_documents = getattr(self.config, "typst_documents", [])
 
-        # Translate the document to Typst markup
-        self.writer.translate()
+        # Compile only the masters selected with typst_build_masters
+        selected = self.get_selected_masters()
+        return [
+            doc_tuple[0]
+            for doc_tuple in typst_documents
+            if selected is None or doc_tuple[0] in selected
+        ]
+
+    def prepare_writing(self, docnames: Set[str]) -> None:
+        """
+        Prepare for writing the documents.
+
+        With typst_compile_pipeline enabled, also sets up the scheduler that
+        compiles each master as soon as its documents are written.
+
+        Args:
+            docnames: Set of document names to be written
+        """
+        super().prepare_writing(docnames)
+
+        self.compile_scheduler = None
+        self._compile_options = None
+        # Chapter previews are compiled after writing, not per master
+        if (
+            self.pipeline_compiles
+            and getattr(self.config, "typst_compile_pipeline", False)
+            and not getattr(self.config, "typst_pdf_chapters", False)
+        ):
+            from typsphinx.scheduler import CompileScheduler
+
+            closures = {
+                master: self.get_master_closure(master) & set(docnames)
+                for master in self.get_compile_masters()
+            }
+            self.compile_scheduler = CompileScheduler(
+                closures,
+                self._compile_master_file,
+                max_workers=getattr(self.config, "typst_compile_workers", None),
+            )
+
+    def write_translation(
+        self,
+        docname: str,
+        translation: "Translation",
+        destination: Optional[str] = None,
+    ) -> None:
+        """
+        Write a document, then start compiling masters that became ready.
 
-        # Save the .typ file
-        with open(typ_destination, "w", encoding="utf-8") as f:
-            f.write(self.writer.output)
+        Args:
+            docname: Name of the document
+            translation: Result of TypstWriter.translate_document()
+            destination: Output file path (default: from the build plan)
+        """
+        super().write_translation(docname, translation, destination)
+
+        scheduler = getattr(self, "compile_scheduler", None)
+        if scheduler is None:
+            return
+
+        for master in scheduler.document_written(docname):
+            if self.validate_references([master]):
+                scheduler.skip(master)
+                continue
+            # Images and template assets must be in place before compiling
+            self.copy_image_files()
+            self.copy_data_files()
+            if not scheduler.futures:
+                self.copy_template_assets()
+            # Compile options (and the package prefetch) are computed here,
+            # so concurrent compiles do not prefetch the same packages
+            if self._compile_options is None:
+                self._compile_options = self.get_compile_options()
+            logger.info(f"Compiling {master} in the background...")
+            scheduler.submit(master)
 
     def finish(self) -> None:
         """
@@ -519,7 +1129,8 @@ class TypstPDFBuilder(TypstBuilder):
         this method compiles them to PDF using typst-py.
 
         Only master documents (defined in typst_documents) are compiled to PDF.
-        Included documents are not compiled individually.
+        Included documents are not compiled individually. Masters already
+        compiled in the background while writing are only waited for.
 
         Requirement 9.2: Execute Typst compilation within Python
         Requirement 9.4: Generate PDF from Typst markup
@@ -528,40 +1139,536 @@ class TypstPDFBuilder(TypstBuilder):
         # This ensures images are available before PDF compilation
         super().finish()
 
-        # Get master documents from typst_documents config
-        typst_documents = getattr(self.config, "typst_documents", [])
-
-        if not typst_documents:
+        try:
+            self._compile_masters()
+        finally:
+            self.close_compile_pool()
+
+    def _compile_masters(self) -> None:
+        """Compile the master documents not yet compiled while writing."""
+        masters = self.get_compile_masters()
+        if not masters:
             logger.warning(
                 "No documents defined in typst_documents. Nothing to compile."
             )
             return
 
-        logger.info(f"Compiling {len(typst_documents)} master document(s) to PDF...")
+        # Wait for the masters compiled while writing
+        scheduler = getattr(self, "compile_scheduler", None)
+        if scheduler is not None:
+            handled = scheduler.wait()
+            self.compile_scheduler = None
+            masters = [master for master in masters if master not in handled]
+            if not masters:
+                return
+
+        # Fail fast on broken labels and includes instead of in the compiler
+        invalid = self.validate_references(masters)
+        masters = [master for master in masters if master not in invalid]
+        if not masters:
+            return
 
-        for doc_tuple in typst_documents:
-            # doc_tuple format: (sourcename, targetname, title, author)
-            docname = doc_tuple[0]
-            typ_file = path.join(self.outdir, docname + ".typ")
+        if getattr(self.config, "typst_pdf_chapters", False):
+            self.compile_chapters(masters)
+            return
 
-            if not path.exists(typ_file):
-                logger.warning(f"Master document not found: {typ_file}")
-                continue
+        logger.info(
+            f"Compiling {len(masters)} master document(s) "
+            f"to {self.format.upper()}..."
+        )
+
+        for docname in masters:
+            self._compile_master_file(docname)
+
+    def get_chapters(self, master: str) -> List[str]:
+        """
+        Get the chapters of a master document to compile as previews.
+
+        Chapters are the top-level toctree entries of the master document.
+        typst_pdf_chapters can be True for all chapters or a list (or, for
+        use with ``sphinx-build -D``, a comma-separated string) of chapter
+        document names.
+
+        Args:
+            master: Name of the master document
+
+        Returns:
+            Chapter document names in toctree order
+        """
+        chapters = list(dict.fromkeys(self.env.toctree_includes.get(master, ())))
+        selection = getattr(self.config, "typst_pdf_chapters", False)
+        if isinstance(selection, str):
+            selection = [name.strip() for name in selection.split(",")]
+        if isinstance(selection, (list, tuple)):
+            chapters = [chapter for chapter in chapters if chapter in selection]
+        return chapters
+
+    def get_document_parts(self, docname: str) -> List[str]:
+        """
+        Get the part files a document was split into (typst_split_lines).
+
+        Args:
+            docname: Name of the document
+
+        Returns:
+            Part names without .typ suffix, relative to the output directory
+        """
+        from typsphinx.writer import get_part_name
+
+        document_parts = getattr(self, "document_parts", {})
+        if docname in document_parts:
+            return document_parts[docname]
+        # Documents not written in this build: look for part files on disk
+        parts = []
+        while path.exists(
+            path.join(self.typ_outdir, get_part_name(docname, len(parts) + 1) + ".typ")
+        ):
+            parts.append(get_part_name(docname, len(parts) + 1))
+        return parts
+
+    def get_chapter_pdf_path(self, master: str, chapter: str) -> str:
+        """
+        Get the output path of a chapter preview PDF.
+
+        Args:
+            master: Name of the master document
+            chapter: Name of the chapter document
+
+        Returns:
+            Path of ``<outdir>/<master>-chapters/<chapter>.pdf``
+        """
+        return path.join(self.outdir, master + "-chapters", chapter + ".pdf")
 
+    def compile_chapters(self, masters: List[str]) -> None:
+        """
+        Compile each chapter of the master documents as a standalone PDF.
+
+        Every chapter is wrapped with the template and imports of its master
+        document and compiled in parallel. Chapters whose .typ files,
+        images, template and compile options did not change since the last
+        build are not compiled again.
+
+        Args:
+            masters: Names of the master documents
+        """
+        from typsphinx.chapters import ChapterCache, make_chapter_document
+
+        if getattr(self, "_compile_options", None) is None:
+            self._compile_options = self.get_compile_options()
+        options = self._compile_options
+        cache = ChapterCache(path.join(self.doctreedir, "typst-chapter-cache.json"))
+        template_file = path.join(self.typ_outdir, "_template.typ")
+
+        jobs = []
+        current = 0
+        for master in masters:
+            master_file = path.join(self.typ_outdir, master + ".typ")
             try:
-                # Read Typst content
-                with open(typ_file, encoding="utf-8") as f:
-                    typst_content = f.read()
+                with open(master_file, encoding="utf-8") as f:
+                    master_content = f.read()
+            except OSError:
+                logger.warning(f"Master document not found: {master_file}")
+                continue
 
-                # Compile to PDF
-                pdf_bytes = compile_typst_to_pdf(typst_content, root_dir=self.outdir)
+            for chapter in self.get_chapters(master):
+                document = make_chapter_document(master_content, chapter)
+                if document is None:
+                    logger.warning(f"Cannot split {master_file} into chapters")
+                    break
+
+                closure = self.get_master_closure(chapter)
+                typ_files = [template_file] + [
+                    path.join(self.typ_outdir, name + ".typ")
+                    for docname in closure
+                    for name in [docname] + self.get_document_parts(docname)
+                ]
+                images = [
+                    path.join(self.srcdir, imguri)
+                    for imguri, (docnames, _) in self.env.images.items()
+                    if docnames & closure
+                ]
+                # Files read by the chapter's markup, e.g. native CSV tables
+                images += [
+                    path.join(self.srcdir, dependency)
+                    for docname in closure
+                    for dependency in self.env.dependencies.get(docname, ())
+                ]
+                key = cache.make_key(document, typ_files, images, options)
+                pdf_file = self.get_chapter_pdf_path(master, chapter)
+                if cache.is_current(pdf_file, key):
+                    current += 1
+                    continue
+                jobs.append((chapter, pdf_file, document, key))
 
-                # Write PDF file
-                pdf_file = path.join(self.outdir, docname + ".pdf")
-                with open(pdf_file, "wb") as f:
-                    f.write(pdf_bytes)
+        logger.info(f"Compiling {len(jobs)} chapter(s) to PDF ({current} unchanged)...")
+        if not jobs:
+            return
 
-                logger.info(f"Generated PDF: {pdf_file}")
+        pool = self.get_compile_pool()
+        compile_function = (
+            pool.compile_typst_to_pdf if pool is not None else compile_typst_to_pdf
+        )
 
+        def compile_chapter(job) -> None:
+            chapter, pdf_file, document, key = job
+            try:
+                pdf_bytes = compile_function(
+                    document, root_dir=self.typ_outdir, **options
+                )
             except Exception as e:
-                logger.error(f"Failed to compile {typ_file}: {e}")
+                logger.error(f"Failed to compile chapter {chapter}: {e}")
+                return
+            ensuredir(path.dirname(pdf_file))
+            with open(pdf_file, "wb") as f:
+                f.write(pdf_bytes)
+            cache.record(pdf_file, key)
+            logger.info(f"Generated PDF: {pdf_file}")
+
+        workers = getattr(self.config, "typst_compile_workers", None)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(compile_chapter, jobs))
+        cache.save()
+
+    def _compile_master_file(self, docname: str) -> None:
+        """
+        Compile the written .typ file of a master document.
+
+        Errors are logged, so one failing master does not stop the others.
+
+        Args:
+            docname: Name of the master document
+        """
+        typ_file = path.join(self.typ_outdir, docname + ".typ")
+
+        if not path.exists(typ_file):
+            logger.warning(f"Master document not found: {typ_file}")
+            return
+
+        # Compile options (and the package prefetch) are computed once per
+        # build; background compiles get them from write_translation()
+        if getattr(self, "_compile_options", None) is None:
+            self._compile_options = self.get_compile_options()
+
+        try:
+            # Read Typst content
+            with open(typ_file, encoding="utf-8") as f:
+                typst_content = f.read()
+
+            self._compile_master(
+                docname,
+                typst_content,
+                root_dir=self.typ_outdir,
+                **self._compile_options,
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to compile {typ_file}: {e}")
+
+    def get_compile_pool(self) -> Optional["CompileWorkerPool"]:
+        """
+        Get the pool of compile worker processes, starting it on first use.
+
+        Returns:
+            CompileWorkerPool configured by typst_compile_processes, or None
+            to compile in the Sphinx process
+        """
+        options = getattr(self.config, "typst_compile_processes", None)
+        if options is None:
+            return None
+        if getattr(self, "_compile_pool", None) is None:
+            from typsphinx.workers import CompileWorkerPool
+
+            self._compile_pool = CompileWorkerPool(options)
+        return self._compile_pool
+
+    def close_compile_pool(self) -> None:
+        """Stop the compile worker processes, if any were started."""
+        pool = getattr(self, "_compile_pool", None)
+        if pool is not None:
+            pool.close()
+            self._compile_pool = None
+
+    def validate_references(self, masters: List[str]) -> Set[str]:
+        """
+        Validate the labels and includes of master documents before compiling.
+
+        Every link(<label>) in a master document or the documents it
+        includes must point to a label defined in one of them, and every
+        included .typ file must exist. All problems of all masters are
+        reported in a single error, and masters with problems are not
+        compiled, since the Typst compiler would reject them.
+
+        Args:
+            masters: Names of the master documents about to be compiled
+
+        Returns:
+            Names of the master documents with problems
+        """
+        reference_index = getattr(self, "reference_index", None)
+        if reference_index is None or not getattr(
+            self.config, "typst_validate_references", True
+        ):
+            return set()
+
+        problems: Dict[str, List[str]] = {}
+        for master in masters:
+            master_problems = reference_index.validate(
+                self.get_master_closure(master), self.typ_outdir
+            )
+            if master_problems:
+                problems[master] = master_problems
+
+        if problems:
+            lines = []
+            for master, master_problems in problems.items():
+                lines.append(f"  {master}:")
+                lines.extend(f"    {problem}" for problem in master_problems)
+            logger.error(
+                f"Broken references in {len(problems)} master document(s); "
+                f"they will not be compiled "
+                f"(set typst_validate_references = False to compile anyway):\n"
+                + "\n".join(lines)
+            )
+        return set(problems)
+
+    def _compile_master(self, docname: str, typst_content: str, **options) -> None:
+        """
+        Compile a master document and write its outputs.
+
+        Args:
+            docname: Name of the master document
+            typst_content: Typst markup of the master document
+            **options: Compile options passed to compile_typst_to_pdf
+        """
+        # Compile to PDF, in a worker process if typst_compile_processes is set
+        pool = self.get_compile_pool()
+        compile_function = (
+            pool.compile_typst_to_pdf if pool is not None else compile_typst_to_pdf
+        )
+        pdf_bytes = compile_function(typst_content, **options)
+
+        # Write PDF file
+        pdf_file = path.join(self.outdir, docname + ".pdf")
+        ensuredir(path.dirname(pdf_file))
+        with open(pdf_file, "wb") as f:
+            f.write(pdf_bytes)
+
+        logger.info(f"Generated PDF: {pdf_file}")
+
+    def get_compile_options(self) -> Dict[str, Any]:
+        """
+        Get the Typst compile options derived from the configuration.
+
+        Prefetches missing packages into the package cache if one is configured.
+
+        Returns:
+            Keyword arguments for the compile functions in typsphinx.pdf
+        """
+        return {
+            "package_cache_path": self._prefetch_typst_packages(),
+            "font_paths": self._get_font_paths(),
+            "ignore_system_fonts": getattr(
+                self.config, "typst_ignore_system_fonts", False
+            ),
+        }
+
+    def _get_package_cache_path(self) -> Optional[str]:
+        """
+        Get the configured local Typst package cache directory.
+
+        Relative paths are resolved from the configuration directory.
+
+        Returns:
+            Absolute path of the package cache, or None if not configured
+        """
+        cache_path = getattr(self.config, "typst_package_cache_path", None)
+        if not cache_path:
+            return None
+        return path.join(self.confdir, cache_path)
+
+    def _get_font_paths(self) -> List[str]:
+        """
+        Get the configured font directories.
+
+        Relative paths are resolved from the configuration directory.
+
+        Returns:
+            List of absolute font directory paths
+        """
+        font_paths = getattr(self.config, "typst_font_paths", None) or []
+        return [path.join(self.confdir, font_path) for font_path in font_paths]
+
+    def _prefetch_typst_packages(self) -> Optional[str]:
+        """
+        Make sure all required Typst packages are in the local package cache.
+
+        Collects the packages imported by generated documents, the configured
+        typst_package and any package imported by the written template, and
+        downloads those missing from the cache. A vendored cache is used as-is
+        without network access.
+
+        Returns:
+            Absolute path of the package cache, or None if not configured
+        """
+        cache_path = self._get_package_cache_path()
+        if not cache_path:
+            return None
+
+        from typsphinx.packages import (
+            REQUIRED_PACKAGES,
+            find_package_specs,
+            prefetch_packages,
+        )
+
+        specs = list(REQUIRED_PACKAGES)
+        typst_package = getattr(self.config, "typst_package", None)
+        if typst_package:
+            specs.extend(find_package_specs(typst_package))
+
+        template_file = path.join(self.typ_outdir, "_template.typ")
+        if path.exists(template_file):
+            with open(template_file, encoding="utf-8") as f:
+                specs.extend(find_package_specs(f.read()))
+
+        try:
+            downloaded = prefetch_packages(cache_path, specs)
+        except Exception as e:
+            logger.warning(f"Failed to prefetch Typst packages into {cache_path}: {e}")
+            return cache_path
+
+        if downloaded:
+            logger.info(
+                f"Downloaded {len(downloaded)} Typst package(s) into {cache_path}"
+            )
+        return cache_path
+
+
+class TypstPageBuilder(TypstPDFBuilder):
+    """
+    Base class for builders rendering master documents to page images.
+
+    Each master document is compiled once and exported both to PDF and to
+    one image file per page (``<docname>-<page>.<format>``). Pages are
+    written in parallel, and pages whose content did not change since the
+    last build are left untouched, so downstream consumers (e.g. a docs
+    portal sync) only pick up the pages that actually changed.
+    """
+
+    def _compile_master(self, docname: str, typst_content: str, **options) -> None:
+        """
+        Compile a master document to PDF and page images in one pass.
+
+        Args:
+            docname: Name of the master document
+            typst_content: Typst markup of the master document
+            **options: Compile options passed to compile_typst_document
+        """
+        pool = self.get_compile_pool()
+        compile_function = (
+            pool.compile_typst_document if pool is not None else compile_typst_document
+        )
+        outputs = compile_function(
+            typst_content,
+            formats=("pdf", self.format),
+            ppi=getattr(self.config, "typst_png_ppi", None),
+            **options,
+        )
+
+        pdf_file = path.join(self.outdir, docname + ".pdf")
+        ensuredir(path.dirname(pdf_file))
+        _write_if_changed(pdf_file, outputs["pdf"])
+        logger.info(f"Generated PDF: {pdf_file}")
+
+        pages = outputs[self.format]
+        page_files = [
+            (self._get_page_filename(docname, number), data)
+            for number, data in enumerate(pages, start=1)
+        ]
+        with ThreadPoolExecutor() as executor:
+            changed = sum(
+                executor.map(lambda page: _write_if_changed(*page), page_files)
+            )
+
+        removed = self._remove_stale_pages(docname, len(pages))
+
+        logger.info(
+            f"Generated {len(pages)} {self.format.upper()} page(s) for {docname} "
+            f"({changed} changed, {removed} removed)"
+        )
+
+    def _get_page_filename(self, docname: str, number: int) -> str:
+        """
+        Get the output path of a rendered page.
+
+        Args:
+            docname: Name of the master document
+            number: 1-based page number
+
+        Returns:
+            Path of the page image in the output directory
+        """
+        return path.join(self.outdir, f"{docname}-{number}.{self.format}")
+
+    def _remove_stale_pages(self, docname: str, page_count: int) -> int:
+        """
+        Remove pages left over from a previous, longer build.
+
+        Args:
+            docname: Name of the master document
+            page_count: Number of pages in the current build
+
+        Returns:
+            Number of removed page files
+        """
+        removed = 0
+        number = page_count + 1
+        while path.exists(self._get_page_filename(docname, number)):
+            os.unlink(self._get_page_filename(docname, number))
+            removed += 1
+            number += 1
+        return removed
+
+
+class TypstPNGBuilder(TypstPageBuilder):
+    """
+    Builder class for rendering master documents to PDF and PNG pages.
+
+    The resolution is configured with typst_png_ppi.
+    """
+
+    name = "typstpng"
+    format = "png"
+
+
+class TypstSVGBuilder(TypstPageBuilder):
+    """
+    Builder class for rendering master documents to PDF and SVG pages.
+    """
+
+    name = "typstsvg"
+    format = "svg"
+
+
+def _write_if_changed(filename: str, data: bytes) -> bool:
+    """
+    Write a file unless it already has the given content.
+
+    Args:
+        filename: Output file path
+        data: File content
+
+    Returns:
+        True if the file was written
+    """
+    try:
+        if path.getsize(filename) == len(data):
+            with open(filename, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    ensuredir(path.dirname(filename))
+    with open(filename, "wb") as f:
+        f.write(data)
+    return True
@@ -0,0 +1,140 @@
+"""
+Per-chapter PDF previews.
+
+This module implements the helpers the PDF builder uses to compile each
+top-level toctree entry (chapter) of a master document as a standalone PDF:
+wrapping a chapter with the template and imports of its master document,
+and the ChapterCache class, which skips chapters whose inputs did not change
+since the last preview build.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Optional
+
+from typsphinx.template_engine import INDEX_PARAMETER
+
+# Marks the start of the document body in master documents; everything
+# before it (package imports, template import and #show rule) is the preamble
+BODY_START = "\n#{\n"
+
+
+def make_chapter_document(master_content: str, chapter: str) -> Optional[str]:
+    """
+    Build a standalone Typst document for one chapter of a master document.
+
+    The chapter is included with the preamble of its master document, so it
+    is rendered with the same template, template parameters and imports as
+    in the full book, but without the back-of-book index. The include path
+    is absolute (relative to the Typst root directory), so the document can
+    be compiled from the root directory like the master document itself.
+
+    Args:
+        master_content: Typst markup of the master document
+        chapter: Name of the chapter document
+
+    Returns:
+        Typst markup of the chapter document, or None if the master document
+        has no recognizable body
+    """
+    index = master_content.find(BODY_START)
+    if index < 0:
+        return None
+    # The back-of-book index links to labels outside the chapter
+    preamble = master_content[: index + 1].replace(f"  {INDEX_PARAMETER}\n", "")
+    return f'{preamble}#include("/{chapter}.typ")\n'
+
+
+class ChapterCache:
+    """
+    Persistent cache of the inputs each chapter PDF was compiled from.
+
+    Attributes:
+        cache_file: Path of the JSON file the cache is stored in
+        keys: Chapter PDF path -> key of the inputs it was compiled from
+    """
+
+    def __init__(self, cache_file: str):
+        """
+        Initialize ChapterCache, loading the cache of a previous build.
+
+        Args:
+            cache_file: Path of the JSON cache file
+        """
+        self.cache_file = cache_file
+        self.keys: Dict[str, str] = {}
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                self.keys = json.load(f)
+        except (OSError, ValueError):
+            self.keys = {}
+
+    @staticmethod
+    def make_key(
+        document: str,
+        typ_files: Iterable[str],
+        input_files: Iterable[str],
+        options: Dict,
+    ) -> str:
+        """
+        Compute the key of the inputs of a chapter PDF.
+
+        Args:
+            document: Typst markup of the chapter document
+            typ_files: Generated .typ files the chapter includes (and the
+                template), hashed by content
+            input_files: Other input files (images), hashed by size and
+                modification time
+            options: Compile options
+
+        Returns:
+            Hex digest identifying the inputs
+        """
+        digest = hashlib.sha256()
+        digest.update(document.encode("utf-8"))
+        digest.update(repr(sorted(options.items())).encode("utf-8"))
+        for file_path in sorted(typ_files):
+            digest.update(file_path.encode("utf-8"))
+            try:
+                with open(file_path, "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(b"\0missing")
+        for file_path in sorted(input_files):
+            digest.update(file_path.encode("utf-8"))
+            try:
+                stat = os.stat(file_path)
+                digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+            except OSError:
+                digest.update(b"\0missing")
+        return digest.hexdigest()
+
+    def is_current(self, pdf_file: str, key: str) -> bool:
+        """
+        Check whether a chapter PDF was compiled from the given inputs.
+
+        Args:
+            pdf_file: Path of the chapter PDF
+            key: Key of the current inputs
+
+        Returns:
+            True if the PDF exists and its inputs did not change
+        """
+        return self.keys.get(pdf_file) == key and os.path.exists(pdf_file)
+
+    def record(self, pdf_file: str, key: str) -> None:
+        """
+        Record the inputs a chapter PDF was compiled from.
+
+        Args:
+            pdf_file: Path of the chapter PDF
+            key: Key of the inputs
+        """
+        self.keys[pdf_file] = key
+
+    def save(self) -> None:
+        """Write the cache for the next build."""
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump(self.keys, f, indent=1, sort_keys=True)
@@ -0,0 +1,138 @@
+"""
+Native CSV tables.
+
+This module implements the TypstCSVTable directive, which replaces the
+``csv-table`` directive and records where the data of file-backed tables
+comes from. With typst_native_csv_tables enabled, the translator emits such
+tables as a Typst ``csv()`` call on a copy of the data file instead of
+translating every cell, so translation time and output size do not grow
+with the size of the data.
+
+Tables are only marked for native output when Typst reads the file the same
+way docutils does: UTF-8 data, the standard quote character, no escape
+character, an ASCII delimiter and the same number of fields in every row.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+from docutils import nodes
+from sphinx.directives.patches import CSVTable
+
+# Attribute of table nodes that holds the native CSV options
+NATIVE_CSV_ATTRIBUTE = "typst_csv"
+
+# Encodings Typst can read CSV files in
+NATIVE_ENCODINGS = {"utf-8", "utf-8-sig", "utf8", "ascii"}
+
+
+def get_native_csv_options(options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get the csv() options for a csv-table directive.
+
+    Args:
+        options: Options of the csv-table directive
+
+    Returns:
+        Dictionary with "delimiter" and "trim", or None if Typst cannot
+        read the data like docutils does
+    """
+    delimiter = options.get("delim", ",")
+    if not delimiter.isascii() or delimiter in ('"', "\\"):
+        return None
+    if options.get("quote", '"') != '"' or "escape" in options:
+        return None
+    encoding = options.get("encoding")
+    if encoding is not None and encoding.lower() not in NATIVE_ENCODINGS:
+        return None
+    # docutils skips whitespace after delimiters unless :keepspace: is set
+    return {"delimiter": delimiter, "trim": "keepspace" not in options}
+
+
+class TypstCSVTable(CSVTable):
+    """
+    csv-table directive that marks file-backed tables for native output.
+
+    The table is built exactly like by the standard directive, so other
+    builders are not affected. For tables read from a file inside the
+    source directory, the table node additionally gets a "typst_csv"
+    attribute with the data file (relative to the source directory), the
+    csv() options and the number of header rows taken from the option and
+    from the file.
+    """
+
+    def run(self) -> List[nodes.Node]:
+        """
+        Build the table and mark it for native output if possible.
+
+        Returns:
+            The nodes of the standard csv-table directive
+        """
+        self._field_counts: List[int] = []
+        self._header_option_rows = 0
+        # Reading the file changes the current source to the data file
+        current_source = self.state.document.current_source
+        result = super().run()
+
+        if "file" not in self.options or not result:
+            return result
+        table = result[0]
+        if not isinstance(table, nodes.table):
+            return result
+
+        options = get_native_csv_options(self.options)
+        data_file = self._get_data_file(current_source)
+        tgroups = list(table.findall(nodes.tgroup))
+        if options is None or data_file is None or len(tgroups) != 1:
+            return result
+        # Typst requires every row of the file to have the same length,
+        # and the table must not be padded with empty cells
+        if set(self._field_counts) != {tgroups[0].get("cols", 0)}:
+            return result
+
+        options.update(
+            file=data_file,
+            header_option_rows=self._header_option_rows,
+            header_rows=self.options.get("header-rows", 0),
+        )
+        table[NATIVE_CSV_ATTRIBUTE] = options
+        return result
+
+    def process_header_option(self):
+        """Count the header rows given by the :header: option."""
+        table_head, max_header_cols = super().process_header_option()
+        self._header_option_rows = len(table_head)
+        # Rows parsed so far belong to the header option, not the file
+        self._field_counts = []
+        return table_head, max_header_cols
+
+    def parse_csv_data_into_rows(self, csv_data, dialect, source):
+        """Record the number of fields of each parsed row."""
+        rows, max_cols = super().parse_csv_data_into_rows(csv_data, dialect, source)
+        self._field_counts.extend(len(row) for row in rows)
+        return rows, max_cols
+
+    def _get_data_file(self, current_source: Optional[str]) -> Optional[str]:
+        """
+        Get the data file relative to the source directory.
+
+        Args:
+            current_source: Source file of the directive
+
+        Returns:
+            POSIX path relative to the source directory, or None if the file
+            is outside of it
+        """
+        env = self.state.document.settings.env
+        if not current_source:
+            return None
+        source = os.path.abspath(
+            os.path.join(os.path.dirname(current_source), self.options["file"])
+        )
+        try:
+            relative = os.path.relpath(source, env.srcdir)
+        except ValueError:  # Different drive on Windows
+            return None
+        if relative.startswith(os.pardir):
+            return None
+        return relative.replace(os.sep, "/")
@@ -0,0 +1,376 @@
+"""
+Image preprocessing for Typst output.
+
+This module implements the optional image pipeline used by the Typst
+builders: images are downscaled to the resolution needed for the page width,
+recompressed, and deduplicated by content hash before being embedded.
+Processing results are cached by source hash across builds.
+
+Raster processing requires Pillow (``pip install typsphinx[images]``).
+Without Pillow, or for vector formats, images are still deduplicated but
+copied unchanged.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Formats that can be resized and recompressed
+RASTER_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif"}
+
+# Resolution Typst assumes for raster images without DPI metadata
+TYPST_DEFAULT_DPI = 72.0
+
+# Version of the processing, part of the settings key so outputs of older
+# versions are reprocessed
+PROCESSING_VERSION = 2
+
+# Manifest file recording processed images, relative to the output directory
+MANIFEST_NAME = ".typsphinx-images.json"
+
+# Environment variable naming a processed image cache shared between builds
+SHARED_CACHE_ENV = "TYPSPHINX_SHARED_CACHE"
+
+
+def check_pillow_available() -> bool:
+    """
+    Check if Pillow is available for raster image processing.
+
+    Returns:
+        True if Pillow can be imported
+    """
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Compute the SHA-256 hash of a file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImagePipeline:
+    """
+    Downscale, recompress and deduplicate images for Typst output.
+
+    Images are registered during the write phase, which assigns each source
+    image an output path derived from its content hash. Identical images
+    referenced under different URIs therefore share one output file.
+    process() then produces all output files in a worker pool, skipping
+    images whose output already exists for the same settings.
+
+    Options (``typst_image_pipeline`` configuration dictionary):
+        dpi: Target resolution in pixels per inch (default: 150)
+        page_width: Maximum display width in inches (default: 6.3, the
+            text width of an A4 page with Typst's default margins)
+        quality: JPEG quality (default: 85)
+        workers: Number of worker threads (default: CPU count)
+        output_dir: Output subdirectory for processed images (default: "_images")
+        shared_cache: Directory shared by several builds (e.g. one per
+            language, see typsphinx.multilang) in which each image is
+            processed only once (default: the TYPSPHINX_SHARED_CACHE
+            environment variable, or no shared cache)
+    """
+
+    DEFAULT_OPTIONS: Dict[str, Any] = {
+        "dpi": 150,
+        "page_width": 6.3,
+        "quality": 85,
+        "workers": None,
+        "output_dir": "_images",
+        "shared_cache": None,
+    }
+
+    def __init__(self, srcdir: str, outdir: str, options: Dict[str, Any]):
+        """
+        Initialize ImagePipeline.
+
+        Args:
+            srcdir: Sphinx source directory (image URIs are relative to it)
+            outdir: Builder output directory
+            options: Pipeline options, merged over DEFAULT_OPTIONS
+        """
+        self.srcdir = srcdir
+        self.outdir = outdir
+        self.options = {**self.DEFAULT_OPTIONS, **(options or {})}
+        if not self.options["shared_cache"]:
+            self.options["shared_cache"] = os.environ.get(SHARED_CACHE_ENV) or None
+        self.max_width_px = int(self.options["page_width"] * self.options["dpi"])
+
+        # Output path (relative to outdir) -> absolute source path
+        self.outputs: Dict[str, str] = {}
+
+        self.manifest_path = os.path.join(
+            outdir, self.options["output_dir"], MANIFEST_NAME
+        )
+        self.manifest = self._load_manifest()
+        # Guards the source hash cache when documents are translated in
+        # parallel (typst_write_workers)
+        self._lock = threading.Lock()
+
+    @property
+    def settings_key(self) -> str:
+        """Fingerprint of the settings that affect processed output."""
+        return (
+            f"{self.max_width_px}px/q{self.options['quality']}"
+            f"/{'pil' if check_pillow_available() else 'copy'}"
+            f"/v{PROCESSING_VERSION}"
+        )
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """
+        Load the processing manifest from a previous build.
+
+        Returns:
+            Manifest with "sources" (source stat cache) and "outputs"
+            (settings each output was produced with)
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"sources": {}, "outputs": {}}
+        manifest.setdefault("sources", {})
+        manifest.setdefault("outputs", {})
+        return manifest
+
+    def _save_manifest(self) -> None:
+        """Write the processing manifest for the next build."""
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+
+    def _source_hash(self, src: str) -> str:
+        """
+        Get the content hash of a source image.
+
+        The hash is cached in the manifest by file size and modification
+        time, so unchanged images are not re-read on subsequent builds.
+
+        Args:
+            src: Absolute source path
+
+        Returns:
+            Hex digest of the file content
+        """
+        stat = os.stat(src)
+        with self._lock:
+            cached = self.manifest["sources"].get(src)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        digest = hash_file(src)
+        with self._lock:
+            self.manifest["sources"][src] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def get_output_path(self, imguri: str) -> Optional[str]:
+        """
+        Get the output path of a source image without registering it.
+
+        Args:
+            imguri: Image URI relative to the source directory
+
+        Returns:
+            Output path relative to the output directory, or None if the
+            source image does not exist
+        """
+        src = os.path.join(self.srcdir, imguri)
+        if not os.path.isfile(src):
+            return None
+
+        ext = os.path.splitext(imguri)[1].lower()
+        digest = self._source_hash(src)
+        return f"{self.options['output_dir']}/{digest[:16]}{ext}"
+
+    def register(self, imguri: str) -> Optional[str]:
+        """
+        Register a source image and get its output path.
+
+        Args:
+            imguri: Image URI relative to the source directory
+
+        Returns:
+            Output path relative to the output directory, or None if the
+            source image does not exist
+        """
+        output = self.get_output_path(imguri)
+        if output is not None:
+            self.outputs.setdefault(output, os.path.join(self.srcdir, imguri))
+        return output
+
+    def process(self) -> Tuple[int, int]:
+        """
+        Produce all registered output images.
+
+        Returns:
+            Tuple of (processed count, cached count)
+        """
+        settings_key = self.settings_key
+        pending = []
+        for output, src in self.outputs.items():
+            dest = os.path.join(self.outdir, output)
+            if self.manifest["outputs"].get(output) == settings_key and os.path.exists(
+                dest
+            ):
+                continue
+            pending.append((src, dest, output))
+
+        if pending:
+            os.makedirs(
+                os.path.join(self.outdir, self.options["output_dir"]), exist_ok=True
+            )
+            with ThreadPoolExecutor(max_workers=self.options["workers"]) as executor:
+                results = executor.map(lambda job: self._process_one(*job), pending)
+                for output, ok in results:
+                    if ok:
+                        self.manifest["outputs"][output] = settings_key
+                    else:
+                        self.manifest["outputs"].pop(output, None)
+
+        self._save_manifest()
+        return len(pending), len(self.outputs) - len(pending)
+
+    def _process_one(self, src: str, dest: str, output: str) -> Tuple[str, bool]:
+        """
+        Produce a single output image.
+
+        Args:
+            src: Absolute source path
+            dest: Absolute destination path
+            output: Output path relative to the output directory
+
+        Returns:
+            Tuple of (output, success)
+        """
+        try:
+            shared_cache = self.options["shared_cache"]
+            if shared_cache:
+                shared = self._get_shared_path(shared_cache, output)
+                if not os.path.exists(shared):
+                    os.makedirs(os.path.dirname(shared), exist_ok=True)
+                    self._produce(src, shared)
+                shutil.copy2(shared, dest)
+            else:
+                self._produce(src, dest)
+            return output, True
+        except Exception as e:
+            logger.warning(f"Failed to process image {src}: {e}")
+            return output, False
+
+    def _get_shared_path(self, shared_cache: str, output: str) -> str:
+        """
+        Get the path of a processed image in the shared cache.
+
+        Args:
+            shared_cache: Shared cache directory
+            output: Output path relative to the output directory
+
+        Returns:
+            Path keyed by the processing settings and the content hash
+        """
+        settings = hashlib.sha256(self.settings_key.encode()).hexdigest()[:16]
+        return os.path.join(shared_cache, "images", settings, os.path.basename(output))
+
+    def _produce(self, src: str, dest: str) -> None:
+        """
+        Process or copy a source image to its destination.
+
+        The destination is written atomically, so concurrent builds sharing
+        a cache never see a partially written file.
+
+        Args:
+            src: Absolute source path
+            dest: Absolute destination path
+        """
+        ext = os.path.splitext(src)[1].lower()
+        if ext in RASTER_EXTENSIONS and check_pillow_available():
+            self._downscale(src, dest, ext)
+        else:
+            tmp_dest = f"{dest}.{os.getpid()}.tmp"
+            shutil.copy2(src, tmp_dest)
+            os.replace(tmp_dest, dest)
+
+    def _downscale(self, src: str, dest: str, ext: str) -> None:
+        """
+        Downscale and recompress a raster image.
+
+        Images that are already small enough are recompressed only; if
+        recompression does not reduce the file size, the original is copied.
+
+        Typst sizes images without an explicit width from their pixels and
+        DPI, so the DPI of resized PNG and JPEG images is scaled with them
+        to keep their size in the document. GIF has no DPI metadata, so GIF
+        images are recompressed but not resized.
+
+        Args:
+            src: Absolute source path
+            dest: Absolute destination path
+            ext: Lower-case file extension
+        """
+        from PIL import Image
+
+        with Image.open(src) as image:
+            if getattr(image, "is_animated", False):
+                shutil.copy2(src, dest)
+                return
+
+            resized = False
+            dpi = image.info.get("dpi")
+            if image.width > self.max_width_px and ext != ".gif":
+                width, height = image.width, image.height
+                new_height = max(1, round(height * self.max_width_px / width))
+                image = image.resize(
+                    (self.max_width_px, new_height), Image.Resampling.LANCZOS
+                )
+                x_dpi, y_dpi = dpi or (TYPST_DEFAULT_DPI, TYPST_DEFAULT_DPI)
+                dpi = (
+                    x_dpi * self.max_width_px / width,
+                    y_dpi * new_height / height,
+                )
+                resized = True
+            save_options = {"dpi": dpi} if dpi else {}
+
+            tmp_dest = f"{dest}.{os.getpid()}.tmp"
+            if ext in (".jpg", ".jpeg"):
+                if image.mode not in ("RGB", "L"):
+                    image = image.convert("RGB")
+                image.save(
+                    tmp_dest,
+                    format="JPEG",
+                    quality=self.options["quality"],
+                    optimize=True,
+                    **save_options,
+                )
+            else:
+                image.save(
+                    tmp_dest,
+                    format=image.format or ext[1:].upper(),
+                    optimize=True,
+                    **save_options,
+                )
+
+        if not resized and os.path.getsize(tmp_dest) >= os.path.getsize(src):
+            shutil.copy2(src, tmp_dest)
+        os.replace(tmp_dest, dest)
@@ -0,0 +1,228 @@
+"""
+Back-of-book index from Sphinx index entries.
+
+This module turns the index entries Sphinx collects (``.. index::``
+directives, the ``:index:`` role and domain objects) into a sorted, grouped
+index and renders it as Typst markup. The index is computed in Python, so
+the Typst document only contains anchor labels at the entry sites and
+page references to them, instead of querying every index marker during
+layout.
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Group of entries that do not start with a letter
+SYMBOLS_GROUP = "Symbols"
+
+# (main, docname, target id) of one index reference
+IndexTarget = Tuple[bool, str, str]
+
+
+def make_anchor_label(docname: str, target_id: str) -> str:
+    """
+    Get the label of the anchor of an index entry.
+
+    Target ids are only unique within a document, so the label includes the
+    document name.
+
+    Args:
+        docname: Document containing the entry
+        target_id: Target id of the entry
+
+    Returns:
+        Typst label name
+    """
+    return f"index:{docname}#{target_id}"
+
+
+def get_index_file(master: str) -> str:
+    """
+    Get the path of the index file of a master document.
+
+    Args:
+        master: Name of the master document
+
+    Returns:
+        Path relative to the Typst output directory
+    """
+    return f"_index/{master}.typ"
+
+
+class IndexTerm:
+    """
+    An index term with its references, sub-entries and cross-references.
+
+    Attributes:
+        name: Term as shown in the index
+        targets: References to the term
+        subentries: Sub-entry name -> references
+        see: Cross-references ("see ..." and "see also ...") shown as
+            sub-entries
+        category: Group the term is listed under, if given explicitly
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize IndexTerm.
+
+        Args:
+            name: Term as shown in the index
+        """
+        self.name = name
+        self.targets: List[IndexTarget] = []
+        self.subentries: Dict[str, List[IndexTarget]] = {}
+        self.see: List[str] = []
+        self.category: Optional[str] = None
+
+
+def _sort_key(name: str) -> Tuple[int, str]:
+    """Sort key of a term: symbols first, then letters ignoring case and accents."""
+    normalized = unicodedata.normalize("NFD", name.lower())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return (0 if not normalized[:1].isalpha() else 1, normalized)
+
+
+def _group_name(term: IndexTerm) -> str:
+    """Get the group (letter) a term is listed under."""
+    if term.category:
+        return term.category
+    key = _sort_key(term.name)[1]
+    return key[:1].upper() if key[:1].isalpha() else SYMBOLS_GROUP
+
+
+def collect_index(
+    entries: Dict[str, List[tuple]], docnames: Iterable[str]
+) -> List[Tuple[str, List[IndexTerm]]]:
+    """
+    Sort and group the index entries of a set of documents.
+
+    Args:
+        entries: Index entries per document, as collected by the Sphinx
+            index domain: (type, value, target id, main, category key)
+        docnames: Documents to index, in reading order; references are
+            listed in this order
+
+    Returns:
+        List of (group name, terms) in index order
+    """
+    terms: Dict[str, IndexTerm] = {}
+
+    def term_for(name: str, category: Optional[str]) -> IndexTerm:
+        term = terms.get(name)
+        if term is None:
+            term = terms[name] = IndexTerm(name)
+        if category and not term.category:
+            term.category = category
+        return term
+
+    def add(
+        name: str, subentry: str, target: IndexTarget, category: Optional[str]
+    ) -> None:
+        term = term_for(name.strip(), category)
+        subentry = subentry.strip()
+        references = term.subentries.setdefault(subentry, []) if subentry else None
+        if references is None:
+            references = term.targets
+        if target not in references:
+            references.append(target)
+
+    for docname in docnames:
+        for entry in entries.get(docname, ()):
+            entry_type, value, target_id, main = entry[:4]
+            category = entry[4] if len(entry) > 4 else None
+            target = (main == "main", docname, target_id)
+            parts = [part.strip() for part in value.split(";")]
+
+            if entry_type == "single":
+                add(parts[0], parts[1] if len(parts) > 1 else "", target, category)
+            elif entry_type == "pair" and len(parts) == 2:
+                add(parts[0], parts[1], target, category)
+                add(parts[1], parts[0], target, category)
+            elif entry_type == "triple" and len(parts) == 3:
+                first, second, third = parts
+                add(first, f"{second} {third}", target, category)
+                add(second, f"{third}, {first}", target, category)
+                add(third, f"{first} {second}", target, category)
+            elif entry_type in ("see", "seealso") and len(parts) == 2:
+                prefix = "see" if entry_type == "see" else "see also"
+                see = f"{prefix} {parts[1]}"
+                term = term_for(parts[0], category)
+                if see not in term.see:
+                    term.see.append(see)
+
+    groups: Dict[str, List[IndexTerm]] = {}
+    for name in sorted(terms, key=_sort_key):
+        term = terms[name]
+        term.subentries = dict(
+            sorted(term.subentries.items(), key=lambda item: _sort_key(item[0]))
+        )
+        groups.setdefault(_group_name(term), []).append(term)
+    return sorted(
+        groups.items(),
+        key=lambda group: (group[0] != SYMBOLS_GROUP, _sort_key(group[0])),
+    )
+
+
+def _escape(text: str) -> str:
+    """Escape text for a Typst string literal."""
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _render_targets(targets: List[IndexTarget]) -> str:
+    """Render page references to index anchors, main entries in bold."""
+    parts = []
+    for main, docname, target_id in targets:
+        label = _escape(make_anchor_label(docname, target_id))
+        page = f'context str(counter(page).at(label("{label}")).first())'
+        if main:
+            page = f"strong({page})"
+        parts.append(f'link(label("{label}"), {page})')
+    return 'text(", ")\n'.join(f"{part}\n" for part in parts)
+
+
+def render_index(groups: List[Tuple[str, List[IndexTerm]]], title: str) -> str:
+    """
+    Render a grouped index as Typst markup.
+
+    The result defines ``typst_index``, the index section content the
+    template places at the end of the document (or ``none`` without
+    entries).
+
+    Args:
+        groups: Grouped index from collect_index
+        title: Heading of the index section
+
+    Returns:
+        Typst markup of the index file
+    """
+    lines = ["// Back-of-book index generated by typsphinx", ""]
+    if not groups:
+        lines.append("#let typst_index = none")
+        return "\n".join(lines) + "\n"
+
+    lines.append("#let typst_index = {")
+    lines.append(f'heading(level: 1, numbering: none, text("{_escape(title)}"))')
+    lines.append("columns(2, {")
+    for group, terms in groups:
+        lines.append(
+            f"heading(level: 2, numbering: none, outlined: false, "
+            f'text("{_escape(group)}"))'
+        )
+        for term in terms:
+            entry = f'text("{_escape(term.name)}")\n'
+            if term.targets:
+                entry += 'text(", ")\n' + _render_targets(term.targets)
+            lines.append(f"block(spacing: 0.5em, {{{entry}}})")
+            for subentry, targets in term.subentries.items():
+                sub = f'text("{_escape(subentry)}")\n'
+                sub += 'text(", ")\n' + _render_targets(targets)
+                lines.append(f"pad(left: 1em, block(spacing: 0.5em, {{{sub}}}))")
+            for see in term.see:
+                lines.append(
+                    f"pad(left: 1em, block(spacing: 0.5em, "
+                    f'emph(text("{_escape(see)}"))))'
+                )
+    lines.append("})")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
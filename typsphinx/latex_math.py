@@ -0,0 +1,609 @@
+"""
+Ahead-of-time LaTeX to Typst math conversion.
+
+This module converts a strict subset of LaTeX math to native Typst math in
+Python, so the mitex package does not have to convert formulas inside the
+Typst compiler on every PDF compile. Formulas outside the supported subset
+are reported as unsupported (None) and left to mitex.
+
+Conversion results are stored in a persistent, content-addressed cache
+(MathCache), so unchanged formulas are not converted again across builds.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the conversion output changes, to invalidate cached results
+CONVERTER_VERSION = "1"
+
+GREEK_LETTERS = {
+    "alpha": "alpha",
+    "beta": "beta",
+    "gamma": "gamma",
+    "delta": "delta",
+    "epsilon": "epsilon.alt",
+    "varepsilon": "epsilon",
+    "zeta": "zeta",
+    "eta": "eta",
+    "theta": "theta",
+    "vartheta": "theta.alt",
+    "iota": "iota",
+    "kappa": "kappa",
+    "lambda": "lambda",
+    "mu": "mu",
+    "nu": "nu",
+    "xi": "xi",
+    "pi": "pi",
+    "varpi": "pi.alt",
+    "rho": "rho",
+    "varrho": "rho.alt",
+    "sigma": "sigma",
+    "varsigma": "sigma.alt",
+    "tau": "tau",
+    "upsilon": "upsilon",
+    "phi": "phi.alt",
+    "varphi": "phi",
+    "chi": "chi",
+    "psi": "psi",
+    "omega": "omega",
+    "Gamma": "Gamma",
+    "Delta": "Delta",
+    "Theta": "Theta",
+    "Lambda": "Lambda",
+    "Xi": "Xi",
+    "Pi": "Pi",
+    "Sigma": "Sigma",
+    "Upsilon": "Upsilon",
+    "Phi": "Phi",
+    "Psi": "Psi",
+    "Omega": "Omega",
+}
+
+SYMBOLS = {
+    # Operators and relations
+    "cdot": "dot.op",
+    "times": "times",
+    "div": "div",
+    "pm": "plus.minus",
+    "mp": "minus.plus",
+    "ast": "ast.op",
+    "star": "star",
+    "circ": "compose",
+    "oplus": "plus.o",
+    "otimes": "times.o",
+    "leq": "lt.eq",
+    "le": "lt.eq",
+    "geq": "gt.eq",
+    "ge": "gt.eq",
+    "neq": "eq.not",
+    "ne": "eq.not",
+    "ll": "lt.double",
+    "gg": "gt.double",
+    "approx": "approx",
+    "equiv": "equiv",
+    "sim": "tilde.op",
+    "simeq": "tilde.eq",
+    "cong": "tilde.equiv",
+    "propto": "prop",
+    "perp": "perp",
+    "parallel": "parallel",
+    "mid": "divides",
+    # Sets and logic
+    "in": "in",
+    "notin": "in.not",
+    "ni": "in.rev",
+    "subset": "subset",
+    "subseteq": "subset.eq",
+    "supset": "supset",
+    "supseteq": "supset.eq",
+    "cup": "union",
+    "cap": "inter",
+    "setminus": "without",
+    "emptyset": "emptyset",
+    "varnothing": "emptyset",
+    "forall": "forall",
+    "exists": "exists",
+    "neg": "not",
+    "lnot": "not",
+    "land": "and",
+    "wedge": "and",
+    "lor": "or",
+    "vee": "or",
+    "top": "top",
+    "bot": "bot",
+    # Arrows
+    "to": "arrow.r",
+    "rightarrow": "arrow.r",
+    "leftarrow": "arrow.l",
+    "gets": "arrow.l",
+    "leftrightarrow": "arrow.l.r",
+    "Rightarrow": "arrow.r.double",
+    "Leftarrow": "arrow.l.double",
+    "Leftrightarrow": "arrow.l.r.double",
+    "implies": "arrow.r.double",
+    "iff": "arrow.l.r.double",
+    "mapsto": "arrow.r.bar",
+    "uparrow": "arrow.t",
+    "downarrow": "arrow.b",
+    # Miscellaneous
+    "infty": "infinity",
+    "partial": "partial",
+    "nabla": "nabla",
+    "ell": "ell",
+    "aleph": "aleph",
+    "Re": "Re",
+    "Im": "Im",
+    "angle": "angle",
+    "prime": "prime",
+    "dagger": "dagger",
+    "ldots": "dots.h",
+    "dots": "dots.h",
+    "cdots": "dots.h.c",
+    "vdots": "dots.v",
+    "ddots": "dots.down",
+    "therefore": "therefore",
+    "because": "because",
+    # Big operators
+    "sum": "sum",
+    "prod": "product",
+    "int": "integral",
+    "iint": "integral.double",
+    "iiint": "integral.triple",
+    "oint": "integral.cont",
+    "bigcup": "union.big",
+    "bigcap": "inter.big",
+    # Delimiters
+    "langle": "chevron.l",
+    "rangle": "chevron.r",
+    "lvert": "|",
+    "rvert": "|",
+    "vert": "|",
+    "lVert": "bar.v.double",
+    "rVert": "bar.v.double",
+    "Vert": "bar.v.double",
+    "|": "bar.v.double",
+    "{": "{",
+    "}": "}",
+    "lbrace": "{",
+    "rbrace": "}",
+    "%": "percent",
+    "$": "dollar",
+    # Spacing
+    ",": "thin",
+    ":": "med",
+    ";": "med",
+    " ": "thin",
+    "quad": "quad",
+    "qquad": "wide",
+}
+
+# Operator names that exist as Typst math functions with the same name
+FUNCTIONS = {
+    "sin",
+    "cos",
+    "tan",
+    "cot",
+    "sec",
+    "csc",
+    "arcsin",
+    "arccos",
+    "arctan",
+    "sinh",
+    "cosh",
+    "tanh",
+    "log",
+    "lg",
+    "ln",
+    "exp",
+    "lim",
+    "liminf",
+    "limsup",
+    "max",
+    "min",
+    "sup",
+    "inf",
+    "det",
+    "dim",
+    "gcd",
+    "hom",
+    "ker",
+    "deg",
+    "arg",
+}
+
+# Commands taking one argument, mapped to a Typst function
+UNARY_FUNCTIONS = {
+    "mathbf": "bold",
+    "boldsymbol": "bold",
+    "bm": "bold",
+    "mathit": "italic",
+    "mathcal": "cal",
+    "mathbb": "bb",
+    "mathsf": "sans",
+    "mathtt": "mono",
+    "hat": "hat",
+    "widehat": "hat",
+    "tilde": "tilde",
+    "widetilde": "tilde",
+    "bar": "macron",
+    "overline": "overline",
+    "underline": "underline",
+    "vec": "arrow",
+    "dot": "dot",
+    "ddot": "dot.double",
+    "overbrace": "overbrace",
+    "underbrace": "underbrace",
+    "sqrt": "sqrt",
+}
+
+# Commands taking two arguments, mapped to a Typst function
+BINARY_FUNCTIONS = {
+    "frac": "frac",
+    "dfrac": "frac",
+    "tfrac": "frac",
+    "binom": "binom",
+}
+
+# Commands without visible output in Typst (sizing and style hints)
+IGNORED_COMMANDS = {
+    "left",
+    "right",
+    "big",
+    "Big",
+    "bigg",
+    "Bigg",
+    "bigl",
+    "bigr",
+    "Bigl",
+    "Bigr",
+    "biggl",
+    "biggr",
+    "Biggl",
+    "Biggr",
+    "limits",
+    "nolimits",
+    "displaystyle",
+    "textstyle",
+}
+
+# Characters passed through unchanged
+PLAIN_CHARACTERS = set("+-=,;:!|.*()[]?")
+
+# Characters with a different meaning in Typst math
+CHARACTER_MAP = {"<": "lt", ">": "gt", "/": "slash"}
+
+_NUMBER_RE = re.compile(r"[0-9]+(\.[0-9]+)?")
+_SIMPLE_SCRIPT_RE = re.compile(r"[0-9]+(\.[0-9]+)?|[A-Za-z]+(\.[A-Za-z]+)*|\S")
+
+
+class UnsupportedLatexError(Exception):
+    """Raised when a formula is outside the supported LaTeX subset."""
+
+
+class _Converter:
+    """Recursive-descent converter for a strict LaTeX math subset."""
+
+    def __init__(self, source: str, display: bool):
+        self.source = source
+        self.display = display
+        self.pos = 0
+
+    def convert(self) -> str:
+        result = self._sequence(end=None)
+        if self.pos < len(self.source):
+            raise UnsupportedLatexError(f"unexpected {self.source[self.pos]!r}")
+        return result
+
+    # Scanning helpers
+
+    def _peek(self) -> str:
+        return self.source[self.pos] if self.pos < len(self.source) else ""
+
+    def _skip_space(self) -> None:
+        while self.pos < len(self.source) and self.source[self.pos].isspace():
+            self.pos += 1
+
+    def _read_command(self) -> str:
+        """Read a command name after a backslash."""
+        start = self.pos
+        while self.pos < len(self.source) and self.source[self.pos].isalpha():
+            self.pos += 1
+        if self.pos == start:
+            # Control symbol such as \, or \{
+            if self.pos >= len(self.source):
+                raise UnsupportedLatexError("trailing backslash")
+            self.pos += 1
+        return self.source[start : self.pos]
+
+    def _read_raw_group(self) -> str:
+        """Read the raw text of a {...} group (for \\text and friends)."""
+        self._skip_space()
+        if self._peek() != "{":
+            raise UnsupportedLatexError("expected {")
+        depth = 0
+        start = self.pos + 1
+        while self.pos < len(self.source):
+            char = self.source[self.pos]
+            if char == "\\":
+                raise UnsupportedLatexError("command in text")
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    self.pos += 1
+                    return self.source[start : self.pos - 1]
+            self.pos += 1
+        raise UnsupportedLatexError("unbalanced braces")
+
+    # Grammar
+
+    def _sequence(self, end: Optional[str]) -> str:
+        """Convert atoms until the end character (or end of input)."""
+        atoms: List[str] = []
+        while True:
+            self._skip_space()
+            char = self._peek()
+            if not char:
+                if end is not None:
+                    raise UnsupportedLatexError("unbalanced group")
+                break
+            if char == end:
+                self.pos += 1
+                break
+            if char in "_^'":
+                if not atoms:
+                    raise UnsupportedLatexError("script without base")
+                atoms[-1] += self._script()
+                continue
+            atom = self._atom()
+            if atom:
+                atoms.append(atom)
+        return " ".join(atoms)
+
+    def _script(self) -> str:
+        """Convert a sub/superscript or prime attached to the previous atom."""
+        char = self._peek()
+        self.pos += 1
+        if char == "'":
+            return "'"
+        argument = self._argument()
+        if not argument:
+            raise UnsupportedLatexError("empty script")
+        if _SIMPLE_SCRIPT_RE.fullmatch(argument) and argument not in "()[]":
+            return f"{char}{argument}"
+        return f"{char}({argument})"
+
+    def _argument(self) -> str:
+        """Convert a command or script argument: a group or a single token."""
+        self._skip_space()
+        char = self._peek()
+        if char == "{":
+            self.pos += 1
+            return self._sequence(end="}")
+        if not char:
+            raise UnsupportedLatexError("missing argument")
+        if char.isdigit():
+            # LaTeX takes a single digit as argument
+            self.pos += 1
+            return char
+        return self._atom()
+
+    def _function_argument(self) -> str:
+        """Convert an argument used inside a Typst function call."""
+        argument = self._argument()
+        if _has_top_level_separator(argument):
+            raise UnsupportedLatexError("separator in function argument")
+        return argument
+
+    def _atom(self) -> str:
+        char = self._peek()
+
+        if char == "\\":
+            self.pos += 1
+            return self._command(self._read_command())
+
+        if char == "{":
+            self.pos += 1
+            group = self._sequence(end="}")
+            # Groups are invisible in LaTeX; keep multi-atom groups together
+            # so a following script applies to the whole group
+            if " " in group:
+                raise UnsupportedLatexError("group used as atom")
+            return group
+
+        if char == "}":
+            raise UnsupportedLatexError("unbalanced braces")
+
+        if char.isdigit():
+            match = _NUMBER_RE.match(self.source, self.pos)
+            self.pos = match.end()
+            return match.group(0)
+
+        self.pos += 1
+
+        if char.isascii() and char.isalpha():
+            return char
+        if char in PLAIN_CHARACTERS:
+            return char
+        if char in CHARACTER_MAP:
+            return CHARACTER_MAP[char]
+        if char == "~":
+            return "space"
+        if char == "&" and self.display:
+            return "&"
+        if not char.isascii() and (char.isalpha() or not char.isspace()):
+            return char
+        raise UnsupportedLatexError(f"unsupported character {char!r}")
+
+    def _command(self, name: str) -> str:
+        if name in GREEK_LETTERS:
+            return GREEK_LETTERS[name]
+        if name in SYMBOLS:
+            return SYMBOLS[name]
+        if name in FUNCTIONS:
+            return name
+        if name in IGNORED_COMMANDS:
+            if name == "left" or name == "right":
+                self._skip_space()
+                if self._peek() == ".":
+                    raise UnsupportedLatexError("null delimiter")
+            return ""
+        if name == "\\":
+            if not self.display:
+                raise UnsupportedLatexError("line break in inline math")
+            return "\\"
+        if name == "sqrt":
+            self._skip_space()
+            if self._peek() == "[":
+                self.pos += 1
+                index = self._sequence(end="]")
+                radicand = self._function_argument()
+                if _has_top_level_separator(index):
+                    raise UnsupportedLatexError("separator in root index")
+                return f"root({index}, {radicand})"
+        if name in UNARY_FUNCTIONS:
+            argument = self._function_argument()
+            return f"{UNARY_FUNCTIONS[name]}({argument})"
+        if name in BINARY_FUNCTIONS:
+            first = self._function_argument()
+            second = self._function_argument()
+            return f"{BINARY_FUNCTIONS[name]}({first}, {second})"
+        if name in ("text", "textrm", "mbox", "mathrm", "operatorname"):
+            text = self._read_raw_group()
+            if '"' in text:
+                raise UnsupportedLatexError("quote in text")
+            if name == "operatorname":
+                return f'op("{text}")'
+            if name == "mathrm":
+                return f'upright("{text}")'
+            return f'"{text}"'
+        raise UnsupportedLatexError(f"unsupported command \\{name}")
+
+
+def _has_top_level_separator(typst_math: str) -> bool:
+    """Check for commas or semicolons that would split function arguments."""
+    depth = 0
+    in_string = False
+    for char in typst_math:
+        if char == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char in ",;" and depth <= 0:
+            return True
+    return False
+
+
+def convert_latex_math(latex: str, display: bool = False) -> Optional[str]:
+    """
+    Convert LaTeX math to native Typst math.
+
+    Args:
+        latex: LaTeX math content (without delimiters)
+        display: True for block math, which may contain line breaks (``\\\\``),
+            alignment (``&``) and several equations separated by blank lines
+
+    Returns:
+        Typst math content (without ``$`` delimiters), or None if the formula
+        uses LaTeX outside the supported subset
+    """
+    if display:
+        equations = [part for part in re.split(r"\n\s*\n", latex) if part.strip()]
+    else:
+        equations = [latex]
+
+    try:
+        converted = [_Converter(equation, display).convert() for equation in equations]
+    except UnsupportedLatexError as e:
+        logger.debug(f"Falling back to mitex for {latex!r}: {e}")
+        return None
+
+    if not any(converted):
+        return None
+    return " \\ ".join(converted)
+
+
+class MathCache:
+    """
+    Persistent, content-addressed cache of math conversion results.
+
+    Entries are keyed by a hash of the converter version, the math mode and
+    the LaTeX source. Unsupported formulas are cached as well, so they are
+    not parsed again either.
+    """
+
+    def __init__(self, cache_file: str):
+        """
+        Initialize MathCache.
+
+        Args:
+            cache_file: Path of the JSON cache file
+        """
+        self.cache_file = cache_file
+        self.entries: Dict[str, Optional[str]] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        # Guards entries and counters when documents are translated in
+        # parallel (typst_write_workers)
+        self._lock = threading.Lock()
+
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def make_key(latex: str, display: bool) -> str:
+        """Compute the cache key of a formula."""
+        mode = "block" if display else "inline"
+        data = f"{CONVERTER_VERSION}\0{mode}\0{latex}".encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def convert(self, latex: str, display: bool = False) -> Optional[str]:
+        """
+        Convert a formula, using the cached result when available.
+
+        Args:
+            latex: LaTeX math content
+            display: True for block math
+
+        Returns:
+            Typst math content, or None if the formula is unsupported
+        """
+        key = self.make_key(latex, display)
+        with self._lock:
+            if key in self.entries:
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        result = convert_latex_math(latex, display)
+        with self._lock:
+            self.entries[key] = result
+            self.dirty = True
+        return result
+
+    def save(self) -> None:
+        """Write the cache file if new entries were added."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp_file = self.cache_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
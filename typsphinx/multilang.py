@@ -0,0 +1,260 @@
+"""
+Concurrent multi-language builds.
+
+This module builds one Sphinx project in several languages. Each language is
+built by its own ``sphinx-build`` process, with a bounded number of builds
+running at the same time. Every language keeps its own doctree directory
+between runs, so unchanged documents are not re-read, and all languages share
+one cache of processed images (see ``typst_image_pipeline``), so each image is
+processed only once for all languages.
+
+Usage::
+
+    python -m typsphinx.multilang source/ build/ -l en,ja -b typstpdf
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+# Environment variable pointing image pipelines of all languages to one cache
+from typsphinx.images import SHARED_CACHE_ENV
+
+logger = logging.getLogger(__name__)
+
+
+class LanguageBuild:
+    """
+    Result of building one language.
+
+    Attributes:
+        language: Language code
+        outdir: Output directory of the language
+        returncode: Exit code of sphinx-build
+        output: Combined stdout and stderr of sphinx-build
+        duration: Build time in seconds
+    """
+
+    def __init__(
+        self,
+        language: str,
+        outdir: str,
+        returncode: int,
+        output: str,
+        duration: float,
+    ):
+        self.language = language
+        self.outdir = outdir
+        self.returncode = returncode
+        self.output = output
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        """True if the build succeeded."""
+        return self.returncode == 0
+
+    @property
+    def warnings(self) -> List[str]:
+        """Warning and error lines of the build output."""
+        return [
+            line
+            for line in self.output.splitlines()
+            if "WARNING" in line or "ERROR" in line
+        ]
+
+
+def get_sphinx_command(
+    srcdir: str,
+    outdir: str,
+    doctreedir: str,
+    language: str,
+    builder: str = "html",
+    overrides: Sequence[str] = (),
+) -> List[str]:
+    """
+    Build the sphinx-build command line of one language.
+
+    Args:
+        srcdir: Documentation source directory
+        outdir: Output directory of the language
+        doctreedir: Doctree directory of the language
+        language: Language code
+        builder: Sphinx builder name
+        overrides: Additional ``name=value`` configuration overrides
+
+    Returns:
+        Command line arguments
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "sphinx",
+        "-b",
+        builder,
+        "-d",
+        doctreedir,
+        "-D",
+        f"language={language}",
+    ]
+    for override in overrides:
+        command.extend(["-D", override])
+    command.extend([srcdir, outdir])
+    return command
+
+
+def build_languages(
+    srcdir: str,
+    outdir: str,
+    languages: Sequence[str],
+    builder: str = "html",
+    jobs: Optional[int] = None,
+    doctree_root: Optional[str] = None,
+    shared_cache: Optional[str] = None,
+    overrides: Sequence[str] = (),
+) -> Dict[str, LanguageBuild]:
+    """
+    Build a project in several languages concurrently.
+
+    Each language is written to ``<outdir>/<language>`` and keeps its
+    doctrees in ``<doctree_root>/<language>`` across runs. The
+    ``SPHINX_LANGUAGE`` environment variable is set for each build, for
+    configurations that select the language themselves.
+
+    Args:
+        srcdir: Documentation source directory
+        outdir: Root output directory
+        languages: Language codes to build
+        builder: Sphinx builder name
+        jobs: Maximum number of concurrent builds (default: CPU count)
+        doctree_root: Root of the per-language doctree directories
+            (default: ``<outdir>/.doctrees``)
+        shared_cache: Directory for language-independent processed assets
+            (default: ``<outdir>/.shared``)
+        overrides: Additional ``name=value`` configuration overrides
+
+    Returns:
+        Dictionary mapping language codes to their LanguageBuild
+    """
+    srcdir = os.path.abspath(srcdir)
+    outdir = os.path.abspath(outdir)
+    doctree_root = os.path.abspath(doctree_root or os.path.join(outdir, ".doctrees"))
+    shared_cache = os.path.abspath(shared_cache or os.path.join(outdir, ".shared"))
+    os.makedirs(shared_cache, exist_ok=True)
+
+    def build(language: str) -> LanguageBuild:
+        language_outdir = os.path.join(outdir, language)
+        command = get_sphinx_command(
+            srcdir,
+            language_outdir,
+            os.path.join(doctree_root, language),
+            language,
+            builder,
+            overrides,
+        )
+        env = os.environ.copy()
+        env["SPHINX_LANGUAGE"] = language
+        env[SHARED_CACHE_ENV] = shared_cache
+
+        logger.info(f"Building {language}: {' '.join(command)}")
+        start = time.perf_counter()
+        result = subprocess.run(
+            command,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        build_result = LanguageBuild(
+            language,
+            language_outdir,
+            result.returncode,
+            result.stdout or "",
+            time.perf_counter() - start,
+        )
+        status = "done" if build_result.ok else "FAILED"
+        logger.info(f"{language}: {status} in {build_result.duration:.1f}s")
+        return build_result
+
+    max_workers = jobs or min(len(languages), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(build, languages))
+    return {result.language: result for result in results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point for multi-language builds.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m typsphinx.multilang",
+        description=(
+            "Build a Sphinx project in several languages concurrently, "
+            "reusing doctrees between runs and sharing processed images."
+        ),
+    )
+    parser.add_argument("sourcedir", help="path to documentation source files")
+    parser.add_argument("outputdir", help="root output directory (one per language)")
+    parser.add_argument(
+        "-l",
+        dest="languages",
+        required=True,
+        help="comma-separated language codes (e.g. en,ja)",
+    )
+    parser.add_argument(
+        "-b", dest="builder", default="html", help="builder name (default: html)"
+    )
+    parser.add_argument(
+        "-j",
+        dest="jobs",
+        type=int,
+        default=None,
+        help="maximum number of concurrent builds (default: CPU count)",
+    )
+    parser.add_argument(
+        "-d",
+        dest="doctree_root",
+        help="root of the doctree directories (default: OUTPUTDIR/.doctrees)",
+    )
+    parser.add_argument(
+        "-D",
+        dest="define",
+        action="append",
+        default=[],
+        metavar="setting=value",
+        help="override a setting in conf.py",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    results = build_languages(
+        args.sourcedir,
+        args.outputdir,
+        languages,
+        builder=args.builder,
+        jobs=args.jobs,
+        doctree_root=args.doctree_root,
+        overrides=args.define,
+    )
+
+    failed = [result for result in results.values() if not result.ok]
+    for result in failed:
+        print(f"Build of {result.language} failed:\n{result.output}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Peephole optimizer for generated Typst markup.
+
+This module implements optimize_tokens(), which rewrites the token stream
+the translator emits (the chunks of TypstTranslator.body) before it is
+joined into the final markup. It removes constructs that do not change the
+rendered document:
+
+- ``text("")`` for empty text nodes
+- ``strong({})`` and ``emph({})`` wrappers around empty content (e.g. the
+  wrappers of empty API signatures)
+- empty ``{ }`` scope blocks
+- runs of more than one blank line
+
+Constructs are only removed where they stand alone as a statement (separated
+from their neighbours by line breaks or block delimiters), never where they
+are a function argument or an operand of ``+``, so the generated code keeps
+its structure. Raw (code) blocks are left untouched.
+"""
+
+from typing import List, Optional, Tuple
+
+# Tokens of empty text nodes
+EMPTY_TEXT_TOKENS = {'text("")', '#text("")'}
+
+# Wrapper opening tokens and the token closing them
+WRAPPER_TOKENS = {
+    "strong({": "})",
+    "#strong({": "})",
+    "emph({": "})",
+    "#emph({": "})",
+}
+
+# Opening token of a scope block; closed by a token consisting of "}"
+BLOCK_OPEN_TOKEN = "{\n"
+
+# Raw block fence; code between fences must not be changed
+RAW_FENCE = "```"
+
+
+def _is_blank(token: str) -> bool:
+    """Check whether a token only contains whitespace."""
+    return not token.strip()
+
+
+def _raw_tokens(tokens: List[str]) -> List[bool]:
+    """
+    Find the tokens inside raw blocks.
+
+    Args:
+        tokens: Token stream
+
+    Returns:
+        For each token, whether it is (part of) a raw block
+    """
+    inside = []
+    in_raw = False
+    for token in tokens:
+        fences = token.count(RAW_FENCE)
+        inside.append(in_raw or fences > 0)
+        if fences % 2:
+            in_raw = not in_raw
+    return inside
+
+
+def _standalone(tokens: List[str], start: int, end: int) -> bool:
+    """
+    Check whether tokens[start:end + 1] form a statement of their own.
+
+    The construct must be separated from the previous and next non-blank
+    tokens by a line break, or directly follow a block opening or precede
+    a block closing.
+
+    Args:
+        tokens: Token stream
+        start: Index of the first token of the construct
+        end: Index of the last token of the construct
+
+    Returns:
+        True if the construct can be removed without joining its neighbours
+    """
+    before = start - 1
+    while before >= 0 and _is_blank(tokens[before]):
+        before -= 1
+    if before >= 0:
+        gap = "".join(tokens[before + 1 : start])
+        previous = tokens[before].rstrip(" \t")
+        if "\n" not in gap and not previous.endswith(("\n", "{", "[")):
+            return False
+
+    after = end + 1
+    while after < len(tokens) and _is_blank(tokens[after]):
+        after += 1
+    if after < len(tokens):
+        gap = "".join(tokens[end + 1 : after])
+        following = tokens[after].lstrip(" \t")
+        if "\n" not in gap and not following.startswith(("\n", "}", "]")):
+            return False
+    return True
+
+
+def _empty_construct(
+    tokens: List[str], index: int, raw: List[bool]
+) -> Optional[Tuple[int, int]]:
+    """
+    Find a removable empty construct starting at a token.
+
+    Args:
+        tokens: Token stream
+        index: Index of the candidate first token
+        raw: Result of _raw_tokens
+
+    Returns:
+        (start, end) token indices of the construct, or None
+    """
+    token = tokens[index]
+    if raw[index]:
+        return None
+
+    if token in EMPTY_TEXT_TOKENS:
+        end = index
+    elif token in WRAPPER_TOKENS or token == BLOCK_OPEN_TOKEN:
+        end = index + 1
+        while end < len(tokens) and _is_blank(tokens[end]):
+            end += 1
+        if end >= len(tokens) or raw[end]:
+            return None
+        closing = tokens[end]
+        if token in WRAPPER_TOKENS:
+            if closing != WRAPPER_TOKENS[token]:
+                return None
+        elif closing.strip() != "}":
+            return None
+    else:
+        return None
+
+    if not _standalone(tokens, index, end):
+        return None
+    return index, end
+
+
+def _remove_empty_constructs(tokens: List[str]) -> List[str]:
+    """
+    Remove empty constructs until none are left (removals can empty wrappers).
+
+    Args:
+        tokens: Token stream
+
+    Returns:
+        Token stream without empty constructs
+    """
+    while True:
+        raw = _raw_tokens(tokens)
+        result = []
+        index = 0
+        removed = False
+        while index < len(tokens):
+            construct = _empty_construct(tokens, index, raw)
+            if construct is None:
+                result.append(tokens[index])
+                index += 1
+                continue
+            start, end = construct
+            # Keep a line break of a closing token such as "}\n"
+            closing = tokens[end]
+            if end > start and closing.strip() == "}":
+                trailing = closing[closing.index("}") + 1 :]
+                if trailing:
+                    result.append(trailing)
+            index = end + 1
+            removed = True
+        tokens = result
+        if not removed:
+            return tokens
+
+
+def _collapse_blank_lines(tokens: List[str]) -> List[str]:
+    """
+    Limit runs of line breaks between tokens to one blank line.
+
+    Only tokens consisting of line breaks are shortened; raw blocks are
+    left untouched.
+
+    Args:
+        tokens: Token stream
+
+    Returns:
+        Token stream without repeated blank lines
+    """
+    raw = _raw_tokens(tokens)
+    result: List[str] = []
+    newlines = 0  # Line breaks at the end of the output so far
+    for token, in_raw in zip(tokens, raw):
+        if not in_raw and token and token.strip("\n") == "":
+            allowed = max(0, 2 - newlines)
+            token = token[:allowed]
+            if not token:
+                continue
+        result.append(token)
+        stripped = token.rstrip("\n")
+        if stripped:
+            newlines = len(token) - len(stripped)
+        else:
+            newlines += len(token)
+    return result
+
+
+def optimize_tokens(tokens: List[str]) -> List[str]:
+    """
+    Remove redundant constructs from a translator token stream.
+
+    Args:
+        tokens: Chunks of generated Typst markup, in order
+
+    Returns:
+        Optimized token stream; joining it gives markup that renders the
+        same document
+    """
+    tokens = [token for token in tokens if token]
+    tokens = _remove_empty_constructs(tokens)
+    return _collapse_blank_lines(tokens)
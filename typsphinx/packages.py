@@ -0,0 +1,270 @@
+"""
+Typst package cache management.
+
+This module vendors the Typst Universe packages required by generated
+documents into a local package cache directory, so that PDF compilation
+resolves packages without network access.
+
+The cache uses the same layout as the Typst compiler's own package cache
+(``<cache>/<namespace>/<name>/<version>/``), so the directory can be passed
+directly to ``typst.compile(package_cache_path=...)``.
+
+Usage::
+
+    python -m typsphinx.packages path/to/cache [@preview/extra:1.0.0 ...]
+"""
+
+import argparse
+import io
+import logging
+import os
+import re
+import shutil
+import sys
+import tarfile
+import tempfile
+import urllib.request
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Packages imported by every generated document (see TemplateEngine.render
+# and TypstWriter.translate)
+REQUIRED_PACKAGES = (
+    "@preview/codly:1.3.0",
+    "@preview/codly-languages:0.1.1",
+    "@preview/mitex:0.2.4",
+    "@preview/gentle-clues:1.2.0",
+)
+
+PACKAGE_REGISTRY_URL = "https://packages.typst.org"
+
+_PACKAGE_SPEC_RE = re.compile(
+    r"@(?P<namespace>[a-z0-9_-]+)/(?P<name>[A-Za-z0-9_-]+):(?P<version>\d+\.\d+\.\d+)"
+)
+
+
+def parse_package_spec(spec: str) -> Tuple[str, str, str]:
+    """
+    Parse a Typst package specification.
+
+    Args:
+        spec: Package specification (e.g., "@preview/codly:1.3.0")
+
+    Returns:
+        Tuple of (namespace, name, version)
+
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    match = _PACKAGE_SPEC_RE.fullmatch(spec.strip())
+    if not match:
+        raise ValueError(
+            f"Invalid Typst package specification: {spec!r} "
+            f"(expected '@namespace/name:version')"
+        )
+    return match.group("namespace"), match.group("name"), match.group("version")
+
+
+def find_package_specs(typst_source: str) -> List[str]:
+    """
+    Find package specifications referenced in Typst source.
+
+    Args:
+        typst_source: Typst markup (e.g., a template or package file)
+
+    Returns:
+        Unique package specifications in order of first appearance
+    """
+    specs = []
+    for match in _PACKAGE_SPEC_RE.finditer(typst_source):
+        spec = match.group(0)
+        if spec not in specs:
+            specs.append(spec)
+    return specs
+
+
+def get_package_dir(cache_dir: str, spec: str) -> str:
+    """
+    Get the directory of a package inside the cache.
+
+    Args:
+        cache_dir: Package cache root directory
+        spec: Package specification
+
+    Returns:
+        Path to ``<cache_dir>/<namespace>/<name>/<version>``
+    """
+    namespace, name, version = parse_package_spec(spec)
+    return os.path.join(cache_dir, namespace, name, version)
+
+
+def is_package_cached(cache_dir: str, spec: str) -> bool:
+    """
+    Check whether a package is present in the cache.
+
+    Args:
+        cache_dir: Package cache root directory
+        spec: Package specification
+
+    Returns:
+        True if the package manifest (typst.toml) exists in the cache
+    """
+    return os.path.isfile(os.path.join(get_package_dir(cache_dir, spec), "typst.toml"))
+
+
+def _download_package(
+    cache_dir: str, spec: str, registry_url: str = PACKAGE_REGISTRY_URL
+) -> None:
+    """
+    Download and extract a single package into the cache.
+
+    The archive is extracted into a temporary directory next to the final
+    location and renamed into place, so an interrupted download never leaves
+    a partially populated package directory behind.
+
+    Args:
+        cache_dir: Package cache root directory
+        spec: Package specification
+        registry_url: Base URL of the package registry
+    """
+    namespace, name, version = parse_package_spec(spec)
+    url = f"{registry_url}/{namespace}/{name}-{version}.tar.gz"
+    dest = get_package_dir(cache_dir, spec)
+    parent = os.path.dirname(dest)
+    os.makedirs(parent, exist_ok=True)
+
+    logger.info(f"Downloading Typst package {spec} from {url}")
+    with urllib.request.urlopen(url, timeout=60) as response:
+        data = response.read()
+
+    staging = tempfile.mkdtemp(prefix=f".{version}-", dir=parent)
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+            for member in archive.getmembers():
+                # Refuse absolute paths and parent references in archives
+                target = os.path.realpath(os.path.join(staging, member.name))
+                if not target.startswith(os.path.realpath(staging) + os.sep):
+                    raise ValueError(f"Unsafe path in package archive: {member.name}")
+            archive.extractall(staging)
+        os.replace(staging, dest)
+    finally:
+        if os.path.exists(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def _read_package_sources(package_dir: str) -> str:
+    """
+    Read all Typst sources of a package (used to discover dependencies).
+
+    Args:
+        package_dir: Package directory inside the cache
+
+    Returns:
+        Concatenated contents of all .typ files in the package
+    """
+    sources = []
+    for root, _dirs, files in os.walk(package_dir):
+        for file in files:
+            if file.endswith(".typ"):
+                try:
+                    with open(os.path.join(root, file), encoding="utf-8") as f:
+                        sources.append(f.read())
+                except (OSError, UnicodeDecodeError):
+                    continue
+    return "\n".join(sources)
+
+
+def prefetch_packages(
+    cache_dir: str,
+    specs: Iterable[str],
+    registry_url: str = PACKAGE_REGISTRY_URL,
+) -> List[str]:
+    """
+    Ensure packages and their dependencies are present in the cache.
+
+    Packages already in the cache are not downloaded again, so this is a
+    no-op for a fully vendored cache directory.
+
+    Args:
+        cache_dir: Package cache root directory
+        specs: Package specifications to fetch
+        registry_url: Base URL of the package registry
+
+    Returns:
+        Specifications that were downloaded by this call
+
+    Raises:
+        OSError: If a missing package cannot be downloaded
+        ValueError: If a specification is malformed
+    """
+    downloaded = []
+    pending = list(specs)
+    seen = set()
+
+    while pending:
+        spec = pending.pop(0)
+        if spec in seen:
+            continue
+        seen.add(spec)
+
+        if not is_package_cached(cache_dir, spec):
+            _download_package(cache_dir, spec, registry_url)
+            downloaded.append(spec)
+
+        # Packages may import other packages, which must be cached too
+        sources = _read_package_sources(get_package_dir(cache_dir, spec))
+        pending.extend(s for s in find_package_specs(sources) if s not in seen)
+
+    return downloaded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point for prefetching packages.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m typsphinx.packages",
+        description=(
+            "Download the Typst packages required by typsphinx into a local "
+            "package cache (use with typst_package_cache_path)."
+        ),
+    )
+    parser.add_argument("cache_dir", help="package cache directory to populate")
+    parser.add_argument(
+        "packages",
+        nargs="*",
+        help="additional package specifications (e.g. @preview/charged-ieee:0.1.4)",
+    )
+    parser.add_argument(
+        "--registry",
+        default=PACKAGE_REGISTRY_URL,
+        help=f"package registry URL (default: {PACKAGE_REGISTRY_URL})",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    try:
+        downloaded = prefetch_packages(
+            args.cache_dir, [*REQUIRED_PACKAGES, *args.packages], args.registry
+        )
+    except (OSError, ValueError, tarfile.TarError) as e:
+        print(f"Failed to prefetch Typst packages: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{len(downloaded)} package(s) downloaded, "
+        f"cache is up to date: {os.path.abspath(args.cache_dir)}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,8 @@ using the typst Python package (Requirement 9).
 import logging
 import os
 import tempfile
-from typing import Optional
+from functools import cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -108,13 +109,105 @@ def get_typst_version() -> str:
         return "not installed"
 
 
-def compile_typst_to_pdf(typst_content: str, root_dir: Optional[str] = None) -> bytes:
+@cache
+def _load_font_index(font_paths: Tuple[str, ...], ignore_system_fonts: bool) -> Any:
+    """
+    Scan fonts once per distinct font configuration.
+
+    Args:
+        font_paths: Additional font directories (hashable for caching)
+        ignore_system_fonts: Whether system fonts are excluded
+
+    Returns:
+        typst.Fonts index
+    """
+    import typst
+
+    logger.debug(
+        f"Scanning fonts (paths={list(font_paths)}, "
+        f"system fonts={'no' if ignore_system_fonts else 'yes'})"
+    )
+    return typst.Fonts(
+        include_system_fonts=not ignore_system_fonts,
+        include_embedded_fonts=True,
+        font_paths=list(font_paths),
+    )
+
+
+def get_font_index(
+    font_paths: Optional[Sequence[str]] = None, ignore_system_fonts: bool = False
+) -> Optional[Any]:
+    """
+    Get the font index used for compilation.
+
+    Font discovery is cached for the lifetime of the process, so multiple
+    master documents compiled in the same build share a single font scan.
+
+    Args:
+        font_paths: Additional font directories
+        ignore_system_fonts: Exclude system fonts from the index
+
+    Returns:
+        typst.Fonts index, or None if typst-py does not support font indexes
+    """
+    import typst
+
+    if not hasattr(typst, "Fonts"):
+        return None
+    return _load_font_index(tuple(font_paths or ()), ignore_system_fonts)
+
+
+def _get_compile_options(
+    package_cache_path: Optional[str],
+    font_paths: Optional[Sequence[str]],
+    ignore_system_fonts: bool,
+) -> Dict[str, Any]:
+    """
+    Build the optional keyword arguments shared by all typst-py compiles.
+
+    Args:
+        package_cache_path: Local Typst package cache directory
+        font_paths: Additional font directories
+        ignore_system_fonts: Do not use fonts installed on the system
+
+    Returns:
+        Keyword arguments for typst.compile() and typst.Compiler()
+    """
+    # Only pass optional arguments when set, for older typst-py releases
+    compile_options: Dict[str, Any] = {}
+    if package_cache_path:
+        compile_options["package_cache_path"] = package_cache_path
+
+    # Reuse the cached font index instead of rescanning fonts per compile
+    font_index = get_font_index(font_paths, ignore_system_fonts)
+    if font_index is not None:
+        compile_options["font_paths"] = font_index
+    else:
+        if font_paths:
+            compile_options["font_paths"] = list(font_paths)
+        if ignore_system_fonts:
+            compile_options["ignore_system_fonts"] = True
+
+    return compile_options
+
+
+def compile_typst_to_pdf(
+    typst_content: str,
+    root_dir: Optional[str] = None,
+    package_cache_path: Optional[str] = None,
+    font_paths: Optional[Sequence[str]] = None,
+    ignore_system_fonts: bool = False,
+) -> bytes:
     """
     Compile Typst content to PDF bytes.
 
     Args:
         typst_content: Typst markup content
         root_dir: Root directory for resolving includes and images
+        package_cache_path: Local Typst package cache directory. Packages
+            found there are used without network access.
+        font_paths: Additional font directories
+        ignore_system_fonts: Do not use fonts installed on the system
 
     Returns:
         PDF content as bytes
@@ -144,10 +237,14 @@ def compile_typst_to_pdf(typst_content: str, root_dir: Optional[str] = None) ->
             f.write(typst_content)
             temp_file = f.name
 
+        compile_options = _get_compile_options(
+            package_cache_path, font_paths, ignore_system_fonts
+        )
+
         # Compile Typst file to PDF
         # The typst.compile() function takes a file path and returns PDF bytes
         try:
-            pdf_bytes = typst.compile(temp_file, root=root_dir)
+            pdf_bytes = typst.compile(temp_file, root=root_dir, **compile_options)
             return pdf_bytes
         except Exception as typst_error:
             # Parse and wrap the error with more context
@@ -169,6 +266,126 @@ def compile_typst_to_pdf(typst_content: str, root_dir: Optional[str] = None) ->
                 pass  # Ignore cleanup errors
 
 
+def create_typst_compiler(
+    typst_file: str,
+    root_dir: Optional[str] = None,
+    package_cache_path: Optional[str] = None,
+    font_paths: Optional[Sequence[str]] = None,
+    ignore_system_fonts: bool = False,
+) -> Any:
+    """
+    Create a reusable Typst compiler for a Typst file.
+
+    The compiler keeps parsed sources, loaded packages and layout results in
+    memory and re-reads changed files on every compile, so recompiling after
+    a small edit is much faster than a cold compile_typst_to_pdf() call.
+
+    Args:
+        typst_file: Path of the Typst file to compile
+        root_dir: Root directory for resolving includes and images
+        package_cache_path: Local Typst package cache directory
+        font_paths: Additional font directories
+        ignore_system_fonts: Do not use fonts installed on the system
+
+    Returns:
+        typst.Compiler instance; call ``compile(format="pdf")`` to get PDF bytes
+
+    Raises:
+        ImportError: If typst package not available
+    """
+    check_typst_available()
+
+    import typst
+
+    compile_options = _get_compile_options(
+        package_cache_path, font_paths, ignore_system_fonts
+    )
+    return typst.Compiler(typst_file, root=root_dir, **compile_options)
+
+
+def compile_typst_document(
+    typst_content: str,
+    formats: Sequence[str] = ("pdf",),
+    root_dir: Optional[str] = None,
+    ppi: Optional[float] = None,
+    package_cache_path: Optional[str] = None,
+    font_paths: Optional[Sequence[str]] = None,
+    ignore_system_fonts: bool = False,
+) -> Dict[str, Union[bytes, List[bytes]]]:
+    """
+    Compile Typst content once and export it to several formats.
+
+    All formats are exported from a single typst.Compiler instance, so the
+    document is parsed and laid out only once; each additional format only
+    pays for its own export.
+
+    Args:
+        typst_content: Typst markup content
+        formats: Output formats ("pdf", "png" and/or "svg")
+        root_dir: Root directory for resolving includes and images
+        ppi: Pixels per inch for PNG output (typst default if None)
+        package_cache_path: Local Typst package cache directory
+        font_paths: Additional font directories
+        ignore_system_fonts: Do not use fonts installed on the system
+
+    Returns:
+        Dictionary mapping each format to its output: PDF bytes for "pdf",
+        and a list of per-page bytes for the page formats ("png", "svg")
+
+    Raises:
+        ImportError: If typst package not available
+        TypstCompilationError: If compilation fails
+    """
+    check_typst_available()
+
+    temp_file = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".typ", dir=root_dir, delete=False, encoding="utf-8"
+        ) as f:
+            f.write(typst_content)
+            temp_file = f.name
+
+        outputs: Dict[str, Union[bytes, List[bytes]]] = {}
+        try:
+            compiler = create_typst_compiler(
+                temp_file,
+                root_dir=root_dir,
+                package_cache_path=package_cache_path,
+                font_paths=font_paths,
+                ignore_system_fonts=ignore_system_fonts,
+            )
+            for output_format in formats:
+                if output_format == "pdf":
+                    outputs["pdf"] = compiler.compile(format="pdf")
+                    continue
+
+                format_options = {"ppi": ppi} if output_format == "png" and ppi else {}
+                pages = compiler.compile(format=output_format, **format_options)
+                # Single-page documents are returned as bytes, not a list
+                outputs[output_format] = (
+                    [pages] if isinstance(pages, bytes) else list(pages)
+                )
+        except Exception as typst_error:
+            error_msg = _parse_typst_error(typst_error)
+            source_loc = temp_file if temp_file else "unknown"
+
+            logger.error(f"Typst compilation failed at {source_loc}: {error_msg}")
+
+            raise TypstCompilationError(
+                message=error_msg, typst_error=typst_error, source_location=source_loc
+            ) from typst_error
+
+        return outputs
+
+    finally:
+        if temp_file and os.path.exists(temp_file):
+            try:
+                os.unlink(temp_file)
+            except Exception:
+                pass  # Ignore cleanup errors
+
+
 def _parse_typst_error(error: Exception) -> str:
     """
     Parse Typst compiler error to extract useful information.
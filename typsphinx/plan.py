@@ -0,0 +1,175 @@
+"""
+Build plan for Typst output.
+
+This module implements the BuildPlan class, which precomputes per-document
+routing decisions (master documents, output paths, relative paths) once per
+build, so the builder, writer and translator can look them up in constant
+time instead of recomputing them for every document or node.
+"""
+
+import os
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+def compute_relative_path(target: str, current_docname: Optional[str]) -> str:
+    """
+    Compute the path of a target relative to the output file of a document.
+
+    Targets (document names or image URIs) are relative to the source root;
+    the result is relative to the directory of the current document's output
+    file. Uses PurePosixPath for OS-independent POSIX path handling.
+
+    Args:
+        target: Source-root-relative target (e.g., "chapter2/doc")
+        current_docname: Current document name (e.g., "chapter1/index"), or None
+
+    Returns:
+        Relative path (e.g., "../chapter2/doc")
+
+    Notes:
+        Documents in the root directory (and calls without a current
+        document) use the target unchanged, for backward compatibility.
+    """
+    # Fallback to absolute path if current_docname is None
+    if not current_docname:
+        return target
+
+    current_dir = PurePosixPath(current_docname).parent
+    target_path = PurePosixPath(target)
+
+    # Root directory case: use absolute path (backward compatibility)
+    if current_dir == PurePosixPath("."):
+        return target
+
+    # Same directory (or subdirectory) reference
+    try:
+        return str(target_path.relative_to(current_dir))
+    except ValueError:
+        pass
+
+    # Different directory trees - build path via common parent
+    current_parts = current_dir.parts
+    target_parts = target_path.parts
+
+    common_length = 0
+    for i, (c, t) in enumerate(zip(current_parts, target_parts)):
+        if c == t:
+            common_length = i + 1
+        else:
+            break
+
+    # "../" from current to common parent, then down to the target
+    up_path = "../" * (len(current_parts) - common_length)
+    down_path = "/".join(target_parts[common_length:])
+    return up_path + down_path
+
+
+class BuildPlan:
+    """
+    Per-build routing decisions for the documents being written.
+
+    Created once in TypstBuilder.prepare_writing().
+
+    Attributes:
+        outdir: Output directory of the .typ files
+        masters: Names of the master documents (from typst_documents)
+        output_paths: Output file path of each planned document
+        directories: Output directories needed by the planned documents
+    """
+
+    def __init__(
+        self,
+        outdir: str,
+        docnames: Iterable[str],
+        masters: Iterable[str],
+        suffix: str = ".typ",
+    ):
+        """
+        Initialize BuildPlan.
+
+        Args:
+            outdir: Output directory of the .typ files
+            docnames: Documents to be written
+            masters: Master document names
+            suffix: Output file suffix
+        """
+        self.outdir = str(outdir)
+        self.suffix = suffix
+        self.masters = frozenset(masters)
+
+        self.output_paths: Dict[str, str] = {
+            docname: self._make_output_path(docname) for docname in docnames
+        }
+
+        self.directories: Set[str] = {
+            os.path.dirname(output_path) for output_path in self.output_paths.values()
+        }
+
+        # (target, current docname) -> relative path
+        self._relative_paths: Dict[Tuple[str, str], str] = {}
+
+    def _make_output_path(self, docname: str) -> str:
+        """Build the output path of a document."""
+        return os.path.join(self.outdir, docname + self.suffix)
+
+    def create_directories(self) -> None:
+        """Create all output directories needed by the planned documents."""
+        for directory in sorted(self.directories):
+            os.makedirs(directory, exist_ok=True)
+
+    def is_master(self, docname: str) -> bool:
+        """
+        Check if a document is a master document.
+
+        Args:
+            docname: Document name
+
+        Returns:
+            True if the document is defined in typst_documents
+        """
+        return docname in self.masters
+
+    def get_output_path(self, docname: str) -> str:
+        """
+        Get the output file path of a document.
+
+        Documents not in the plan get their path computed, and their output
+        directory created, on demand.
+
+        Args:
+            docname: Document name
+
+        Returns:
+            Output file path
+        """
+        output_path = self.output_paths.get(docname)
+        if output_path is None:
+            output_path = self._make_output_path(docname)
+            directory = os.path.dirname(output_path)
+            if directory not in self.directories:
+                os.makedirs(directory, exist_ok=True)
+                self.directories.add(directory)
+            self.output_paths[docname] = output_path
+        return output_path
+
+    def relative_path(self, target: str, current_docname: Optional[str]) -> str:
+        """
+        Get the path of a target relative to a document's output file.
+
+        Results are memoized per (target, document), since the same images and
+        includes are typically referenced many times.
+
+        Args:
+            target: Source-root-relative target (document name or image URI)
+            current_docname: Current document name, or None
+
+        Returns:
+            Relative path (see compute_relative_path)
+        """
+        key = (target, current_docname or "")
+        result = self._relative_paths.get(key)
+        if result is None:
+            result = compute_relative_path(target, current_docname)
+            self._relative_paths[key] = result
+        return result
@@ -0,0 +1,109 @@
+"""
+Label and include validation for Typst output.
+
+This module implements the ReferenceIndex class, which records the labels
+each document defines, the labels it links to and the documents it includes
+while it is translated. The index is kept across builds, so a PDF build can
+validate every master document before compiling it and report all broken
+references at once, instead of failing in the Typst compiler after a long
+compile.
+"""
+
+import json
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+if TYPE_CHECKING:
+    from typsphinx.translator import DocumentSummary
+
+
+class ReferenceIndex:
+    """
+    Persistent index of labels, label references and includes per document.
+
+    Attributes:
+        index_file: Path of the JSON file the index is stored in
+        documents: Document name -> {"labels", "references", "includes"}
+    """
+
+    def __init__(self, index_file: str):
+        """
+        Initialize ReferenceIndex, loading the index of a previous build.
+
+        Args:
+            index_file: Path of the JSON index file
+        """
+        self.index_file = index_file
+        self.documents: Dict[str, Dict[str, List[str]]] = {}
+        try:
+            with open(index_file, encoding="utf-8") as f:
+                self.documents = json.load(f)
+        except (OSError, ValueError):
+            self.documents = {}
+
+    def update(self, docname: str, summary: "DocumentSummary") -> None:
+        """
+        Record the labels, references and includes of a written document.
+
+        Args:
+            docname: Document name
+            summary: Summary collected while translating the document
+        """
+        self.documents[docname] = {
+            "labels": sorted(set(summary.labels)),
+            "references": sorted(set(summary.references)),
+            "includes": list(dict.fromkeys(summary.includes)),
+        }
+
+    def prune(self, docnames: Iterable[str]) -> None:
+        """
+        Drop documents that no longer exist.
+
+        Args:
+            docnames: Names of all existing documents
+        """
+        existing = set(docnames)
+        for docname in list(self.documents):
+            if docname not in existing:
+                del self.documents[docname]
+
+    def save(self) -> None:
+        """Write the index for the next build."""
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            json.dump(self.documents, f, indent=1, sort_keys=True)
+
+    def validate(self, docnames: Iterable[str], typ_outdir: str) -> List[str]:
+        """
+        Find broken label references and includes in a set of documents.
+
+        All documents compiled together (a master document and everything it
+        includes) share one label namespace, so a reference is valid if any
+        of them defines the label.
+
+        Args:
+            docnames: Documents compiled together
+            typ_outdir: Directory containing the generated .typ files
+
+        Returns:
+            Problem descriptions, one per broken reference or include
+        """
+        docnames = sorted(docnames)
+        labels = set()
+        for docname in docnames:
+            labels.update(self.documents.get(docname, {}).get("labels", ()))
+
+        problems = []
+        for docname in docnames:
+            entry = self.documents.get(docname)
+            if entry is None:
+                continue
+            for label in entry["references"]:
+                if label not in labels:
+                    problems.append(f"{docname}: link to undefined label <{label}>")
+            for target in entry["includes"]:
+                if not os.path.exists(os.path.join(typ_outdir, target + ".typ")):
+                    problems.append(
+                        f"{docname}: include of missing document {target}.typ"
+                    )
+        return problems
@@ -0,0 +1,96 @@
+"""
+Pipelined compilation of master documents.
+
+This module implements the CompileScheduler class, which lets the PDF
+builders compile a master document in the background as soon as every
+document it includes has been written, while the builder keeps writing the
+documents of other masters.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+
+
+class CompileScheduler:
+    """
+    Submit master documents for compilation once their documents are written.
+
+    Each master waits for the documents of its include closure that are
+    written in the current build; documents that are not rewritten are
+    already up to date on disk. Masters without documents to wait for are
+    left to the caller, which compiles them after writing.
+    """
+
+    def __init__(
+        self,
+        closures: Dict[str, Set[str]],
+        compile_master: Callable[[str], None],
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize CompileScheduler.
+
+        Args:
+            closures: Master document name -> documents it includes that
+                will be written in this build
+            compile_master: Function compiling one master document; called in
+                a worker thread
+            max_workers: Number of worker threads (default: executor default)
+        """
+        self.compile_master = compile_master
+        self.waiting: Dict[str, Set[str]] = {
+            master: set(docnames) for master, docnames in closures.items() if docnames
+        }
+        self.futures: Dict[str, Future] = {}
+        self.skipped: Set[str] = set()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def document_written(self, docname: str) -> List[str]:
+        """
+        Record a written document.
+
+        Args:
+            docname: Name of the written document
+
+        Returns:
+            Masters whose documents are now all written, in insertion order
+        """
+        ready = []
+        for master, waiting in self.waiting.items():
+            waiting.discard(docname)
+            if not waiting:
+                ready.append(master)
+        for master in ready:
+            del self.waiting[master]
+        return ready
+
+    def submit(self, master: str) -> None:
+        """
+        Compile a master document in the background.
+
+        Args:
+            master: Name of the master document
+        """
+        self.futures[master] = self.executor.submit(self.compile_master, master)
+
+    def skip(self, master: str) -> None:
+        """
+        Mark a ready master document as handled without compiling it.
+
+        Args:
+            master: Name of the master document
+        """
+        self.skipped.add(master)
+
+    def wait(self) -> Set[str]:
+        """
+        Wait for all submitted compilations and shut the workers down.
+
+        Returns:
+            Names of the masters that were compiled or skipped
+        """
+        self.executor.shutdown(wait=True)
+        for future in self.futures.values():
+            # compile_master reports its own errors; surface unexpected ones
+            future.result()
+        return set(self.futures) | self.skipped
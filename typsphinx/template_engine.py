@@ -12,6 +12,41 @@ from typing import Any, Dict, List, Optional
 logger = logging.getLogger(__name__)
 
 
+def get_toctree_options(toctree: Any) -> Dict[str, Any]:
+    """
+    Get template parameters from a toctree node.
+
+    Args:
+        toctree: Sphinx toctree node
+
+    Returns:
+        Dictionary with toctree_maxdepth, toctree_numbered and toctree_caption
+    """
+    # Extract options with defaults
+    # Note: Sphinx toctree numbered can be False, True, or int
+    # Convert to bool for Typst (0 means False, positive means True)
+    numbered_value = toctree.get("numbered", False)
+    if isinstance(numbered_value, int):
+        numbered_value = numbered_value > 0
+
+    # Note: Sphinx toctree maxdepth can be -1 (unlimited)
+    # Typst outline() requires positive depth or none
+    # Convert -1 to none for unlimited depth
+    maxdepth_value = toctree.get("maxdepth", 2)
+    if maxdepth_value == -1:
+        maxdepth_value = None
+
+    return {
+        "toctree_maxdepth": maxdepth_value,
+        "toctree_numbered": numbered_value,
+        "toctree_caption": toctree.get("caption", ""),
+    }
+
+
+# Template parameter passing the precomputed back-of-book index
+INDEX_PARAMETER = "index: typst_index,"
+
+
 class TemplateEngine:
     """
     Manages Typst templates for document generation.
@@ -235,35 +270,12 @@ class TemplateEngine:
         """
         from sphinx import addnodes
 
-        # Try to find toctree node in doctree
-        toctree_nodes = list(doctree.traverse(addnodes.toctree))
-
-        if not toctree_nodes:
-            # No toctree found - return empty dict
-            return {}
-
-        # Use first toctree node found
-        toctree = toctree_nodes[0]
-
-        # Extract options with defaults
-        # Note: Sphinx toctree numbered can be False, True, or int
-        # Convert to bool for Typst (0 means False, positive means True)
-        numbered_value = toctree.get("numbered", False)
-        if isinstance(numbered_value, int):
-            numbered_value = numbered_value > 0
+        # Use the first toctree node found
+        for toctree in doctree.findall(addnodes.toctree):
+            return get_toctree_options(toctree)
 
-        # Note: Sphinx toctree maxdepth can be -1 (unlimited)
-        # Typst outline() requires positive depth or none
-        # Convert -1 to none for unlimited depth
-        maxdepth_value = toctree.get("maxdepth", 2)
-        if maxdepth_value == -1:
-            maxdepth_value = None
-
-        return {
-            "toctree_maxdepth": maxdepth_value,
-            "toctree_numbered": numbered_value,
-            "toctree_caption": toctree.get("caption", ""),
-        }
+        # No toctree found - return empty dict
+        return {}
 
     def get_template_content(self) -> str:
         """
@@ -279,7 +291,11 @@ class TemplateEngine:
         return template
 
     def render(
-        self, params: Dict[str, Any], body: str, template_file: str = None
+        self,
+        params: Dict[str, Any],
+        body: str,
+        template_file: str = None,
+        index_file: Optional[str] = None,
     ) -> str:
         """
         Render final Typst document with template and body.
@@ -290,6 +306,9 @@ class TemplateEngine:
             template_file: Path to template file for import (relative to output dir).
                           If None, template is inlined (old behavior).
                           If specified, template is imported from file.
+            index_file: Path of the precomputed index file (relative to output
+                dir). If specified, its typst_index is passed to the template
+                as the ``index`` parameter.
 
         Returns:
             Complete Typst document string
@@ -328,6 +347,12 @@ class TemplateEngine:
                 output_parts.append(template)
                 output_parts.append("")  # Blank line
 
+        if index_file:
+            # Root-absolute: the compile root is the output directory, and
+            # the master document may be in a subdirectory
+            output_parts.append(f'#import "/{index_file}": typst_index')
+            output_parts.append("")  # Blank line
+
         # Generate #show statement with template function call
         template_func = self.typst_template_function_name or "project"
         output_parts.append(f"#show: {template_func}.with(")
@@ -341,6 +366,9 @@ class TemplateEngine:
         for key, value in all_params.items():
             formatted_value = self._format_typst_value(value)
             output_parts.append(f"  {key}: {formatted_value},")
+        if index_file:
+            # Precomputed index content, placed by the template
+            output_parts.append(f"  {INDEX_PARAMETER}")
 
         output_parts.append(")")
         output_parts.append("")  # Blank line
@@ -33,6 +33,7 @@
   toctree_caption: "Contents",
   papersize: "a4",
   fontsize: 11pt,
+  index: none,
   body
 ) = {
   // Document metadata
@@ -78,4 +79,10 @@
   // Document body
   // Requirement 13: body contains #include() directives from toctree
   body
+
+  // Back-of-book index precomputed by typsphinx (typst_use_index)
+  if index != none {
+    pagebreak()
+    index
+  }
 }
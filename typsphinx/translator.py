@@ -6,41 +6,151 @@ nodes to Typst markup.
 """
 
 import re
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from docutils import nodes
 from sphinx import addnodes
 from sphinx.util import logging
 from sphinx.util.docutils import SphinxTranslator
 
+from typsphinx.csv_tables import NATIVE_CSV_ATTRIBUTE
+from typsphinx.plan import BuildPlan, compute_relative_path
+from typsphinx.template_engine import get_toctree_options
+
 logger = logging.getLogger(__name__)
 
 
+class DocumentSummary:
+    """
+    Information about a document collected while it is translated.
+
+    The translator fills the summary during its single walk over the
+    doctree, so the builder and template engine can use it instead of
+    traversing the doctree again.
+
+    Attributes:
+        images: Image URIs referenced by the document, in order
+        data_files: Data files read by the generated markup (CSV files of
+            native csv-tables), relative to the source directory
+        toctree_options: Template parameters derived from the first toctree
+            (see TemplateEngine.get_toctree_options), or None without toctree
+        labels: Labels defined in the generated Typst markup
+        references: Labels linked to with link(<label>)
+        includes: Document names included with include()
+        features: Features used by the document (e.g. "math", "code",
+            "table", "image", "admonition", "toctree")
+        unknown_nodes: Number of skipped nodes per unknown node type
+        unknown_node_lines: Source lines of the first few skipped nodes per
+            unknown node type
+        optimizer_bytes: Size of the body before and after the optimizer
+            (typst_optimize_output), or None if it did not run
+    """
+
+    # Number of sample source lines kept per unknown node type
+    MAX_UNKNOWN_NODE_SAMPLES = 3
+
+    def __init__(self) -> None:
+        """Initialize an empty summary."""
+        self.images: List[str] = []
+        self.data_files: List[str] = []
+        self.toctree_options: Optional[Dict[str, Any]] = None
+        self.labels: List[str] = []
+        self.references: List[str] = []
+        self.includes: List[str] = []
+        self.features: Set[str] = set()
+        self.unknown_nodes: Dict[str, int] = {}
+        self.unknown_node_lines: Dict[str, List[int]] = {}
+        self.optimizer_bytes: Optional[Tuple[int, int]] = None
+
+    def merge(self, other: "DocumentSummary") -> None:
+        """
+        Add the information collected for a part of the same document.
+
+        Args:
+            other: Summary of the part
+        """
+        self.images.extend(other.images)
+        self.data_files.extend(other.data_files)
+        if self.toctree_options is None:
+            self.toctree_options = other.toctree_options
+        self.labels.extend(other.labels)
+        self.references.extend(other.references)
+        self.includes.extend(other.includes)
+        self.features |= other.features
+        for node_type, count in other.unknown_nodes.items():
+            self.unknown_nodes[node_type] = self.unknown_nodes.get(node_type, 0) + count
+            lines = self.unknown_node_lines.setdefault(node_type, [])
+            for line in other.unknown_node_lines.get(node_type, []):
+                if len(lines) < self.MAX_UNKNOWN_NODE_SAMPLES:
+                    lines.append(line)
+        if other.optimizer_bytes is not None:
+            before, after = self.optimizer_bytes or (0, 0)
+            self.optimizer_bytes = (
+                before + other.optimizer_bytes[0],
+                after + other.optimizer_bytes[1],
+            )
+
+    def record_unknown_node(self, node_type: str, line: Optional[int]) -> None:
+        """
+        Count a node the translator has no handler for.
+
+        Args:
+            node_type: Node class name
+            line: Source line of the node, if known
+        """
+        self.unknown_nodes[node_type] = self.unknown_nodes.get(node_type, 0) + 1
+        lines = self.unknown_node_lines.setdefault(node_type, [])
+        if line is not None and len(lines) < self.MAX_UNKNOWN_NODE_SAMPLES:
+            lines.append(line)
+
+
+# codly settings a document can rely on without emitting them: the line
+# number start is only changed for blocks with :lineno-start:, while the
+# number format depends on earlier documents and is set by the first block
+CODLY_DEFAULT_STATE = {"start": "1"}
+
+# codly's default line number format, restored for :linenos: blocks
+CODLY_NUMBER_FORMAT = 'numbering.with("1")'
+
+
 class TypstTranslator(SphinxTranslator):
     """
     Translator class that converts docutils nodes to Typst markup.
 
     This translator visits nodes in the document tree and generates
-    corresponding Typst markup.
+    corresponding Typst markup. It only reads from the builder (config,
+    build plan, caches); everything it collects is stored in its summary,
+    so documents can be translated concurrently.
     """
 
-    def __init__(self, document: nodes.document, builder: Any) -> None:
+    def __init__(
+        self, document: nodes.document, builder: Any, docname: Optional[str] = None
+    ) -> None:
         """
         Initialize the translator.
 
         Args:
             document: The docutils document to translate
             builder: The Sphinx builder instance
+            docname: Name of the document (default: the builder's
+                current_docname)
         """
         super().__init__(document, builder)
         self.builder = builder
+        self._docname = docname
         self.body = []
 
+        # Per-document information collected during translation
+        self.summary = DocumentSummary()
+
         # State management variables
         self.section_level = 0
         self.in_figure = False
         self.in_table = False
         self.in_thead = False  # Track if currently in table header
+        self.table_row = -1  # Index of the current table row
+        self._native_csv: Optional[Dict[str, Any]] = None  # csv() table options
+        self._native_csv_rows = 0  # Header rows of the csv() table seen so far
         self.in_caption = False
         self.list_stack = []  # Track list nesting: 'bullet' or 'enumerated'
 
@@ -58,6 +168,15 @@ class TypstTranslator(SphinxTranslator):
         self.paragraph_has_content = False  # Track if paragraph has any content nodes
         self.in_list_item = False  # Track if currently in a list item
         self.in_literal_block = False  # Track if currently in a code block
+        self.literal_block_fast_path = False  # Code block skips codly
+        # codly settings in effect at this point of the output (see
+        # _codly_calls); number-format is unknown until the first block
+        self._codly_state: Dict[str, str] = dict(CODLY_DEFAULT_STATE)
+        self._literal_block_wrapped = False  # Code block wrapped in { }
+        self._index_anchors: Set[str] = set()  # Index targets with an anchor
+        # Sections written to separate part files (see TypstWriter), by node
+        # id, with the part file name relative to the document's directory
+        self.part_includes: Dict[int, str] = {}
 
         # Stream-based list rendering state (Issue #61)
         self.is_first_list_item = True  # Track if current item is first in list
@@ -99,6 +218,18 @@ class TypstTranslator(SphinxTranslator):
         """
         return "".join(self.body)
 
+    @property
+    def docname(self) -> Optional[str]:
+        """
+        Name of the document being translated.
+
+        Falls back to the builder's current_docname when the translator
+        was created without a document name.
+        """
+        if self._docname is not None:
+            return self._docname
+        return getattr(self.builder, "current_docname", None)
+
     def add_text(self, text: str) -> None:
         """
         Add text to the output body or table cell content.
@@ -158,6 +289,11 @@ class TypstTranslator(SphinxTranslator):
         Args:
             node: The section node
         """
+        part = self.part_includes.get(id(node))
+        if part is not None:
+            self._include_part(part)
+            raise nodes.SkipNode
+
         # Increment section level
         self.section_level += 1
 
@@ -173,6 +309,30 @@ class TypstTranslator(SphinxTranslator):
         # Add a newline after sections
         self.add_text("\n")
 
+    def _restore_codly_defaults(self) -> None:
+        """
+        Restore the default codly settings before including other files.
+
+        Included documents and parts are translated assuming the default
+        codly settings, so settings changed before the include are restored.
+        """
+        for name, value in CODLY_DEFAULT_STATE.items():
+            if self._codly_state.get(name) != value:
+                self.add_text(f"codly({name}: {value})\n")
+
+    def _include_part(self, part: str) -> None:
+        """
+        Include a section that was translated into a separate part file.
+
+        Args:
+            part: Part file name without .typ, relative to the document
+        """
+        self._restore_codly_defaults()
+        self.add_text(f'include("{part}.typ")\n\n')
+        # The part leaves its own codly settings in effect, which are unknown
+        # here, so the next code block emits all of its settings
+        self._codly_state = {}
+
     def visit_title(self, node: nodes.title) -> None:
         """
         Visit a title node.
@@ -896,9 +1056,14 @@ class TypstTranslator(SphinxTranslator):
         if self.in_list_item and self.list_item_needs_separator:
             self.add_text("\n")
 
+        self.summary.features.add("code")
+
         # Mark that we're in a literal block (disable text() wrapping)
         self.in_literal_block = True
 
+        # Very long listings skip codly's per-line decorations
+        self.literal_block_fast_path = self._use_fast_code_block(node)
+
         # Issue #20: Handle captioned code blocks
         # If we're in a captioned code block (literal-block-wrapper container),
         # wrap the code block in figure() (no # prefix in code mode)
@@ -909,44 +1074,131 @@ class TypstTranslator(SphinxTranslator):
             # No # prefix in code mode
             self.add_text(f"figure(caption: [{escaped_caption}])[\n")
 
-        # If in list item, wrap codly() calls and code block in { } to make it an expression
-        if self.in_list_item:
+        calls = [] if self.literal_block_fast_path else self._codly_calls(node)
+
+        # If in list item, wrap codly() calls and code block in { } to make it
+        # an expression; a code block without calls is an expression already
+        self._literal_block_wrapped = self.in_list_item and (
+            self.literal_block_fast_path or bool(calls)
+        )
+        if self._literal_block_wrapped:
             self.add_text("{\n")
 
+        if self.literal_block_fast_path:
+            self._emit_fast_code_block(node)
+            raise nodes.SkipChildren
+
+        prefix = self._code_block_call_prefix()
+        for call in calls:
+            self.add_text(f"{prefix}{call}\n")
+
+        # Typst code block syntax: ```language\ncode\n```
+        # Extract language if specified
+        language = node.get("language", "")
+        if language:
+            self.add_text(f"```{language}\n")
+        else:
+            self.add_text("```\n")
+
+    def _code_block_call_prefix(self) -> str:
+        """
+        Get the prefix of function calls emitted inside a code block.
+
+        The figure body of a captioned code block is markup and needs the
+        # prefix; no # prefix in code mode.
+
+        Returns:
+            "#" inside a captioned code block, otherwise an empty string
+        """
+        return "#" if self.in_captioned_code_block and self.code_block_caption else ""
+
+    def _codly_calls(self, node: nodes.literal_block) -> List[str]:
+        """
+        Get the codly calls needed before a code block.
+
+        codly settings are document state: they stay in effect for all
+        following code blocks. Settings are only emitted when the block needs
+        a value different from the one in effect, so pages with many
+        snippets set them once instead of before every block.
+
+        Args:
+            node: The literal block node
+
+        Returns:
+            codly calls (without # prefix) to emit before the block
+        """
         # Check for :linenos: option (Issue #20)
-        # If linenos is not set or False, disable line numbers in codly
+        # Without it, line numbers are disabled in codly
         linenos = node.get("linenos", False)
-        if not linenos:
-            # No # prefix in code mode
-            self.add_text("codly(number-format: none)\n")
 
         # Extract highlight_args if present (Task 4.2.2)
         highlight_args = node.get("highlight_args", {})
         hl_lines = highlight_args.get("hl_lines", [])
 
-        # Issue #31: Support :lineno-start: option
-        # Sphinx stores lineno-start in highlight_args['linenostart']
-        lineno_start = highlight_args.get("linenostart")
-        if linenos and lineno_start is not None:
-            # No # prefix in code mode
-            self.add_text(f"codly(start: {lineno_start})\n")
-
-        # Generate codly-range() if highlight lines are specified
+        settings = {"number-format": CODLY_NUMBER_FORMAT if linenos else "none"}
+        if linenos:
+            # Issue #31: Support :lineno-start: option
+            # Sphinx stores lineno-start in highlight_args['linenostart']
+            lineno_start = highlight_args.get("linenostart")
+            settings["start"] = str(lineno_start) if lineno_start is not None else "1"
+
+        calls = []
+        for name, value in settings.items():
+            if self._codly_state.get(name) != value:
+                self._codly_state[name] = value
+                calls.append(f"codly({name}: {value})")
+
+        # Generate codly-range() if highlight lines are specified; it applies
+        # to the next code block only
         if hl_lines:
             # Convert list of line numbers to Typst array format
             # Example: [2, 3] -> codly-range(highlight: (2, 3))
             # Example: [2, 4, 5, 6] -> codly-range(highlight: (2, 4, 5, 6))
             highlight_str = ", ".join(str(line) for line in hl_lines)
-            # No # prefix in code mode
-            self.add_text(f"codly-range(highlight: ({highlight_str}))\n")
+            calls.append(f"codly-range(highlight: ({highlight_str}))")
+        return calls
 
-        # Typst code block syntax: ```language\ncode\n```
-        # Extract language if specified
+    def _use_fast_code_block(self, node: nodes.literal_block) -> bool:
+        """
+        Check if a code block should use the lightweight rendering path.
+
+        Args:
+            node: The literal block node
+
+        Returns:
+            True if the block has more lines than
+            typst_code_block_fast_threshold
+        """
+        threshold = getattr(
+            self.builder.config, "typst_code_block_fast_threshold", None
+        )
+        if not threshold:
+            return False
+        return node.astext().count("\n") + 1 > threshold
+
+    def _emit_fast_code_block(self, node: nodes.literal_block) -> None:
+        """
+        Emit a long code block without codly line decorations.
+
+        codly lays out every line individually (numbers, highlights, zebra
+        stripes), which dominates compile time for listings with thousands
+        of lines. The block is emitted as plain raw blocks with codly
+        disabled, split into chunks of typst_code_block_chunk_lines lines so
+        each raw block stays small.
+
+        Args:
+            node: The literal block node
+        """
         language = node.get("language", "")
-        if language:
-            self.add_text(f"```{language}\n")
-        else:
-            self.add_text("```\n")
+        lines = node.astext().split("\n")
+        chunk_lines = getattr(self.builder.config, "typst_code_block_chunk_lines", None)
+        if not chunk_lines or chunk_lines <= 0:
+            chunk_lines = len(lines)
+
+        self.add_text(f"{self._code_block_call_prefix()}codly-disable()\n")
+        for start in range(0, len(lines), chunk_lines):
+            chunk = "\n".join(lines[start : start + chunk_lines])
+            self.add_text(f"```{language}\n{chunk}\n```\n")
 
     def depart_literal_block(self, node: nodes.literal_block) -> None:
         """
@@ -960,11 +1212,17 @@ class TypstTranslator(SphinxTranslator):
         # Clear literal block flag
         self.in_literal_block = False
 
-        # Close code block
-        self.add_text("\n```\n")
+        if self.literal_block_fast_path:
+            # Raw blocks were closed in visit; restore codly for later blocks
+            self.literal_block_fast_path = False
+            self.add_text(f"{self._code_block_call_prefix()}codly-enable()\n")
+        else:
+            # Close code block
+            self.add_text("\n```\n")
 
         # Close the { } wrapper if we're in a list item
-        if self.in_list_item:
+        if self._literal_block_wrapped:
+            self._literal_block_wrapped = False
             self.add_text("}")
 
         # Issue #20: Close figure wrapper if we're in a captioned code block
@@ -973,11 +1231,13 @@ class TypstTranslator(SphinxTranslator):
             self.add_text("]")
             # Add label if present
             if self.code_block_label:
+                self.summary.labels.append(self.code_block_label)
                 self.add_text(f" <{self.code_block_label}>")
             self.add_text("\n\n")
         elif node.get("names"):
             # Handle :name: option without :caption: - just add label after code block
             label = node.get("names")[0]
+            self.summary.labels.append(label)
             self.add_text(f" <{label}>\n\n")
         else:
             # Normal code block - just add spacing
@@ -1151,6 +1411,7 @@ class TypstTranslator(SphinxTranslator):
         # Add label if figure has ids
         if node.get("ids"):
             label = node["ids"][0]
+            self.summary.labels.append(label)
             self.add_text(f"\n) <{label}>\n\n")
         else:
             self.add_text("\n)\n\n")
@@ -1194,9 +1455,19 @@ class TypstTranslator(SphinxTranslator):
         Args:
             node: The table node
         """
+        self.summary.features.add("table")
         self.in_table = True
         self.table_cells = []  # Store cells for table generation
         self.table_colcount = 0  # Track number of columns
+        self.table_row = -1
+
+        # File-backed csv-table: emit csv() instead of the cells of the file
+        self._native_csv = None
+        self._native_csv_rows = 0
+        options = node.get(NATIVE_CSV_ATTRIBUTE)
+        if options and getattr(self.builder.config, "typst_native_csv_tables", False):
+            self._native_csv = options
+            self.summary.data_files.append(options["file"])
 
     def _format_table_cell(self, cell: dict, indent: str = "  ") -> str:
         """
@@ -1234,33 +1505,120 @@ class TypstTranslator(SphinxTranslator):
         Args:
             node: The table node
         """
+        if self._native_csv is not None and self.table_colcount > 0:
+            self._depart_native_csv_table()
         # Generate Typst table() syntax (no # prefix in unified code mode)
-        if self.table_colcount > 0:
-            # Use self.body.append directly to avoid routing to table_cell_content
-            self.body.append(f"table(\n  columns: {self.table_colcount},\n")
-
+        elif self.table_colcount > 0:
             # Separate header cells from body cells
             header_cells = [cell for cell in self.table_cells if cell.get("is_header")]
             body_cells = [
                 cell for cell in self.table_cells if not cell.get("is_header")
             ]
 
-            # Add header cells with table.header() wrapper
-            if header_cells:
-                self.body.append("  table.header(\n")
-                for cell in header_cells:
-                    self.body.append(self._format_table_cell(cell, indent="    "))
-                self.body.append("  ),\n")
+            # Long tables are split into chunks that repeat the header
+            for chunk in self._split_table_rows(body_cells):
+                # Use self.body.append directly to avoid routing to
+                # table_cell_content
+                self.body.append(f"table(\n  columns: {self.table_colcount},\n")
+
+                # Add header cells with table.header() wrapper
+                if header_cells:
+                    self.body.append("  table.header(\n")
+                    for cell in header_cells:
+                        self.body.append(self._format_table_cell(cell, indent="    "))
+                    self.body.append("  ),\n")
 
-            # Add body cells
-            for cell in body_cells:
-                self.body.append(self._format_table_cell(cell, indent="  "))
+                # Add body cells
+                for cell in chunk:
+                    self.body.append(self._format_table_cell(cell, indent="  "))
 
-            self.body.append(")\n\n")
+                self.body.append(")\n\n")
 
         self.in_table = False
         self.table_cells = []
         self.table_colcount = 0
+        self._native_csv = None
+
+    def _split_table_rows(self, cells: List[dict]) -> List[List[dict]]:
+        """
+        Split the body cells of a long table into chunks of rows.
+
+        Tables with more body rows than typst_table_chunk_rows are split into
+        chunks of that many rows. A chunk only ends after a row no rowspan
+        extends past, so it can be a little longer.
+
+        Args:
+            cells: Body cells with their "row" index, in order
+
+        Returns:
+            Cells of each chunk (a single chunk if the table is not split)
+        """
+        chunk_rows = getattr(self.builder.config, "typst_table_chunk_rows", None)
+        row_count = len({cell.get("row") for cell in cells})
+        if not chunk_rows or row_count <= chunk_rows:
+            return [cells]
+
+        chunks: List[List[dict]] = [[]]
+        rows_in_chunk = 0
+        last_spanned_row = -1  # Last row covered by a rowspan so far
+        previous_row = None
+        for cell in cells:
+            row = cell.get("row")
+            if row != previous_row:
+                # A new row starts; end the chunk before it if possible
+                if rows_in_chunk >= chunk_rows and last_spanned_row < row:
+                    chunks.append([])
+                    rows_in_chunk = 0
+                rows_in_chunk += 1
+                previous_row = row
+            chunks[-1].append(cell)
+            last_spanned_row = max(last_spanned_row, row + cell.get("rowspan", 1) - 1)
+        return chunks
+
+    def _depart_native_csv_table(self) -> None:
+        """
+        Generate a table whose data is read from a CSV file with csv().
+
+        Header cells given by the :header: option are translated as usual;
+        header rows and body rows of the file are spread into the table.
+        """
+        options = self._native_csv
+        data_file = self._relative_path(options["file"], self.docname)
+
+        arguments = f'"{data_file}"'
+        if options["delimiter"] != ",":
+            arguments += f', delimiter: "{options["delimiter"]}"'
+        rows = f"csv({arguments})"
+        if options["trim"]:
+            rows += ".map(row => row.map(cell => cell.trim(at: start)))"
+
+        header_rows = options["header_rows"]
+        body_rows = f"rows.slice({header_rows})"
+        indent = "  "
+        self.body.append(f"{{\n  let rows = {rows}\n")
+        # Long tables are split into chunks that repeat the header
+        chunk_rows = getattr(self.builder.config, "typst_table_chunk_rows", None)
+        if chunk_rows:
+            self.body.append(f"  for chunk in {body_rows}.chunks({chunk_rows}) {{\n")
+            body_rows = "chunk"
+            indent = "    "
+
+        self.body.append(f"{indent}table(\n{indent}  columns: {self.table_colcount},\n")
+        header_cells = [cell for cell in self.table_cells if cell.get("is_header")]
+        if header_cells or header_rows:
+            self.body.append(f"{indent}  table.header(\n")
+            for cell in header_cells:
+                self.body.append(self._format_table_cell(cell, indent=f"{indent}    "))
+            if header_rows:
+                self.body.append(
+                    f"{indent}    ..rows.slice(0, {header_rows}).flatten(),\n"
+                )
+            self.body.append(f"{indent}  ),\n")
+        self.body.append(f"{indent}  ..{body_rows}.flatten(),\n")
+        self.body.append(f"{indent})\n")
+        if chunk_rows:
+            self.body.append("  }\n")
+        self.body.append("}\n\n")
 
     def visit_tgroup(self, node: nodes.tgroup) -> None:
         """
@@ -1309,6 +1667,7 @@ class TypstTranslator(SphinxTranslator):
         """
         # Mark that we're in the header section
         self.in_thead = True
+        self._native_csv_rows = 0
 
     def depart_thead(self, node: nodes.thead) -> None:
         """
@@ -1327,7 +1686,9 @@ class TypstTranslator(SphinxTranslator):
         Args:
             node: The tbody node
         """
-        pass
+        # The body rows of csv() tables are read from the file
+        if self._native_csv is not None:
+            raise nodes.SkipNode
 
     def depart_tbody(self, node: nodes.tbody) -> None:
         """
@@ -1346,7 +1707,12 @@ class TypstTranslator(SphinxTranslator):
             node: The row node
         """
         # Rows are processed by collecting entries
-        pass
+        self.table_row += 1
+        if self._native_csv is not None and self.in_thead:
+            # Header rows after those of the :header: option come from the file
+            if self._native_csv_rows >= self._native_csv["header_option_rows"]:
+                raise nodes.SkipNode
+            self._native_csv_rows += 1
 
     def depart_row(self, node: nodes.row) -> None:
         """
@@ -1402,6 +1768,7 @@ class TypstTranslator(SphinxTranslator):
                 "is_header": self.in_thead,
                 "colspan": colspan,
                 "rowspan": rowspan,
+                "row": self.table_row,
             }
         )
         self.table_cell_content = []
@@ -1471,11 +1838,19 @@ class TypstTranslator(SphinxTranslator):
         """
         uri = node.get("uri", "")
 
-        # Get current document name for path adjustment (Issue #69)
-        current_docname = getattr(self.builder, "current_docname", None)
+        self.summary.features.add("image")
+        if uri:
+            self.summary.images.append(uri)
+
+            # The builder copies the images of the summary; with the image
+            # pipeline enabled it resolves the processed output path
+            resolve_image = getattr(self.builder, "resolve_image", None)
+            output = resolve_image(uri) if callable(resolve_image) else None
+            if isinstance(output, str) and output:
+                uri = output
 
         # Adjust path based on output file location (Issue #69)
-        adjusted_uri = self._compute_relative_image_path(uri, current_docname)
+        adjusted_uri = self._compute_relative_image_path(uri, self.docname)
 
         # Add proper indentation if inside a figure
         if self.in_figure:
@@ -1523,6 +1898,7 @@ class TypstTranslator(SphinxTranslator):
             # Output label in markup mode (with # prefix in markup mode)
             if node.get("ids"):
                 label_id = node["ids"][0]
+                self.summary.labels.append(label_id)
                 self.add_text(f'\n#label("{label_id}")')
             # Close the markup block
             self.add_text("]")
@@ -1544,7 +1920,14 @@ class TypstTranslator(SphinxTranslator):
         # In unified code mode, use label() function instead of <label> syntax
         if node.get("ids"):
             label_id = node["ids"][0]
-            self.add_text(f'label("{label_id}")')
+            self.summary.labels.append(label_id)
+            if self.in_paragraph:
+                # A label cannot be joined with paragraph content; attach it
+                # to an empty metadata element instead (e.g. :index: targets)
+                self._add_paragraph_separator()
+                self.add_text(f'[#metadata(none)#label("{label_id}")]\n')
+            else:
+                self.add_text(f'label("{label_id}")')
 
         # Mark that next element in list item needs separator
         if self.in_list_item:
@@ -1581,6 +1964,7 @@ class TypstTranslator(SphinxTranslator):
             # Generate a link to the target
             # Sanitize the target for Typst label format
             label = reftarget.replace(".", "-").replace("_", "-")
+            self.summary.references.append(label)
             self.add_text(f"#link(<{label}>)[")
         # Continue processing children to get the link text
 
@@ -1595,6 +1979,24 @@ class TypstTranslator(SphinxTranslator):
         if reftarget:
             self.add_text("]")
 
+    def _relative_path(self, target: str, current_docname: Optional[str]) -> str:
+        """
+        Compute a source-root-relative target path relative to the output file.
+
+        Uses the builder's memoized build plan when available.
+
+        Args:
+            target: Target document name or image URI
+            current_docname: Current document name, or None
+
+        Returns:
+            Relative path string
+        """
+        plan = getattr(self.builder, "build_plan", None)
+        if isinstance(plan, BuildPlan):
+            return plan.relative_path(target, current_docname)
+        return compute_relative_path(target, current_docname)
+
     def _compute_relative_include_path(
         self, target_docname: str, current_docname: Optional[str]
     ) -> str:
@@ -1629,82 +2031,7 @@ class TypstTranslator(SphinxTranslator):
 
         Requirements: 1.1, 1.2, 1.3, 1.4, 1.5
         """
-        from pathlib import PurePosixPath
-
-        logger.debug(
-            f"Computing relative include path: target={target_docname}, "
-            f"current={current_docname}"
-        )
-
-        # Fallback to absolute path if current_docname is None
-        if not current_docname:
-            logger.debug(f"No current document, using absolute path: {target_docname}")
-            return target_docname
-
-        current_path = PurePosixPath(current_docname)
-        target_path = PurePosixPath(target_docname)
-        current_dir = current_path.parent
-
-        logger.debug(
-            f"Path components: current_dir={current_dir}, " f"target_path={target_path}"
-        )
-
-        # Root directory case: use absolute path (backward compatibility)
-        if current_dir == PurePosixPath("."):
-            logger.debug(
-                f"Current document is in root directory, "
-                f"using absolute path: {target_docname}"
-            )
-            return target_docname
-
-        # Try to compute relative path
-        try:
-            rel_path = target_path.relative_to(current_dir)
-            result = str(rel_path)
-            logger.debug(
-                f"Same directory reference: {current_dir} -> {target_path}, "
-                f"result: {result}"
-            )
-            return result
-        except ValueError:
-            # Different directory trees - build path via common parent
-            logger.debug(
-                "Cross-directory reference detected, calculating via common parent"
-            )
-
-            current_parts = current_dir.parts
-            target_parts = target_path.parts
-
-            # Find common parent by comparing path components
-            common_length = 0
-            for i, (c, t) in enumerate(zip(current_parts, target_parts)):
-                if c == t:
-                    common_length = i + 1
-                else:
-                    break
-
-            logger.debug(
-                f"Common parent depth: {common_length}, "
-                f"current_parts={current_parts}, target_parts={target_parts}"
-            )
-
-            # Build path: "../" from current to common parent
-            up_count = len(current_parts) - common_length
-            up_path = "../" * up_count if up_count > 0 else ""
-
-            # Build path: from common parent to target
-            down_parts = target_parts[common_length:]
-            down_path = "/".join(down_parts) if down_parts else ""
-
-            relative_path: str = up_path + down_path
-
-            logger.debug(
-                f"Cross-directory path calculation: up_count={up_count}, "
-                f"up_path='{up_path}', down_path='{down_path}', "
-                f"result: {relative_path}"
-            )
-
-            return relative_path
+        return self._relative_path(target_docname, current_docname)
 
     def _compute_relative_image_path(
         self, image_uri: str, current_docname: Optional[str]
@@ -1734,82 +2061,7 @@ class TypstTranslator(SphinxTranslator):
             This implements Issue #69 fix for nested document image paths.
             Uses the same logic as _compute_relative_include_path() from Issue #5.
         """
-        from pathlib import PurePosixPath
-
-        logger.debug(
-            f"Computing relative image path: uri={image_uri}, "
-            f"current={current_docname}"
-        )
-
-        # Fallback to absolute path if current_docname is None
-        if not current_docname:
-            logger.debug(f"No current document, using absolute path: {image_uri}")
-            return image_uri
-
-        current_path = PurePosixPath(current_docname)
-        image_path = PurePosixPath(image_uri)
-        current_dir = current_path.parent
-
-        logger.debug(
-            f"Path components: current_dir={current_dir}, image_path={image_path}"
-        )
-
-        # Root directory case: use absolute path (backward compatibility)
-        if current_dir == PurePosixPath("."):
-            logger.debug(
-                f"Current document is in root directory, "
-                f"using absolute path: {image_uri}"
-            )
-            return image_uri
-
-        # Try to compute relative path
-        try:
-            rel_path = image_path.relative_to(current_dir)
-            result = str(rel_path)
-            logger.debug(
-                f"Same directory reference: {current_dir} -> {image_path}, "
-                f"result: {result}"
-            )
-            return result
-        except ValueError:
-            # Different directory trees - build path via common parent
-            logger.debug(
-                "Cross-directory reference detected, calculating via common parent"
-            )
-
-            current_parts = current_dir.parts
-            image_parts = image_path.parts
-
-            # Find common parent by comparing path components
-            common_length = 0
-            for i, (c, img) in enumerate(zip(current_parts, image_parts)):
-                if c == img:
-                    common_length = i + 1
-                else:
-                    break
-
-            logger.debug(
-                f"Common parent depth: {common_length}, "
-                f"current_parts={current_parts}, image_parts={image_parts}"
-            )
-
-            # Build path: "../" from current to common parent
-            up_count = len(current_parts) - common_length
-            up_path = "../" * up_count if up_count > 0 else ""
-
-            # Build path: from common parent to image
-            down_parts = image_parts[common_length:]
-            down_path = "/".join(down_parts) if down_parts else ""
-
-            relative_path: str = up_path + down_path
-
-            logger.debug(
-                f"Cross-directory path calculation: up_count={up_count}, "
-                f"up_path='{up_path}', down_path='{down_path}', "
-                f"result: {relative_path}"
-            )
-
-            return relative_path
+        return self._relative_path(image_uri, current_docname)
 
     def visit_toctree(self, node: nodes.Node) -> None:
         """
@@ -1833,6 +2085,11 @@ class TypstTranslator(SphinxTranslator):
             displaying the block delimiters in the output. This simplifies the
             generated Typst code and improves readability.
         """
+        # The first toctree provides the template's outline options
+        self.summary.features.add("toctree")
+        if self.summary.toctree_options is None:
+            self.summary.toctree_options = get_toctree_options(node)
+
         # Get entries from the toctree node
         entries = node.get("entries", [])
 
@@ -1844,13 +2101,15 @@ class TypstTranslator(SphinxTranslator):
             raise nodes.SkipNode
 
         # Get current document name for relative path calculation
-        current_docname = getattr(self.builder, "current_docname", None)
+        current_docname = self.docname
 
         logger.debug(
             f"Current document for toctree: {current_docname}, "
             f"entries: {[docname for _, docname in entries]}"
         )
 
+        self._restore_codly_defaults()
+
         # Generate scope block for all includes (unified code mode)
         # Use {...} scope block to isolate set rules while maintaining code mode
         # Start scope block (no # prefix in code mode)
@@ -1870,11 +2129,16 @@ class TypstTranslator(SphinxTranslator):
             )
 
             # Generate include() within the block (no # prefix in code mode)
+            self.summary.includes.append(docname)
             self.add_text(f'  include("{relative_path}.typ")\n')
 
         # End scope block
         self.add_text("}\n\n")
 
+        # Included documents leave their own codly settings in effect, which
+        # are unknown here, so the next code block emits all of its settings
+        self._codly_state = {}
+
         # Skip processing children as we've handled the toctree entries
         raise nodes.SkipNode
 
@@ -1950,6 +2214,7 @@ class TypstTranslator(SphinxTranslator):
         if refuri.startswith("#"):
             # Internal reference to a label
             label = refuri[1:]  # Remove the #
+            self.summary.references.append(label)
             self.add_text(f"{prefix}link(<{label}>, ")
         else:
             # External reference (HTTP/HTTPS URL or relative path)
@@ -2000,14 +2265,17 @@ class TypstTranslator(SphinxTranslator):
         """
         Handle unknown nodes during visit.
 
+        Unknown nodes are counted in the document summary rather than
+        reported one by one (see TypstBuilder.report_unknown_nodes).
+
         Args:
             node: The unknown node
         """
-        # Log a warning for unknown nodes but don't raise an exception
-        from sphinx.util import logging
-
-        logger = logging.getLogger(__name__)
-        logger.warning(f"unknown node type: {node}")
+        # Count unknown nodes instead of warning about each one; the builder
+        # reports all of them once at the end of the build
+        node_type = node.__class__.__name__
+        self.summary.record_unknown_node(node_type, getattr(node, "line", None))
+        logger.debug(f"unknown node type: {node_type}")
 
     def unknown_departure(self, node: nodes.Node) -> None:
         """
@@ -2132,6 +2400,26 @@ class TypstTranslator(SphinxTranslator):
 
         return result
 
+    def _precompile_math(self, latex_content: str, display: bool) -> Optional[str]:
+        """
+        Convert LaTeX math to native Typst ahead of time, if enabled.
+
+        Used when typst_math_precompile is enabled, so supported formulas do
+        not need mitex at compile time. Results come from the builder's
+        persistent math cache.
+
+        Args:
+            latex_content: LaTeX math content
+            display: True for block math
+
+        Returns:
+            Typst math content, or None to fall back to mitex
+        """
+        math_cache = getattr(self.builder, "math_cache", None)
+        if math_cache is None:
+            return None
+        return math_cache.convert(latex_content, display)
+
     def visit_math(self, node: nodes.math) -> None:
         """
         Visit an inline math node.
@@ -2149,6 +2437,8 @@ class TypstTranslator(SphinxTranslator):
         Args:
             node: The inline math node
         """
+        self.summary.features.add("math")
+
         # Add separator if in paragraph and not first node
         self._add_paragraph_separator()
 
@@ -2169,12 +2459,17 @@ class TypstTranslator(SphinxTranslator):
                 math_content = self._convert_latex_to_typst(math_content)
             self.add_text(f"${math_content}$")
         else:
-            # Requirement 4.3: LaTeX math via mitex (no # prefix in code mode)
-            self.add_text(f"mi(`{math_content}`)")
+            precompiled = self._precompile_math(math_content, display=False)
+            if precompiled is not None:
+                self.add_text(f"${precompiled}$")
+            else:
+                # Requirement 4.3: LaTeX math via mitex (no # prefix in code mode)
+                self.add_text(f"mi(`{math_content}`)")
 
         # Task 6.3: Add label if present
         if "ids" in node and node["ids"]:
             label = node["ids"][0]
+            self.summary.labels.append(label)
             self.add_text(f" <{label}>")
 
         # Skip children to prevent duplicate output of math content
@@ -2207,6 +2502,8 @@ class TypstTranslator(SphinxTranslator):
         Args:
             node: The block math node
         """
+        self.summary.features.add("math")
+
         # Extract math content
         math_content = node.astext()
 
@@ -2224,12 +2521,17 @@ class TypstTranslator(SphinxTranslator):
                 math_content = self._convert_latex_to_typst(math_content)
             self.add_text(f"$ {math_content} $")
         else:
-            # Requirement 4.2: LaTeX math via mitex (no # prefix in code mode)
-            self.add_text(f"mitex(`{math_content}`)")
+            precompiled = self._precompile_math(math_content, display=True)
+            if precompiled is not None:
+                self.add_text(f"$ {precompiled} $")
+            else:
+                # Requirement 4.2: LaTeX math via mitex (no # prefix in code mode)
+                self.add_text(f"mitex(`{math_content}`)")
 
         # Task 6.3: Add label if present
         if "ids" in node and node["ids"]:
             label = node["ids"][0]
+            self.summary.labels.append(label)
             self.add_text(f" <{label}>")
 
         self.add_text("\n\n")
@@ -2261,6 +2563,8 @@ class TypstTranslator(SphinxTranslator):
             clue_type: The gentle-clues function name (e.g., 'info', 'warning', 'tip')
             custom_title: Optional custom title for the admonition
         """
+        self.summary.features.add("admonition")
+
         # Add newline separator if in list item and not first element
         if self.in_list_item and self.list_item_needs_separator:
             self.add_text("\n")
@@ -2370,8 +2674,34 @@ class TypstTranslator(SphinxTranslator):
         """
         Visit an index node.
 
-        Index entries are skipped in Typst/PDF output as we don't generate indices.
+        With typst_use_index enabled, emits an anchor label for each target of
+        the entries, which the precomputed back-of-book index links to (see
+        typsphinx.index_entries). Otherwise index entries are skipped.
         """
+        if not getattr(self.builder.config, "typst_use_index", False):
+            raise nodes.SkipNode
+
+        from typsphinx.index_entries import make_anchor_label
+
+        docname = self.docname or ""
+        for entry in node.get("entries", []):
+            target_id = entry[2]
+            if not target_id or target_id in self._index_anchors:
+                continue
+            self._index_anchors.add(target_id)
+
+            self._add_paragraph_separator()
+            if self.in_list_item and self.list_item_needs_separator:
+                self.add_text("\n")
+            label = make_anchor_label(docname, target_id)
+            self.summary.labels.append(label)
+            # An empty metadata element carries the label without affecting layout
+            prefix = "#" if self._in_markup_mode else ""
+            self.add_text(f'{prefix}[#metadata(none)#label("{label}")]')
+            self.add_text("\n")
+            if self.in_list_item:
+                self.list_item_needs_separator = True
+
         raise nodes.SkipNode
 
     def depart_index(self, node: addnodes.index) -> None:
@@ -0,0 +1,364 @@
+"""
+Watch mode for fast PDF previews.
+
+This module keeps a Sphinx application (with its environment) and one
+long-lived Typst compiler per master document in memory, watches the source
+directory and, on every change, re-reads and re-translates only the changed
+documents and recompiles only the master documents that include them.
+
+Usage::
+
+    python -m typsphinx.watch source/ build/pdf [-D name=value ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sphinx.application import Sphinx
+from sphinx.util import logging
+
+from typsphinx.builder import TypstPDFBuilder
+
+logger = logging.getLogger(__name__)
+
+
+class TypstWatcher:
+    """
+    Incrementally rebuild PDFs of a Sphinx project on source changes.
+
+    The Sphinx environment is kept in memory between rebuilds, so only
+    changed documents (and documents depending on them) are read and
+    written again. Each master document has its own typst.Compiler, which
+    caches parsed sources, packages and layout between compiles.
+    """
+
+    def __init__(self, app: Sphinx, interval: float = 0.3):
+        """
+        Initialize TypstWatcher.
+
+        Args:
+            app: Sphinx application using the typstpdf builder
+            interval: Polling interval in seconds
+
+        Raises:
+            ValueError: If the application does not use TypstPDFBuilder
+        """
+        if not isinstance(app.builder, TypstPDFBuilder):
+            raise ValueError(
+                f"Watch mode requires the typstpdf builder, got {app.builder.name!r}"
+            )
+
+        self.app = app
+        self.builder: TypstPDFBuilder = app.builder
+        self.interval = interval
+
+        # Masters are compiled here with long-lived compilers, not by the
+        # builder's background pipeline
+        self.builder.pipeline_compiles = False
+
+        # Master docname -> typst.Compiler
+        self.compilers: Dict[str, Any] = {}
+        self._compile_options: Optional[Dict[str, Any]] = None
+        self._snapshot: Dict[str, int] = {}
+
+    @property
+    def masters(self) -> List[str]:
+        """Master document names to build (honours typst_build_masters)."""
+        masters = self.builder.get_masters()
+        selected = self.builder.get_selected_masters()
+        if selected is None:
+            return masters
+        return [master for master in masters if master in selected]
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Record modification times of all files in the source directory.
+
+        Hidden directories and the output and doctree directories are skipped.
+
+        Returns:
+            Dictionary mapping file paths to modification times (ns)
+        """
+        skip_dirs = {
+            os.path.realpath(self.app.outdir),
+            os.path.realpath(self.builder.typ_outdir),
+            os.path.realpath(self.app.doctreedir),
+        }
+        mtimes = {}
+        for root, dirs, files in os.walk(self.app.srcdir):
+            dirs[:] = [
+                d
+                for d in dirs
+                if not d.startswith(".")
+                and os.path.realpath(os.path.join(root, d)) not in skip_dirs
+            ]
+            for file in files:
+                file_path = os.path.join(root, file)
+                try:
+                    mtimes[file_path] = os.stat(file_path).st_mtime_ns
+                except OSError:
+                    continue
+        return mtimes
+
+    def rebuild(self, force_all: bool = False) -> Set[str]:
+        """
+        Re-read changed documents, rewrite them and recompile affected masters.
+
+        Args:
+            force_all: Write all documents and compile all masters (used for
+                the initial build)
+
+        Returns:
+            Set of master document names that were recompiled
+        """
+        builder = self.builder
+        env = builder.env
+
+        updated = set(builder.read())
+        updated.update(env.check_dependents(self.app, updated))
+
+        # env.get_doctree() caches pickled doctrees in memory; drop the entries
+        # of re-read documents so the new doctrees are loaded from disk
+        pickled_doctrees = getattr(env, "_pickled_doctree_cache", {})
+        for docname in updated:
+            pickled_doctrees.pop(docname, None)
+
+        docnames = set(env.found_docs) if force_all else updated
+        closure = builder.get_build_closure()
+        if closure is not None:
+            docnames &= closure
+        if not docnames:
+            return set()
+
+        # Only images referenced by rewritten documents need copying
+        builder.images = {}
+        builder.write(docnames, docnames, method="specific")
+        builder.copy_image_files()
+        builder.copy_data_files()
+        builder.copy_template_assets()
+
+        affected = {
+            master
+            for master in self.masters
+            if force_all or builder.get_master_closure(master) & docnames
+        }
+        for master in sorted(affected):
+            self.compile_master(master)
+        return affected
+
+    def compile_master(self, master: str) -> bool:
+        """
+        Compile a master document to PDF with its long-lived compiler.
+
+        With typst_compile_processes set, the master is compiled from scratch
+        in a compile worker process instead.
+
+        Args:
+            master: Name of the master document
+
+        Returns:
+            True if the PDF was written
+        """
+        from typsphinx.pdf import create_typst_compiler
+
+        typ_file = os.path.join(self.builder.typ_outdir, master + ".typ")
+        if not os.path.exists(typ_file):
+            logger.warning(f"Master document not found: {typ_file}")
+            return False
+
+        if self._compile_options is None:
+            self._compile_options = self.builder.get_compile_options()
+
+        start = time.perf_counter()
+        pool = self.builder.get_compile_pool()
+        try:
+            if pool is not None:
+                # Isolated workers trade incremental compiles for bounded memory
+                with open(typ_file, encoding="utf-8") as f:
+                    typst_content = f.read()
+                pdf_bytes = pool.compile_typst_to_pdf(
+                    typst_content,
+                    root_dir=str(self.builder.typ_outdir),
+                    **self._compile_options,
+                )
+            else:
+                compiler = self.compilers.get(master)
+                if compiler is None:
+                    compiler = create_typst_compiler(
+                        typ_file,
+                        root_dir=str(self.builder.typ_outdir),
+                        **self._compile_options,
+                    )
+                    self.compilers[master] = compiler
+                pdf_bytes = compiler.compile(format="pdf")
+        except Exception as e:
+            logger.error(f"Failed to compile {typ_file}: {e}")
+            return False
+
+        pdf_file = os.path.join(self.builder.outdir, master + ".pdf")
+        os.makedirs(os.path.dirname(pdf_file), exist_ok=True)
+        with open(pdf_file, "wb") as f:
+            f.write(pdf_bytes)
+
+        logger.info(f"Generated PDF: {pdf_file} ({time.perf_counter() - start:.2f}s)")
+        return True
+
+    def poll(self) -> Set[str]:
+        """
+        Rebuild if any source file changed since the last poll.
+
+        Returns:
+            Set of master document names that were recompiled
+        """
+        current = self.snapshot()
+        if current == self._snapshot:
+            return set()
+
+        changed = _changed_files(self._snapshot, current)
+        self._snapshot = current
+
+        if os.path.join(self.app.confdir, "conf.py") in changed:
+            logger.warning("conf.py changed; restart watch mode to apply it")
+
+        start = time.perf_counter()
+        affected = self.rebuild()
+        if affected:
+            logger.info(
+                f"Rebuilt {', '.join(sorted(affected))} "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+        return affected
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """
+        Build everything once, then rebuild on changes until interrupted.
+
+        Args:
+            max_polls: Stop after this many polls (for testing); None runs
+                until KeyboardInterrupt
+        """
+        self._snapshot = self.snapshot()
+        self.rebuild(force_all=True)
+        logger.info(f"Watching {self.app.srcdir} for changes (Ctrl+C to stop)")
+
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                time.sleep(self.interval)
+                self.poll()
+                polls += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.builder.close_compile_pool()
+
+
+def _changed_files(old: Dict[str, int], new: Dict[str, int]) -> Set[str]:
+    """
+    Get files that were added, removed or modified between two snapshots.
+
+    Args:
+        old: Previous snapshot
+        new: Current snapshot
+
+    Returns:
+        Set of changed file paths
+    """
+    return {
+        file_path
+        for file_path in old.keys() | new.keys()
+        if old.get(file_path) != new.get(file_path)
+    }
+
+
+def _parse_overrides(defines: Iterable[str]) -> Dict[str, str]:
+    """
+    Parse ``-D name=value`` configuration overrides.
+
+    Args:
+        defines: Override strings
+
+    Returns:
+        Dictionary of configuration overrides
+
+    Raises:
+        ValueError: If an override has no "="
+    """
+    overrides = {}
+    for define in defines:
+        name, sep, value = define.partition("=")
+        if not sep:
+            raise ValueError(
+                f"-D option argument must be in the form name=value: {define}"
+            )
+        overrides[name] = value
+    return overrides
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point for watch mode.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m typsphinx.watch",
+        description=(
+            "Build PDFs with the typstpdf builder and rebuild them incrementally "
+            "whenever a source file changes."
+        ),
+    )
+    parser.add_argument("sourcedir", help="path to documentation source files")
+    parser.add_argument("outputdir", help="path to output directory")
+    parser.add_argument(
+        "-c", dest="confdir", help="directory containing conf.py (default: sourcedir)"
+    )
+    parser.add_argument(
+        "-d",
+        dest="doctreedir",
+        help="doctree cache directory (default: OUTPUTDIR/.doctrees)",
+    )
+    parser.add_argument(
+        "-D",
+        dest="define",
+        action="append",
+        default=[],
+        metavar="setting=value",
+        help="override a setting in conf.py",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.3,
+        help="polling interval in seconds (default: 0.3)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        overrides = _parse_overrides(args.define)
+    except ValueError as e:
+        parser.error(str(e))
+
+    app = Sphinx(
+        args.sourcedir,
+        args.confdir or args.sourcedir,
+        args.outputdir,
+        args.doctreedir or os.path.join(args.outputdir, ".doctrees"),
+        "typstpdf",
+        confoverrides=overrides,
+        status=sys.stdout,
+        warning=sys.stderr,
+    )
+    TypstWatcher(app, interval=args.interval).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
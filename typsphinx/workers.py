@@ -0,0 +1,353 @@
+"""
+Isolated Typst compile worker processes.
+
+This module implements the CompileWorkerPool class, which runs Typst
+compilations in dedicated worker processes instead of the Sphinx process.
+Workers can be given a memory limit, are recycled after a number of
+compiles, and compiles exceeding a timeout are aborted, so peak memory of
+large compiles is returned to the system and one pathological master
+document cannot take down the whole build.
+
+Errors raised in a worker are mapped back to TypstCompilationError with the
+same message, location and details as in-process compilation.
+"""
+
+import logging
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+import threading
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from typsphinx.pdf import TypstCompilationError
+
+logger = logging.getLogger(__name__)
+
+# Functions of typsphinx.pdf that may be called in a worker
+WORKER_FUNCTIONS = {"compile_typst_to_pdf", "compile_typst_document"}
+
+
+class _RemoteError(Exception):
+    """Stand-in for the original typst-py error raised in a worker."""
+
+
+def _set_memory_limit(memory_limit_mb: Optional[int]) -> None:
+    """
+    Limit the address space of the current process.
+
+    Args:
+        memory_limit_mb: Limit in megabytes, or None for no limit
+    """
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return
+    limit = int(memory_limit_mb) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _send(stream: BinaryIO, message: Any) -> None:
+    """Write a length-prefixed pickled message to a stream."""
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(struct.pack("<Q", len(data)))
+    stream.write(data)
+    stream.flush()
+
+
+def _receive(stream: BinaryIO) -> Any:
+    """
+    Read a length-prefixed pickled message from a stream.
+
+    Raises:
+        EOFError: If the stream ends before a complete message
+    """
+    header = stream.read(8)
+    if len(header) < 8:
+        raise EOFError("worker connection closed")
+    (size,) = struct.unpack("<Q", header)
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError("worker connection closed")
+    return pickle.loads(data)
+
+
+def _worker_main(memory_limit_mb: Optional[int]) -> None:
+    """
+    Serve compile requests from stdin until it is closed or None is sent.
+
+    Responses are written to the original stdout; anything else printed in
+    the worker goes to stderr, so it cannot corrupt the protocol.
+
+    Args:
+        memory_limit_mb: Memory limit of the worker in megabytes
+    """
+    requests = sys.stdin.buffer
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    from typsphinx import pdf
+
+    _set_memory_limit(memory_limit_mb)
+
+    while True:
+        try:
+            request = _receive(requests)
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        function_name, args, kwargs = request
+        try:
+            result = getattr(pdf, function_name)(*args, **kwargs)
+            _send(responses, ("ok", result))
+        except TypstCompilationError as e:
+            details = str(e.typst_error) if e.typst_error is not None else None
+            _send(responses, ("typst", (e.message, details, e.source_location)))
+        except MemoryError:
+            _send(responses, ("memory", None))
+        except Exception as e:
+            _send(responses, ("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """A worker process and the number of compiles it has served."""
+
+    def __init__(self, memory_limit_mb: Optional[int]):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "typsphinx.workers", str(memory_limit_mb or 0)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.compiles = 0
+
+    def request(self, message: Any, timeout: Optional[float]) -> Any:
+        """
+        Send a request and wait for the response.
+
+        Args:
+            message: Request to send
+            timeout: Seconds to wait for the response, or None
+
+        Returns:
+            Response of the worker
+
+        Raises:
+            TimeoutError: If no response arrived within the timeout
+            EOFError: If the worker exited without responding
+        """
+        timer = None
+        if timeout:
+            # Killing the worker unblocks the read below
+            timer = threading.Timer(timeout, self.process.kill)
+            timer.start()
+        try:
+            _send(self.process.stdin, message)
+            return _receive(self.process.stdout)
+        except (EOFError, OSError) as e:
+            if timer is not None and not timer.is_alive():
+                raise TimeoutError from e
+            raise EOFError(str(e)) from e
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            _send(self.process.stdin, None)
+            self.process.wait(timeout=5)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+    def kill(self) -> None:
+        """Terminate the worker process immediately."""
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class CompileWorkerPool:
+    """
+    Pool of worker processes running Typst compilations.
+
+    Workers are started on demand. Each call takes an idle worker (or waits
+    for one), so the pool can be shared by several threads, e.g. the
+    background compiles of typst_compile_pipeline.
+
+    Options (``typst_compile_processes`` configuration dictionary):
+        workers: Number of worker processes (default: 1)
+        memory_limit_mb: Address space limit per worker in megabytes
+            (default: no limit; POSIX only)
+        max_compiles: Compiles after which a worker is replaced by a fresh
+            process (default: no recycling)
+        timeout: Seconds after which a compile is aborted (default: none)
+    """
+
+    DEFAULT_OPTIONS: Dict[str, Any] = {
+        "workers": 1,
+        "memory_limit_mb": None,
+        "max_compiles": None,
+        "timeout": None,
+    }
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize CompileWorkerPool.
+
+        Args:
+            options: Pool options, merged over DEFAULT_OPTIONS
+        """
+        self.options = {**self.DEFAULT_OPTIONS, **(options or {})}
+        if self.options["memory_limit_mb"] and sys.platform == "win32":
+            logger.warning("memory_limit_mb is not supported on Windows; ignoring")
+            self.options["memory_limit_mb"] = None
+
+        self._slots: queue.Queue[Optional[_Worker]] = queue.Queue()
+        for _ in range(max(1, int(self.options["workers"] or 1))):
+            self._slots.put(None)
+
+    def compile_typst_to_pdf(self, typst_content: str, **options: Any) -> bytes:
+        """
+        Compile Typst content to PDF in a worker process.
+
+        Args:
+            typst_content: Typst markup content
+            **options: Keyword arguments of typsphinx.pdf.compile_typst_to_pdf
+
+        Returns:
+            PDF content as bytes
+
+        Raises:
+            TypstCompilationError: If compilation fails, times out or the
+                worker runs out of memory
+        """
+        return self.call("compile_typst_to_pdf", typst_content, **options)
+
+    def compile_typst_document(self, typst_content: str, **options: Any) -> Any:
+        """
+        Compile Typst content to several formats in a worker process.
+
+        Args:
+            typst_content: Typst markup content
+            **options: Keyword arguments of typsphinx.pdf.compile_typst_document
+
+        Returns:
+            Dictionary mapping each format to its output (see
+            compile_typst_document)
+
+        Raises:
+            TypstCompilationError: If compilation fails, times out or the
+                worker runs out of memory
+        """
+        return self.call("compile_typst_document", typst_content, **options)
+
+    def call(self, function_name: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a compile function of typsphinx.pdf in a worker process.
+
+        Args:
+            function_name: Name of the function (see WORKER_FUNCTIONS)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Return value of the function
+        """
+        if function_name not in WORKER_FUNCTIONS:
+            raise ValueError(f"Cannot run {function_name!r} in a compile worker")
+
+        worker = self._slots.get()
+        kept = None
+        try:
+            if worker is None:
+                worker = _Worker(self.options["memory_limit_mb"])
+            status, payload = self._request(worker, function_name, args, kwargs)
+
+            worker.compiles += 1
+            max_compiles = self.options["max_compiles"]
+            if status == "memory" or (max_compiles and worker.compiles >= max_compiles):
+                worker.stop()
+            else:
+                kept = worker
+        except BaseException:
+            if worker is not None:
+                worker.kill()
+            raise
+        finally:
+            self._slots.put(kept)
+
+        if status == "ok":
+            return payload
+        if status == "typst":
+            message, details, source_location = payload
+            raise TypstCompilationError(
+                message=message,
+                typst_error=_RemoteError(details) if details is not None else None,
+                source_location=source_location,
+            )
+        if status == "memory":
+            raise TypstCompilationError(
+                f"Compile worker ran out of memory (limit: "
+                f"{self.options['memory_limit_mb']} MB)"
+            )
+        raise TypstCompilationError(f"Compile worker failed: {payload}")
+
+    def _request(
+        self, worker: _Worker, function_name: str, args: Any, kwargs: Any
+    ) -> Tuple[str, Any]:
+        """
+        Send one request to a worker and wait for its response.
+
+        Args:
+            worker: Worker to run the request
+            function_name: Name of the function to call
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            Tuple of (status, payload) sent by the worker
+
+        Raises:
+            TypstCompilationError: If the compile times out or the worker
+                exits without responding
+        """
+        timeout = self.options["timeout"]
+        try:
+            return worker.request((function_name, args, kwargs), timeout)
+        except TimeoutError:
+            raise TypstCompilationError(
+                f"Compilation timed out after {timeout} seconds"
+            ) from None
+        except EOFError as e:
+            exitcode = worker.process.wait()
+            message = f"Compile worker exited unexpectedly (exit code {exitcode})"
+            if self.options["memory_limit_mb"]:
+                message += (
+                    f"; it may have exceeded its memory limit of "
+                    f"{self.options['memory_limit_mb']} MB"
+                )
+            raise TypstCompilationError(message) from e
+
+    def close(self) -> None:
+        """Stop all worker processes."""
+        for _ in range(self._slots.qsize()):
+            worker = self._slots.get()
+            if worker is not None:
+                worker.stop()
+            self._slots.put(None)
+
+
+if __name__ == "__main__":
+    _worker_main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -5,12 +5,103 @@ This module implements the TypstWriter class, which converts docutils
 document trees to Typst markup.
 """
 
-from typing import Any
+import posixpath
+from typing import Any, Dict, List, Optional, Tuple
 
-from docutils import writers
+from docutils import nodes, writers
 
+from typsphinx.index_entries import get_index_file
+from typsphinx.plan import BuildPlan
 from typsphinx.template_engine import TemplateEngine
-from typsphinx.translator import TypstTranslator
+from typsphinx.translator import DocumentSummary, TypstTranslator
+
+
+def get_part_name(docname: str, number: int) -> str:
+    """
+    Get the name of a part file of a split document.
+
+    Parts are written next to the document, so relative paths in them
+    (images, includes) are the same as in the document itself.
+
+    Args:
+        docname: Document name (e.g., "api/reference")
+        number: Part number, starting at 1
+
+    Returns:
+        Part name without the .typ suffix (e.g., "api/reference.part1")
+    """
+    return f"{docname}.part{number}"
+
+
+def count_source_lines(document: nodes.document) -> int:
+    """
+    Count the lines of the source file of a document.
+
+    Args:
+        document: The docutils document
+
+    Returns:
+        Number of lines, or 0 if the source file cannot be read
+    """
+    source = document.get("source")
+    if not source:
+        return 0
+    try:
+        with open(source, "rb") as f:
+            return sum(1 for _ in f)
+    except OSError:
+        return 0
+
+
+def find_part_sections(document: nodes.document) -> Tuple[int, List[nodes.section]]:
+    """
+    Find the sections a document is split at.
+
+    These are the sections of the first level with more than one section,
+    usually the sections below the document title.
+
+    Args:
+        document: The docutils document
+
+    Returns:
+        Tuple of the section level of their parent (0 for the document) and
+        the sections; fewer than two sections if the document cannot be split
+    """
+    container: nodes.Element = document
+    level = 0
+    while True:
+        sections = [
+            child for child in container.children if isinstance(child, nodes.section)
+        ]
+        if len(sections) != 1:
+            return level, sections
+        container = sections[0]
+        level += 1
+
+
+class Translation:
+    """
+    Result of translating one document.
+
+    Attributes:
+        docname: Document name
+        output: Typst markup of the document
+        summary: Information collected while translating the document,
+            including its parts
+        parts: Part files of a split document as (name, markup) tuples
+    """
+
+    def __init__(
+        self,
+        docname: str,
+        output: str,
+        summary: DocumentSummary,
+        parts: Optional[List[Tuple[str, str]]] = None,
+    ) -> None:
+        self.docname = docname
+        self.output = output
+        self.summary = summary
+        self.parts = parts or []
 
 
 class TypstWriter(writers.Writer):
@@ -46,6 +137,11 @@ class TypstWriter(writers.Writer):
         Returns:
             True if this is a master document, False otherwise
         """
+        # Constant-time lookup in the build plan prepared by the builder
+        plan = getattr(self.builder, "build_plan", None)
+        if isinstance(plan, BuildPlan):
+            return plan.is_master(docname)
+
         config = self.builder.config
         typst_documents = getattr(config, "typst_documents", [])
 
@@ -57,20 +153,146 @@ class TypstWriter(writers.Writer):
 
         return False
 
+    def _optimize_body(self, visitor: TypstTranslator) -> None:
+        """
+        Remove redundant constructs from the translated token stream.
+
+        The number of bytes saved is recorded in the document summary.
+
+        Args:
+            visitor: Translator whose output is optimized
+        """
+        from typsphinx.optimizer import optimize_tokens
+
+        tokens = visitor.body
+        before = sum(len(token.encode("utf-8")) for token in tokens)
+        visitor.body = optimize_tokens(tokens)
+        after = sum(len(token.encode("utf-8")) for token in visitor.body)
+        visitor.summary.optimizer_bytes = (before, after)
+
+    def _get_included_document_header(self) -> str:
+        """
+        Get the imports of documents that are included by other documents.
+
+        Typst's #include() does not inherit imports from the parent file,
+        so each file needs its own imports.
+
+        Returns:
+            Typst markup preceding the body of an included document
+        """
+        imports = []
+        imports.append("// Essential imports for included document")
+        imports.append('#import "@preview/codly:1.3.0": *')
+        imports.append('#import "@preview/codly-languages:0.1.1": *')
+        imports.append('#import "@preview/mitex:0.2.4": mi, mitex')
+        imports.append('#import "@preview/gentle-clues:1.2.0": *')
+        imports.append("")
+        imports.append("// Initialize codly")
+        imports.append("#show: codly-init.with()")
+        imports.append("#codly(languages: codly-languages)")
+        imports.append("")
+        return "\n".join(imports) + "\n"
+
+    def _translate_parts(
+        self, document: nodes.document, docname: str
+    ) -> Tuple[List[Translation], Dict[int, str]]:
+        """
+        Translate the sections of a large document into separate parts.
+
+        Documents with more source lines than typst_split_lines are split at
+        the sections found by find_part_sections(). Each section is
+        translated on its own, with the heading level it has in the
+        document; the document includes the parts instead of containing
+        their markup.
+
+        Args:
+            document: The docutils document
+            docname: Document name
+
+        Returns:
+            Tuple of the translated parts and a mapping of the node id of
+            each split section to its part file name relative to the
+            document (both empty if the document is not split)
+        """
+        split_lines = getattr(self.builder.config, "typst_split_lines", None)
+        if not split_lines or count_source_lines(document) <= split_lines:
+            return [], {}
+        level, sections = find_part_sections(document)
+        if len(sections) < 2:
+            return [], {}
+
+        optimize = getattr(self.builder.config, "typst_optimize_output", False)
+        parts = []
+        part_includes = {}
+        for number, section in enumerate(sections, start=1):
+            visitor = TypstTranslator(document, self.builder, docname)
+            visitor.section_level = level
+            section.walkabout(visitor)
+            if optimize:
+                self._optimize_body(visitor)
+
+            name = get_part_name(docname, number)
+            output = (
+                f"{self._get_included_document_header()}#{{\n{visitor.astext()}}}\n"
+            )
+            parts.append(Translation(name, output, visitor.summary))
+            part_includes[id(section)] = posixpath.basename(name)
+        return parts, part_includes
+
     def translate(self) -> None:
         """
         Translate the document tree to Typst markup.
 
+        Translates self.document as the builder's current document (see
+        translate_document) and stores the result in self.output,
+        self.summary and self.parts.
+        """
+        translation = self.translate_document(
+            self.document, self.builder.current_docname
+        )
+        self.output = translation.output
+        self.summary = translation.summary
+        self.parts = translation.parts
+
+    def translate_document(self, document: nodes.document, docname: str) -> Translation:
+        """
+        Translate a document tree to Typst markup.
+
         This method creates a TypstTranslator and visits the document tree,
         then wraps the output with a template using TemplateEngine.
 
         For master documents (defined in typst_documents), the full template
         is applied. For included documents, only the body content is output.
+        Large documents are split into parts (see _translate_parts).
+
+        The writer and the builder are not modified, so several documents
+        can be translated at the same time; the builder records the result
+        (images, data files, labels) when it writes the document.
+
+        Args:
+            document: The docutils document
+            docname: Document name
+
+        Returns:
+            The translated document with its summary and parts
         """
+        # Translate the sections of large documents into separate parts
+        parts, part_includes = self._translate_parts(document, docname)
+
         # Generate body content
-        self.visitor = TypstTranslator(self.document, self.builder)
-        self.document.walkabout(self.visitor)
-        body = self.visitor.astext()
+        visitor = TypstTranslator(document, self.builder, docname)
+        visitor.part_includes = part_includes
+        document.walkabout(visitor)
+        if getattr(self.builder.config, "typst_optimize_output", False):
+            self._optimize_body(visitor)
+        body = visitor.astext()
+
+        # Information collected during the walk (images, toctree options,
+        # labels, features), used instead of traversing the doctree again
+        summary = visitor.summary
+        for part in parts:
+            summary.merge(part.summary)
+        part_files = [(part.docname, part.output) for part in parts]
 
         # WORKAROUND: For some Sphinx documents, visit_document may not be called
         # Ensure body is wrapped in code mode block
@@ -79,30 +301,13 @@ class TypstWriter(writers.Writer):
         if not body.endswith("}\n"):
             body = body + "}\n"
 
-        # Get current document name
-        docname = self.builder.current_docname
-
         # Check if this is a master document
         is_master = self._is_master_document(docname)
 
         if not is_master:
             # For included documents, add essential imports but no template
-            # Typst's #include() does not inherit imports from parent file,
-            # so each file needs its own imports
-            imports = []
-            imports.append("// Essential imports for included document")
-            imports.append('#import "@preview/codly:1.3.0": *')
-            imports.append('#import "@preview/codly-languages:0.1.1": *')
-            imports.append('#import "@preview/mitex:0.2.4": mi, mitex')
-            imports.append('#import "@preview/gentle-clues:1.2.0": *')
-            imports.append("")
-            imports.append("// Initialize codly")
-            imports.append("#show: codly-init.with()")
-            imports.append("#codly(languages: codly-languages)")
-            imports.append("")
-
-            self.output = "\n".join(imports) + "\n" + body
-            return
+            output = self._get_included_document_header() + body
+            return Translation(docname, output, summary, part_files)
 
         # For master documents, apply template
         config = self.builder.config
@@ -143,11 +348,16 @@ class TypstWriter(writers.Writer):
         # Map parameters
         params = template_engine.map_parameters(sphinx_metadata)
 
-        # Extract toctree options and add to parameters
-        toctree_options = template_engine.extract_toctree_options(self.document)
-        params.update(toctree_options)
+        # Add toctree options collected by the translator
+        params.update(summary.toctree_options or {})
+
+        # Import the precomputed back-of-book index written by the builder
+        index_file = None
+        if getattr(config, "typst_use_index", False):
+            index_file = get_index_file(docname)
 
         # Render with template (using separate template file)
-        self.output = template_engine.render(
-            params, body, template_file="_template.typ"
+        output = template_engine.render(
+            params, body, template_file="_template.typ", index_file=index_file
         )
+        return Translation(docname, output, summary, part_files)